@@ -0,0 +1,107 @@
+"""Memory and allocation benchmark of passenger representations.
+
+Compares the original attrs classes with uuid ids, the current frozen
+classes with integer ids and the array-backed passenger table.
+
+Run with ``python benchmarks/bench_memory.py [passengers]``.
+"""
+import gc
+import random
+import sys
+import time
+import tracemalloc
+import uuid
+
+import attrs
+
+# Benchmark helpers put src on path, so they are imported first.
+import common  # noqa: F401
+from core import Call, Direction, Floor, Passenger
+from passenger_table import PassengerTable
+
+
+@attrs.define
+class LegacyCall:
+    floor: Floor
+    destination: Floor
+
+    @property
+    def direction(self) -> Direction:
+        if self.destination > self.floor:
+            return Direction.UP
+        return Direction.DOWN
+
+
+@attrs.define
+class LegacyPassenger:
+    call: LegacyCall | None = attrs.field()
+    id: uuid.UUID = attrs.field(factory=uuid.uuid4, eq=True)
+
+
+def make_legacy(floors: list[tuple[int, int]]) -> list[LegacyPassenger]:
+    return [
+        LegacyPassenger(call=LegacyCall(floor=Floor(f), destination=Floor(d)))
+        for f, d in floors
+    ]
+
+
+def make_current(floors: list[tuple[int, int]]) -> list[Passenger]:
+    return [
+        Passenger(call=Call(floor=Floor(f), destination=Floor(d)))
+        for f, d in floors
+    ]
+
+
+def make_table(floors: list[tuple[int, int]]) -> PassengerTable:
+    table = PassengerTable(capacity=len(floors))
+    origins, destinations = zip(*floors)
+    table.add_many(origins, destinations, called_at=0)
+    return table
+
+
+def measure(factory, floors: list[tuple[int, int]]) -> dict[str, float]:
+    """Return time, peak memory and allocated blocks of a factory."""
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.take_snapshot()
+    started_at = time.perf_counter()
+    result = factory(floors)
+    elapsed = time.perf_counter() - started_at
+    after = tracemalloc.take_snapshot()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    stats = after.compare_to(before, "filename")
+    blocks = sum(stat.count_diff for stat in stats)
+    size = sum(stat.size_diff for stat in stats)
+    del result
+    return {
+        "seconds": elapsed,
+        "bytes_per_passenger": size / len(floors),
+        "peak_bytes_per_passenger": peak / len(floors),
+        "blocks_per_passenger": blocks / len(floors),
+    }
+
+
+def run(passengers: int = 100_000) -> dict[str, dict[str, float]]:
+    rng = random.Random(0)
+    floors = [tuple(rng.sample(range(1, 13), 2)) for _ in range(passengers)]
+    return {
+        "legacy": measure(make_legacy, floors),
+        "current": measure(make_current, floors),
+        "table": measure(make_table, floors),
+    }
+
+
+def main():
+    passengers = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    for name, result in run(passengers).items():
+        print(
+            f"{name:>8}: {result['seconds']:.3f}s, "
+            f"{result['bytes_per_passenger']:.1f} B/passenger, "
+            f"peak {result['peak_bytes_per_passenger']:.1f} B/passenger, "
+            f"{result['blocks_per_passenger']:.2f} blocks/passenger"
+        )
+
+
+if __name__ == "__main__":
+    main()
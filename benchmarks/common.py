@@ -0,0 +1,97 @@
+"""Helpers shared by benchmark scripts."""
+import json
+import pathlib
+import platform
+import subprocess
+import sys
+import time
+import typing as t
+
+ROOT = pathlib.Path(__file__).resolve().parents[1]
+BASELINES = ROOT / "benchmarks" / "baselines"
+
+if str(ROOT / "src") not in sys.path:
+    sys.path.insert(0, str(ROOT / "src"))
+
+
+def rate(
+        func: t.Callable[..., int],
+        repeat: int = 3,
+        setup: t.Callable[[], t.Any] | None = None,
+) -> float:
+    """Return best rate of operations per second over repeats.
+
+    ``func`` performs operations and returns their number. If ``setup`` is
+    given, it runs untimed before every repeat and its result is passed to
+    ``func``.
+    """
+    best = 0.0
+    for _ in range(repeat):
+        args = () if setup is None else (setup(),)
+        started_at = time.perf_counter()
+        operations = func(*args)
+        elapsed = time.perf_counter() - started_at
+        best = max(best, operations / elapsed)
+    return best
+
+
+def get_metadata() -> dict[str, str]:
+    try:
+        commit = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            cwd=ROOT,
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = "unknown"
+    return {
+        "commit": commit,
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        "platform": platform.platform(),
+    }
+
+
+def save_baseline(name: str, results: dict[str, dict]) -> pathlib.Path:
+    BASELINES.mkdir(parents=True, exist_ok=True)
+    path = BASELINES / f"{name}.json"
+    path.write_text(json.dumps(
+        {"metadata": get_metadata(), "results": results},
+        indent=2,
+        sort_keys=True,
+    ) + "\n")
+    return path
+
+
+def load_baseline(name: str) -> dict[str, dict]:
+    path = pathlib.Path(name)
+    if not path.suffix:
+        path = BASELINES / f"{name}.json"
+    return json.loads(path.read_text())["results"]
+
+
+def compare(
+        results: dict[str, dict],
+        baseline: dict[str, dict],
+        threshold: float,
+) -> list[str]:
+    """Print comparison with baseline and return regressed benchmarks."""
+    regressions = []
+    for name, result in results.items():
+        previous = baseline.get(name)
+        if previous is None:
+            print(f"{name:<45} {result['value']:>14.1f} (new)")
+            continue
+        change = result["value"] / previous["value"] - 1
+        if not result["higher_is_better"]:
+            change = -change
+        regressed = change < -threshold
+        if regressed:
+            regressions.append(name)
+        print(
+            f"{name:<45} {result['value']:>14.1f} "
+            f"{change:>+8.1%}{' REGRESSION' if regressed else ''}"
+        )
+    return regressions
@@ -0,0 +1,111 @@
+"""Head-to-head comparison of queue algorithms.
+
+Every algorithm serves the same recorded call trace in every building,
+so differences in KPIs come only from the algorithm. Reports mean and
+95th percentile wait, trips per hour and compute cost per tick.
+
+Usage::
+
+    python benchmarks/compare_algorithms.py --floors 12 40 --rates 0.1 0.3
+"""
+import argparse
+import pathlib
+import random
+import sys
+import tempfile
+import time
+
+from loguru import logger
+
+# Benchmark helpers put src on path, so they are imported first.
+import common  # noqa: F401
+from algorithms import ALGORITHMS
+from elevator import PassengerElevator
+from recording import TraceRecorder, TraceReplayer
+from run import simulate
+
+TICKS_PER_HOUR = 3600
+
+
+def record_trace(
+        path: pathlib.Path,
+        max_floor: int,
+        arrival_rate: float,
+        ticks: int,
+        seed: int,
+):
+    with TraceRecorder(path) as recorder:
+        simulate(
+            PassengerElevator(start_floor=None, max_floor=max_floor),
+            until=ticks,
+            arrival_rate=arrival_rate,
+            rng=random.Random(seed),
+            recorder=recorder,
+        )
+
+
+def compare_algorithms(
+        trace: pathlib.Path,
+        max_floor: int,
+        ticks: int,
+        algorithms: list[str],
+) -> list[dict]:
+    rows = []
+    for algorithm in algorithms:
+        elevator = PassengerElevator(
+            start_floor=None,
+            max_floor=max_floor,
+            algorithm=algorithm,
+        )
+        started_at = time.perf_counter()
+        stats = simulate(elevator, until=ticks, arrivals=TraceReplayer(trace))
+        elapsed = time.perf_counter() - started_at
+        rows.append({
+            "algorithm": algorithm,
+            "mean_wait": stats.wait.mean,
+            "p95_wait": stats.wait.percentile(95) or 0,
+            "trips_per_hour": stats.trips * TICKS_PER_HOUR / stats.ticks,
+            "delivered": stats.delivered,
+            "us_per_tick": elapsed / stats.ticks * 1e6,
+        })
+    return rows
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--floors", type=int, nargs="+", default=[12])
+    parser.add_argument("--rates", type=float, nargs="+", default=[0.3])
+    parser.add_argument("--ticks", type=int, default=20_000)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--algorithms", nargs="+", choices=sorted(ALGORITHMS),
+                        default=sorted(ALGORITHMS))
+    args = parser.parse_args(argv)
+
+    logger.remove()
+    with tempfile.TemporaryDirectory() as directory:
+        for max_floor in args.floors:
+            for arrival_rate in args.rates:
+                trace = pathlib.Path(directory) / "calls.trace"
+                record_trace(
+                    trace, max_floor, arrival_rate, args.ticks, args.seed)
+                rows = compare_algorithms(
+                    trace, max_floor, args.ticks, args.algorithms)
+                best = min(rows, key=lambda row: row["mean_wait"])
+                print(f"\nfloors={max_floor} rate={arrival_rate} "
+                      f"calls={len(TraceReplayer(trace))}")
+                print(f"{'algorithm':<10} {'mean wait':>10} {'p95 wait':>10} "
+                      f"{'trips/h':>10} {'delivered':>10} {'us/tick':>10}")
+                for row in rows:
+                    print(
+                        f"{row['algorithm']:<10} {row['mean_wait']:>10.1f} "
+                        f"{row['p95_wait']:>10} "
+                        f"{row['trips_per_hour']:>10.1f} "
+                        f"{row['delivered']:>10} "
+                        f"{row['us_per_tick']:>10.1f}"
+                        f"{'  best' if row is best else ''}"
+                    )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,166 @@
+"""Throughput benchmark suite.
+
+Measures ``determine_next()`` rate against a constant number of pending
+requests, ``add_request`` ingestion rate, end-to-end ticks per second of
+the ``run.py`` scenario and scaling with floor count.
+
+Usage::
+
+    python benchmarks/run_benchmarks.py --save main
+    python benchmarks/run_benchmarks.py --compare main
+
+Baselines are JSON files in ``benchmarks/baselines``. Comparison exits
+with status 1 when any benchmark regresses by more than ``--threshold``.
+"""
+import argparse
+import itertools
+import random
+import sys
+import typing as t
+
+from loguru import logger
+
+# Benchmark helpers put src on path, so they are imported first.
+from common import compare, load_baseline, rate, save_baseline
+import bench_memory
+from core import Call, Floor
+from elevator import ElevatorOPSAQueue
+import run
+
+PENDING_REQUESTS = (10, 100, 1_000, 10_000)
+FLOOR_COUNTS = (12, 50, 100, 200)
+
+
+def make_calls(count: int, floors: int, seed: int = 0) -> list[Call]:
+    rng = random.Random(seed)
+    return [
+        Call(floor=Floor(floor), destination=Floor(destination))
+        for floor, destination in (
+            rng.sample(range(1, floors + 1), 2) for _ in range(count)
+        )
+    ]
+
+
+def bench_determine_next(pending: int, ticks: int = 2_000) -> float:
+    """Return ticks per second of queue holding ``pending`` hall calls.
+
+    Queue is restored from a snapshot outside of the timed region. Every
+    served call is replaced with a new one, so the number of pending calls
+    stays the same during the whole run.
+    """
+    queue = ElevatorOPSAQueue(start_floor=Floor(1))
+    for call in make_calls(pending, floors=12):
+        queue.add_request(call)
+    snapshot = queue.snapshot()
+    top_ups = make_calls(pending, floors=12, seed=1)
+
+    def setup() -> ElevatorOPSAQueue:
+        return ElevatorOPSAQueue.from_snapshot(snapshot)
+
+    def measure(queue: ElevatorOPSAQueue) -> int:
+        new_calls = itertools.cycle(top_ups)
+        for _ in range(ticks):
+            queue.determine_next()
+            for _ in queue.served_calls:
+                queue.add_request(next(new_calls))
+        return ticks
+
+    return rate(measure, setup=setup)
+
+
+def bench_add_request(count: int = 100_000) -> float:
+    calls = make_calls(count, floors=12)
+
+    def measure() -> int:
+        queue = ElevatorOPSAQueue(start_floor=Floor(1))
+        for call in calls:
+            queue.add_request(call)
+        return count
+
+    return rate(measure)
+
+
+def bench_simulation(ticks: int = 20_000) -> float:
+    def measure() -> int:
+        random.seed(0)
+        run.run(until=ticks, tick_duration=None)
+        return ticks
+
+    return rate(measure)
+
+
+def bench_floor_count(floors: int, ticks: int = 20_000) -> float:
+    calls = make_calls(ticks, floors=floors)
+    arrivals = random.Random(1).choices((True, False), (3, 7), k=ticks)
+
+    def measure() -> int:
+        queue = ElevatorOPSAQueue(start_floor=Floor(1))
+        for call, arrived in zip(calls, arrivals):
+            if arrived:
+                queue.add_request(call)
+            queue.determine_next()
+        return ticks
+
+    return rate(measure)
+
+
+def result(value: float, unit: str, higher_is_better: bool = True) -> dict:
+    return {"value": value, "unit": unit, "higher_is_better": higher_is_better}
+
+
+BENCHMARKS: dict[str, t.Callable[[], dict]] = {
+    **{
+        f"determine_next[pending={pending}]": (
+            lambda pending=pending: result(
+                bench_determine_next(pending), "ticks/s")
+        )
+        for pending in PENDING_REQUESTS
+    },
+    "add_request": lambda: result(bench_add_request(), "calls/s"),
+    "simulation[run.py]": lambda: result(bench_simulation(), "ticks/s"),
+    **{
+        f"floor_count[floors={floors}]": (
+            lambda floors=floors: result(bench_floor_count(floors), "ticks/s")
+        )
+        for floors in FLOOR_COUNTS
+    },
+    "memory[passenger]": lambda: result(
+        bench_memory.run(20_000)["current"]["bytes_per_passenger"],
+        "bytes",
+        higher_is_better=False,
+    ),
+}
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--save", metavar="NAME",
+                        help="save results as baseline NAME")
+    parser.add_argument("--compare", metavar="NAME",
+                        help="compare results with baseline NAME or path")
+    parser.add_argument("--threshold", type=float, default=0.1,
+                        help="allowed relative slowdown, default 0.1")
+    parser.add_argument("-k", dest="pattern", default="",
+                        help="run only benchmarks containing PATTERN")
+    args = parser.parse_args(argv)
+
+    logger.remove()
+    results = {}
+    for name, benchmark in BENCHMARKS.items():
+        if args.pattern not in name:
+            continue
+        results[name] = benchmark()
+        print(f"{name:<45} {results[name]['value']:>14.1f} "
+              f"{results[name]['unit']}")
+
+    if args.save:
+        print(f"Baseline saved to {save_baseline(args.save, results)}")
+    if args.compare:
+        print(f"\nComparison with {args.compare}:")
+        if compare(results, load_baseline(args.compare), args.threshold):
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,394 @@
+import abc
+import typing as t
+
+from call_index import CallIndex
+from core import (Call, Direction, ElevatorQueueAbstract, Floor,
+                  QueueSnapshot, get_opposite_direction)
+from floor_set import FloorSet
+from metrics import PhaseTimers
+from tracing import TraceEventKind, TracerAbstract
+
+QueueAlgorithm = type[ElevatorQueueAbstract]
+
+ALGORITHMS: dict[str, QueueAlgorithm] = {}
+
+Algorithm = t.TypeVar("Algorithm", bound=QueueAlgorithm)
+
+
+def register_algorithm(name: str) -> t.Callable[[Algorithm], Algorithm]:
+    """Register queue class under given name, replacing previous one."""
+    def register(algorithm: Algorithm) -> Algorithm:
+        ALGORITHMS[name] = algorithm
+        return algorithm
+    return register
+
+
+def get_algorithm(name: str) -> QueueAlgorithm:
+    """Return queue class registered under given name."""
+    try:
+        return ALGORITHMS[name]
+    except KeyError:
+        raise ValueError(
+            f"Unknown algorithm {name!r}, "
+            f"choose one of: {', '.join(sorted(ALGORITHMS))}.",
+        ) from None
+
+
+class IndexedQueue(ElevatorQueueAbstract):
+    """Base of queues that keep calls in ``CallIndex``.
+
+    On every tick the car moves one floor in its direction, serves calls
+    chosen by ``_serve`` and the selected floor it reached, and then asks
+    ``_next_direction`` where to go.
+    """
+
+    def __init__(
+            self,
+            start_floor: Floor,
+            tracer: TracerAbstract | None = None,
+            min_floor: Floor | None = None,
+            max_floor: Floor | None = None,
+            timers: PhaseTimers | None = None,
+    ):
+        self._tracer = tracer
+        self._timers = timers
+        self._min_floor = min_floor
+        self._max_floor = max_floor
+        self._requests = CallIndex()
+        self._selected_floors = FloorSet()
+        self._current_direction: Direction | None = None
+        self._current_floor = start_floor
+        self._is_stopped = False
+        self._served_calls: tuple[Call, ...] = ()
+        self._park_floor: Floor | None = None
+
+    @property
+    def current_floor(self) -> Floor:
+        return self._current_floor
+
+    @property
+    def current_direction(self) -> Direction | None:
+        return self._current_direction
+
+    @property
+    def is_stopped(self) -> bool:
+        return self._is_stopped
+
+    @property
+    def served_calls(self) -> tuple[Call, ...]:
+        return self._served_calls
+
+    @property
+    def selected_floors(self) -> tuple[Floor, ...]:
+        if self._park_floor is not None:
+            # Parking car has no other selected floors.
+            return ()
+        return tuple(self._selected_floors)
+
+    @property
+    def has_requests(self) -> bool:
+        return bool(self._requests) or bool(self._selected_floors)
+
+    @property
+    def pending_stops(self) -> int:
+        if self._park_floor is not None:
+            return 0
+        return len(self._requests) + len(self._selected_floors)
+
+    @property
+    def stops_range(self) -> tuple[Floor, Floor] | None:
+        if self._park_floor is not None:
+            return None
+        floors = [
+            floor
+            for floor in (
+                self._requests.min_floor(),
+                self._requests.max_floor(),
+                self._selected_floors.lowest(),
+                self._selected_floors.highest(),
+            )
+            if floor is not None
+        ]
+        if not floors:
+            return None
+        return min(floors), max(floors)
+
+    def _cancel_park(self):
+        if self._park_floor is not None:
+            self._selected_floors.discard(self._park_floor)
+            self._park_floor = None
+
+    def add_request(self, call: Call):
+        self._cancel_park()
+        self._requests.add(call)
+        if self._tracer is not None:
+            self._tracer.record(
+                TraceEventKind.ENQUEUE,
+                call.floor,
+                call.destination,
+            )
+
+    def add_requests(self, calls: t.Sequence[Call]):
+        """Add calls at once and trace them as a single event."""
+        if not calls:
+            return
+        self._cancel_park()
+        self._requests.extend(calls)
+        if self._tracer is not None:
+            self._tracer.record(
+                TraceEventKind.ENQUEUE_BATCH,
+                min(call.floor for call in calls),
+                len(calls),
+            )
+
+    def snapshot(self) -> QueueSnapshot:
+        return QueueSnapshot(
+            current_floor=self._current_floor,
+            current_direction=self._current_direction,
+            is_stopped=self._is_stopped,
+            requests=tuple(self._requests),
+            selected_floors=tuple(self._selected_floors),
+            served_calls=self._served_calls,
+            is_full=self.is_full,
+            park_floor=self._park_floor,
+        )
+
+    def restore(self, snapshot: QueueSnapshot):
+        self._requests = CallIndex(snapshot.requests)
+        self._selected_floors = FloorSet(snapshot.selected_floors)
+        self._current_direction = snapshot.current_direction
+        self._current_floor = snapshot.current_floor
+        self._is_stopped = snapshot.is_stopped
+        self._served_calls = snapshot.served_calls
+        self.is_full = snapshot.is_full
+        self._park_floor = snapshot.park_floor
+
+    def park(self, floor: Floor):
+        if floor != self._current_floor:
+            self._selected_floors.add(floor)
+            self._park_floor = floor
+
+    def _has_stops_ahead(self, direction: Direction) -> bool:
+        floor = self._current_floor
+        return self._requests.next_floor(floor, direction) is not None or (
+            self._selected_floors.any_above(floor)
+            if direction == Direction.UP
+            else self._selected_floors.any_below(floor)
+        )
+
+    def _nearest_stop(self, direction: Direction) -> Floor | None:
+        floor = self._current_floor
+        called = self._requests.next_floor(floor, direction)
+        if direction == Direction.UP:
+            selected = self._selected_floors.next_above(floor)
+            nearest = min
+        else:
+            selected = self._selected_floors.next_below(floor)
+            nearest = max
+        if called is None or selected is None:
+            return selected if called is None else called
+        return nearest(called, selected)
+
+    def _direction_to_nearest_stop(self) -> Direction | None:
+        floor = self._current_floor
+        above = self._nearest_stop(Direction.UP)
+        below = self._nearest_stop(Direction.DOWN)
+        if above is None or below is None:
+            if above is not None:
+                return Direction.UP
+            return None if below is None else Direction.DOWN
+        if above - floor < floor - below:
+            return Direction.UP
+        if above - floor > floor - below:
+            return Direction.DOWN
+        return self._current_direction or Direction.UP
+
+    def _serve_bucket(self, direction: Direction) -> list[Call]:
+        calls = self._requests.pop_bucket(self._current_floor, direction)
+        for call in calls:
+            self._selected_floors.add(call.destination)
+            if self._tracer is not None:
+                self._tracer.record(
+                    TraceEventKind.FLOOR_SELECTED,
+                    call.destination,
+                )
+        return calls
+
+    def _serve_idle(self) -> list[Call]:
+        """Serve the earliest call on the floor of idle car."""
+        earliest = self._requests.earliest(self._current_floor)
+        if earliest is None:
+            return []
+        return self._serve_bucket(earliest.direction)
+
+    def _bypasses_calls(self) -> bool:
+        """Return whether full car passes hall calls to selected floors."""
+        return self.is_full and bool(self._selected_floors)
+
+    def _direction_to_selected_floor(self) -> Direction | None:
+        """Return direction of full car, which bypasses hall calls."""
+        floor = self._current_floor
+        direction = self._current_direction
+        if direction == Direction.UP and self._selected_floors.any_above(
+                floor):
+            return direction
+        if direction == Direction.DOWN and self._selected_floors.any_below(
+                floor):
+            return direction
+        if self._selected_floors.any_above(floor):
+            return Direction.UP
+        if self._selected_floors.any_below(floor):
+            return Direction.DOWN
+        return None
+
+    @abc.abstractmethod
+    def _serve(self) -> list[Call]:
+        """Serve calls on current floor and return them."""
+
+    @abc.abstractmethod
+    def _next_direction(self) -> Direction | None:
+        """Return direction of the car after the current tick."""
+
+    def _move(self):
+        if self._current_direction == Direction.UP:
+            self._current_floor += 1
+        elif self._current_direction == Direction.DOWN:
+            self._current_floor -= 1
+
+    def _stop(self) -> bool:
+        """Serve selected floor and calls on current floor if needed."""
+        stopped = self._current_floor in self._selected_floors
+        if stopped:
+            self._selected_floors.discard(self._current_floor)
+            # Parking car arrives without opening doors.
+            stopped = self._park_floor is None
+            self._park_floor = None
+        if self._requests and (stopped or not self._bypasses_calls()):
+            self._served_calls = tuple(self._serve())
+        else:
+            self._served_calls = ()
+        return stopped or bool(self._served_calls)
+
+    def _update_direction(self):
+        if not self.has_requests:
+            self._current_direction = None
+        elif self._bypasses_calls():
+            self._current_direction = self._direction_to_selected_floor()
+        else:
+            self._current_direction = self._next_direction()
+
+    def determine_next(self):
+        floor = self._current_floor
+        direction = self._current_direction
+        timers = self._timers
+        if timers is None:
+            self._move()
+            self._is_stopped = self._stop()
+            self._update_direction()
+        else:
+            started_at = timers.clock()
+            self._move()
+            started_at = timers.lap("queue.next_floor", started_at)
+            self._is_stopped = self._stop()
+            started_at = timers.lap("queue.stop", started_at)
+            self._update_direction()
+            timers.lap("queue.direction", started_at)
+
+        tracer = self._tracer
+        if tracer is not None:
+            if self._current_floor != floor:
+                tracer.record(
+                    TraceEventKind.MOVE,
+                    self._current_floor,
+                    direction or 0,
+                )
+            if self._is_stopped:
+                tracer.record(TraceEventKind.STOP, self._current_floor)
+            if self._current_direction != direction:
+                tracer.record(
+                    TraceEventKind.DIRECTION_CHANGE,
+                    self._current_floor,
+                    self._current_direction or 0,
+                )
+
+
+@register_algorithm("scan")
+class ScanQueue(IndexedQueue):
+    """SCAN: the car sweeps to the end of the building and back.
+
+    Calls are served only in the direction of the sweep, the car turns
+    around on the lowest and highest floors of the building even if no
+    stop is left ahead. Without building floors it turns like LOOK.
+    """
+
+    def __at_end(self, direction: Direction) -> bool:
+        if direction == Direction.UP:
+            end = self._max_floor
+        else:
+            end = self._min_floor
+        if end is None:
+            return not self._has_stops_ahead(direction)
+        return self._current_floor == end
+
+    def _serve(self) -> list[Call]:
+        direction = self._current_direction
+        if direction is None:
+            return self._serve_idle()
+        served = self._serve_bucket(direction)
+        if self.__at_end(direction):
+            served += self._serve_bucket(get_opposite_direction(direction))
+        return served
+
+    def _next_direction(self) -> Direction | None:
+        direction = self._current_direction
+        if direction is None:
+            return self._direction_to_nearest_stop()
+        if self.__at_end(direction):
+            return get_opposite_direction(direction)
+        return direction
+
+
+@register_algorithm("look")
+class LookQueue(IndexedQueue):
+    """LOOK: the car keeps its direction while it has stops ahead.
+
+    Calls in the direction of travel are served on the way. When no stop
+    is left ahead, calls in the opposite direction on the current floor
+    are served and the car turns around.
+    """
+
+    def _serve(self) -> list[Call]:
+        direction = self._current_direction
+        if direction is None:
+            return self._serve_idle()
+        served = self._serve_bucket(direction)
+        if not self._has_stops_ahead(direction):
+            served += self._serve_bucket(get_opposite_direction(direction))
+        return served
+
+    def _next_direction(self) -> Direction | None:
+        direction = self._current_direction
+        if direction is None:
+            return self._direction_to_nearest_stop()
+        if self._has_stops_ahead(direction):
+            return direction
+        return get_opposite_direction(direction)
+
+
+@register_algorithm("eta")
+class NearestStopQueue(IndexedQueue):
+    """Nearest stop first: the car heads to the stop it reaches soonest.
+
+    Every call on a floor where the car stops is served regardless of
+    its direction, so the car minimizes time of arrival to the next
+    passenger instead of sweeping.
+    """
+
+    def _serve(self) -> list[Call]:
+        return (
+            self._serve_bucket(Direction.UP)
+            + self._serve_bucket(Direction.DOWN)
+        )
+
+    def _next_direction(self) -> Direction | None:
+        return self._direction_to_nearest_stop()
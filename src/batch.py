@@ -0,0 +1,310 @@
+import typing as t
+
+import numpy as np
+
+from core import Direction, ElevatorStatus, Floor
+
+NO_DIRECTION = 0
+MAX_FLOORS = 64
+
+_NO_SEQ = np.iinfo(np.int64).max
+_NO_FLOOR = np.iinfo(np.int64).min
+
+
+def _highest_bit(bits: np.ndarray) -> np.ndarray:
+    """Return index of the highest set bit of every nonzero bitmask."""
+    index = np.zeros(bits.shape, dtype=np.int64)
+    for shift in (32, 16, 8, 4, 2, 1):
+        high = bits >> np.uint64(shift)
+        has_high = high != 0
+        bits = np.where(has_high, high, bits)
+        index += np.where(has_high, shift, 0)
+    return index
+
+
+class BatchOPSASimulator:
+    """Struct-of-arrays simulator of many independent single-car buildings.
+
+    Every building has one car served by the same rules as
+    ``ElevatorOPSAQueue.determine_next()``. State of all buildings is kept
+    in NumPy arrays and every ``step()`` advances all of them at once.
+
+    Directions are stored as ``Direction`` values with ``NO_DIRECTION``
+    for a car without direction. Selected floors are ``uint64`` bitmasks
+    where bit ``i`` stands for floor ``min_floor + i``, so building height
+    is limited to ``MAX_FLOORS`` floors. Pending calls live in a table with
+    a row per building that grows when a building runs out of free slots.
+    """
+
+    def __init__(
+            self,
+            buildings: int,
+            min_floor: int,
+            max_floor: int,
+            start_floor: int | None = None,
+            slots: int = 16,
+    ):
+        if max_floor - min_floor + 1 > MAX_FLOORS:
+            raise ValueError(
+                f"Batch simulator supports up to {MAX_FLOORS} floors.",
+            )
+        self.min_floor = min_floor
+        self.max_floor = max_floor
+        start = min_floor if start_floor is None else start_floor
+        self.floor = np.full(buildings, start, dtype=np.int64)
+        self.direction = np.full(buildings, NO_DIRECTION, dtype=np.int8)
+        self.status = np.full(buildings, ElevatorStatus.IDLE, dtype=np.int8)
+        self.is_stopped = np.zeros(buildings, dtype=bool)
+        self.selected = np.zeros(buildings, dtype=np.uint64)
+        self.pending = np.zeros(buildings, dtype=np.int64)
+
+        self.__call_floor = np.zeros((buildings, slots), dtype=np.int64)
+        self.__call_direction = np.zeros((buildings, slots), dtype=np.int8)
+        self.__call_destination_bit = np.zeros(
+            (buildings, slots),
+            dtype=np.uint64,
+        )
+        self.__call_seq = np.full((buildings, slots), _NO_SEQ, dtype=np.int64)
+        self.__active = np.zeros((buildings, slots), dtype=bool)
+        self.__next_seq = 0
+
+    @property
+    def buildings(self) -> int:
+        return self.floor.shape[0]
+
+    def __floor_bits(self, floors: np.ndarray) -> np.ndarray:
+        """Return bitmask of given floors, zero for floors out of range."""
+        offset = floors - self.min_floor
+        in_range = (offset >= 0) & (offset < MAX_FLOORS)
+        shift = np.where(in_range, offset, 0).astype(np.uint64)
+        bits = np.left_shift(np.uint64(1), shift)
+        return np.where(in_range, bits, np.uint64(0))
+
+    def __grow(self, slots: int):
+        extra = slots - self.__active.shape[1]
+        rows = self.buildings
+
+        def pad(array: np.ndarray, value) -> np.ndarray:
+            padding = np.full((rows, extra), value, dtype=array.dtype)
+            return np.concatenate((array, padding), axis=1)
+
+        self.__call_floor = pad(self.__call_floor, 0)
+        self.__call_direction = pad(self.__call_direction, 0)
+        self.__call_destination_bit = pad(self.__call_destination_bit, 0)
+        self.__call_seq = pad(self.__call_seq, _NO_SEQ)
+        self.__active = pad(self.__active, False)
+
+    def add_calls(
+            self,
+            buildings: t.Sequence[int] | np.ndarray,
+            floors: t.Sequence[int] | np.ndarray,
+            destinations: t.Sequence[int] | np.ndarray,
+    ):
+        """Add calls to buildings in the given order."""
+        buildings = np.asarray(buildings, dtype=np.int64)
+        floors = np.asarray(floors, dtype=np.int64)
+        destinations = np.asarray(destinations, dtype=np.int64)
+        if np.any(floors == destinations):
+            raise ValueError("Destination floor cannot be equal to floor.")
+        for values in (floors, destinations):
+            if np.any((values < self.min_floor) | (values > self.max_floor)):
+                raise ValueError(
+                    f"Please make sure that floor is in range "
+                    f"[{self.min_floor}, {self.max_floor}].",
+                )
+        if buildings.size == 0:
+            return
+
+        seq = self.__next_seq + np.arange(buildings.size, dtype=np.int64)
+        self.__next_seq += buildings.size
+
+        # Rank of every call among calls of the same building in the batch.
+        order = np.argsort(buildings, kind="stable")
+        sorted_buildings = buildings[order]
+        group_start = np.searchsorted(sorted_buildings, sorted_buildings)
+        rank = np.empty_like(order)
+        rank[order] = np.arange(order.size) - group_start
+
+        required = self.pending[buildings] + rank + 1
+        if required.max() > self.__active.shape[1]:
+            self.__grow(max(int(required.max()), 2 * self.__active.shape[1]))
+
+        # Free slots come first in every row.
+        free_slots = np.argsort(self.__active, axis=1, kind="stable")
+        slots = free_slots[buildings, rank]
+
+        self.__call_floor[buildings, slots] = floors
+        self.__call_direction[buildings, slots] = np.where(
+            destinations > floors,
+            Direction.UP,
+            Direction.DOWN,
+        )
+        self.__call_destination_bit[buildings, slots] = self.__floor_bits(
+            destinations,
+        )
+        self.__call_seq[buildings, slots] = seq
+        self.__active[buildings, slots] = True
+        np.add.at(self.pending, buildings, 1)
+
+    def selected_floors(self, building: int) -> tuple[Floor, ...]:
+        """Return selected floors of a building in ascending order."""
+        bits = int(self.selected[building])
+        return tuple(
+            Floor(self.min_floor + offset)
+            for offset in range(MAX_FLOORS)
+            if bits >> offset & 1
+        )
+
+    def __earliest(self, candidates: np.ndarray) -> np.ndarray:
+        """Return slot of the earliest added call among candidates."""
+        seq = np.where(candidates, self.__call_seq, _NO_SEQ)
+        return np.argmin(seq, axis=1)
+
+    def __process_stops(self) -> np.ndarray:
+        floor = self.floor
+        direction = self.direction
+        rows = np.arange(self.buildings)
+        active = self.__active
+
+        bits = self.__floor_bits(floor)
+        at_selected = (self.selected & bits) != 0
+        self.selected &= ~bits
+
+        at_floor = active & (self.__call_floor == floor[:, None])
+        served = at_floor & (self.__call_direction == direction[:, None])
+
+        # The earliest call on the highest called floor is served in any
+        # direction.
+        highest = np.where(active, self.__call_floor, _NO_FLOOR).max(axis=1)
+        earliest = self.__earliest(at_floor)
+        extra = ((highest == floor) & at_floor.any(axis=1)
+                 & (self.__call_direction[rows, earliest] != direction))
+        served[rows[extra], earliest[extra]] = True
+
+        self.selected |= np.bitwise_or.reduce(
+            np.where(served, self.__call_destination_bit, np.uint64(0)),
+            axis=1,
+        )
+        active &= ~served
+        self.__call_seq[served] = _NO_SEQ
+        served_count = served.sum(axis=1)
+        self.pending -= served_count
+        return at_selected | (served_count > 0)
+
+    def __new_direction(self) -> np.ndarray:
+        floor = self.floor
+        direction = self.direction
+        rows = np.arange(self.buildings)
+        active = self.__active
+        call_floor = self.__call_floor
+        call_direction = self.__call_direction
+        selected = self.selected
+        up = direction == Direction.UP
+        down = direction == Direction.DOWN
+        idle = direction == NO_DIRECTION
+
+        new = np.full_like(direction, NO_DIRECTION)
+        opposite = np.where(up, Direction.DOWN, Direction.UP).astype(np.int8)
+        decided = ~((self.pending > 0) | (selected != 0))
+
+        # Calls in the current direction ahead of the car.
+        ahead = active & (call_direction == direction[:, None]) & np.where(
+            up[:, None],
+            call_floor > floor[:, None],
+            call_floor < floor[:, None],
+        )
+        keep = ~decided & ahead.any(axis=1)
+        new[keep] = direction[keep]
+        decided |= keep
+
+        # Only selected floors are left to decide on.
+        by_selected = ~decided & (selected != 0)
+        offset = (floor - self.min_floor).astype(np.int64)
+        below_mask = np.where(
+            offset <= 0,
+            np.uint64(0),
+            np.left_shift(
+                np.uint64(1),
+                np.clip(offset, 0, MAX_FLOORS - 1).astype(np.uint64),
+            ) - np.uint64(1),
+        )
+        below_mask = np.where(offset >= MAX_FLOORS, ~np.uint64(0), below_mask)
+        at_or_below = below_mask | self.__floor_bits(floor)
+        above = (selected & ~at_or_below) != 0
+        below = (selected & below_mask) != 0
+        # Idle car heads for the farthest selected floor.
+        lowest_selected = self.min_floor + _highest_bit(
+            selected & (~selected + np.uint64(1)),
+        )
+        highest_selected = self.min_floor + _highest_bit(selected)
+        farthest_selected = np.where(
+            highest_selected - floor >= floor - lowest_selected,
+            highest_selected,
+            lowest_selected,
+        )
+        from_idle = np.where(
+            floor > farthest_selected,
+            Direction.DOWN,
+            Direction.UP,
+        )
+        continues = (up & above) | (down & below)
+        new = np.where(
+            by_selected,
+            np.where(idle, from_idle,
+                     np.where(continues, direction, opposite)),
+            new,
+        ).astype(np.int8)
+        decided |= by_selected
+
+        # Only calls are left, head for the farthest one.
+        by_calls = ~decided
+        masked_floor = np.where(active, call_floor, _NO_FLOOR)
+        highest = masked_floor.max(axis=1)
+        lowest = np.where(active, call_floor, -_NO_FLOOR - 1).min(axis=1)
+        distance = np.where(active, np.abs(call_floor - floor[:, None]), -1)
+        farthest_distance = distance.max(axis=1)
+        candidates = np.where(
+            up[:, None],
+            active & (call_floor == highest[:, None]),
+            np.where(
+                down[:, None],
+                active & (call_floor == lowest[:, None]),
+                active & (distance == farthest_distance[:, None]),
+            ),
+        )
+        earliest = self.__earliest(candidates)
+        farthest_floor = call_floor[rows, earliest]
+        farthest_direction = call_direction[rows, earliest]
+        missing = (up & (highest < floor)) | (down & (lowest >= floor))
+        towards = np.where(
+            farthest_floor > floor,
+            Direction.UP,
+            np.where(
+                farthest_floor == floor,
+                farthest_direction,
+                Direction.DOWN,
+            ),
+        )
+        new = np.where(
+            by_calls,
+            np.where(missing, opposite, towards),
+            new,
+        ).astype(np.int8)
+        return new
+
+    def step(self):
+        """Advance every building by one tick."""
+        self.floor += ((self.direction == Direction.UP).astype(np.int64)
+                       - (self.direction == Direction.DOWN))
+        self.is_stopped = self.__process_stops()
+        self.direction = self.__new_direction()
+        has_requests = (self.pending > 0) | (self.selected != 0)
+        self.status = np.where(
+            self.is_stopped,
+            ElevatorStatus.WAITING_ON_THE_FLOOR,
+            np.where(
+                has_requests,
+                ElevatorStatus.IN_MOVEMENT,
+                ElevatorStatus.IDLE,
+            ),
+        ).astype(np.int8)
@@ -0,0 +1,141 @@
+import collections
+import itertools
+import typing as t
+
+from core import Call, Direction, Floor
+from floor_set import FloorSet
+
+
+class CallIndex:
+    """Pending calls indexed by floor and direction.
+
+    Calls are kept in FIFO buckets per floor and direction. Floors that
+    have pending calls are tracked in bitsets per direction, so lowest,
+    highest and nearest called floors are found with bit operations.
+    Every call also gets a sequence number, which preserves the order in
+    which calls were added across buckets.
+    """
+
+    def __init__(self, calls: t.Iterable[Call] = ()):
+        self.__buckets: dict[
+            Direction,
+            dict[Floor, collections.deque[tuple[int, Call]]],
+        ] = {Direction.UP: {}, Direction.DOWN: {}}
+        self.__floors: dict[Direction, FloorSet] = {
+            Direction.UP: FloorSet(),
+            Direction.DOWN: FloorSet(),
+        }
+        self.__counter = itertools.count()
+        self.__size = 0
+        self.extend(calls)
+
+    def __len__(self) -> int:
+        return self.__size
+
+    def __iter__(self) -> t.Iterator[Call]:
+        """Iterate over calls in the order they were added."""
+        entries = [
+            entry
+            for buckets in self.__buckets.values()
+            for bucket in buckets.values()
+            for entry in bucket
+        ]
+        entries.sort(key=lambda entry: entry[0])
+        return (call for _, call in entries)
+
+    def add(self, call: Call):
+        buckets = self.__buckets[call.direction]
+        bucket = buckets.get(call.floor)
+        if bucket is None:
+            bucket = buckets[call.floor] = collections.deque()
+            self.__floors[call.direction].add(call.floor)
+        bucket.append((next(self.__counter), call))
+        self.__size += 1
+
+    def extend(self, calls: t.Iterable[Call]):
+        """Add calls in bulk, as if they were added one by one."""
+        all_buckets = self.__buckets
+        all_floors = self.__floors
+        counter = self.__counter
+        added = 0
+        for call in calls:
+            direction = call.direction
+            buckets = all_buckets[direction]
+            bucket = buckets.get(call.floor)
+            if bucket is None:
+                bucket = buckets[call.floor] = collections.deque()
+                all_floors[direction].add(call.floor)
+            bucket.append((next(counter), call))
+            added += 1
+        self.__size += added
+
+    def __drop_bucket(self, floor: Floor, direction: Direction):
+        del self.__buckets[direction][floor]
+        self.__floors[direction].discard(floor)
+
+    def pop_bucket(self, floor: Floor, direction: Direction) -> list[Call]:
+        """Remove and return all calls from floor in given direction."""
+        bucket = self.__buckets[direction].get(floor)
+        if bucket is None:
+            return []
+        self.__drop_bucket(floor, direction)
+        self.__size -= len(bucket)
+        return [call for _, call in bucket]
+
+    def pop_first(self, floor: Floor, direction: Direction) -> Call | None:
+        """Remove and return the earliest call from floor in direction."""
+        bucket = self.__buckets[direction].get(floor)
+        if bucket is None:
+            return None
+        _, call = bucket.popleft()
+        if not bucket:
+            self.__drop_bucket(floor, direction)
+        self.__size -= 1
+        return call
+
+    def count(self, floor: Floor, direction: Direction) -> int:
+        bucket = self.__buckets[direction].get(floor)
+        return 0 if bucket is None else len(bucket)
+
+    def earliest(self, *floors: Floor) -> Call | None:
+        """Return the earliest added call among given floors."""
+        earliest = None
+        for floor in floors:
+            for buckets in self.__buckets.values():
+                bucket = buckets.get(floor)
+                if bucket and (earliest is None or bucket[0] < earliest):
+                    earliest = bucket[0]
+        return None if earliest is None else earliest[1]
+
+    def min_floor(self, direction: Direction | None = None) -> Floor | None:
+        """Return the lowest floor with pending calls."""
+        if direction is not None:
+            return self.__floors[direction].lowest()
+        up = self.__floors[Direction.UP].lowest()
+        down = self.__floors[Direction.DOWN].lowest()
+        if up is None or down is None:
+            return down if up is None else up
+        return min(up, down)
+
+    def max_floor(self, direction: Direction | None = None) -> Floor | None:
+        """Return the highest floor with pending calls."""
+        if direction is not None:
+            return self.__floors[direction].highest()
+        up = self.__floors[Direction.UP].highest()
+        down = self.__floors[Direction.DOWN].highest()
+        if up is None or down is None:
+            return down if up is None else up
+        return max(up, down)
+
+    def next_floor(self, floor: Floor, direction: Direction) -> Floor | None:
+        """Return the nearest floor with pending calls beyond given floor.
+
+        Floors are searched above given floor for ``Direction.UP`` and
+        below it for ``Direction.DOWN``, calls of both directions count.
+        """
+        floors = self.__floors.values()
+        if direction == Direction.UP:
+            nearest = [called.next_above(floor) for called in floors]
+            return min((f for f in nearest if f is not None), default=None)
+        nearest = [called.next_below(floor) for called in floors]
+        return max((f for f in nearest if f is not None), default=None)
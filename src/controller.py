@@ -0,0 +1,257 @@
+import asyncio
+
+import attrs
+
+from core import Call, Direction, ElevatorAbstract, ElevatorStatus, Floor
+from dispatcher import GroupDispatcher
+from exceptions import InvalidFloorError
+
+
+@attrs.frozen
+class StateUpdate:
+    """State of a car published by controller when it changes.
+
+    Attrs:
+        tick: Tick of controller on which state changed.
+        car: Index of the car.
+        floor: Current floor of the car.
+        direction: Current direction of the car.
+        status: Current status of the car.
+        served_calls: Calls served on the floor, if car stopped.
+    """
+    tick: int
+    car: int
+    floor: Floor
+    direction: Direction | None
+    status: ElevatorStatus
+    served_calls: tuple[Call, ...] = ()
+
+
+class Subscription:
+    """Stream of state updates of a controller.
+
+    Updates are kept in a bounded queue. Controller never waits for a
+    slow subscriber: when queue is full, the oldest update is dropped and
+    counted. Iteration ends when subscription or controller is closed.
+    """
+
+    def __init__(self, controller: "ElevatorController", max_updates: int):
+        self.__controller = controller
+        self.__updates: asyncio.Queue[StateUpdate | None] = asyncio.Queue(
+            max_updates,
+        )
+        self.__closed = False
+        self.dropped = 0
+
+    def __aiter__(self) -> "Subscription":
+        return self
+
+    async def __anext__(self) -> StateUpdate:
+        if self.__closed and self.__updates.empty():
+            raise StopAsyncIteration
+        update = await self.__updates.get()
+        if update is None:
+            raise StopAsyncIteration
+        return update
+
+    def _put(self, update: StateUpdate | None):
+        if self.__updates.full():
+            self.__updates.get_nowait()
+            self.dropped += 1
+        self.__updates.put_nowait(update)
+
+    def _end(self):
+        if not self.__closed:
+            self.__closed = True
+            self._put(None)
+
+    def close(self):
+        """Stop receiving updates."""
+        self.__controller.unsubscribe(self)
+        self._end()
+
+
+class ElevatorController:
+    """Asyncio service that runs elevators in real time.
+
+    Calls from many concurrent producers, e.g. hall panels, go through a
+    bounded queue: ``submit`` waits while it is full, ``try_submit``
+    refuses the call instead. Both raise ``InvalidFloorError`` for calls
+    outside of floors served by every car, so a bad call is rejected to
+    its producer and never reaches the tick loop. The tick loop runs as a
+    task, takes all pending calls at the start of every tick as one
+    burst, moves cars and publishes changed car states to subscribers
+    without waiting for them.
+
+    Args:
+        elevator: Elevator, or dispatcher of a bank of elevators which
+            assigns calls to cars.
+        tick_duration: Wall-clock seconds per tick. Zero runs ticks as
+            fast as possible while still letting other tasks run.
+        max_pending: Maximum number of calls waiting for the next tick.
+    """
+
+    def __init__(
+            self,
+            elevator: ElevatorAbstract | GroupDispatcher,
+            tick_duration: float = 1.0,
+            max_pending: int = 1024,
+    ):
+        if isinstance(elevator, GroupDispatcher):
+            self.__dispatcher = elevator
+            self.__cars = elevator.elevators
+        else:
+            self.__dispatcher = None
+            self.__cars = (elevator,)
+        self.__min_floor = max(car.MIN_FLOOR for car in self.__cars)
+        self.__max_floor = min(car.MAX_FLOOR for car in self.__cars)
+        self.__tick_duration = tick_duration
+        self.__calls: asyncio.Queue[Call] = asyncio.Queue(max_pending)
+        self.__subscriptions: list[Subscription] = []
+        self.__states: list[tuple | None] = [None] * len(self.__cars)
+        self.__task: asyncio.Task | None = None
+        self.__tick = 0
+
+    async def __aenter__(self) -> "ElevatorController":
+        self.start()
+        return self
+
+    async def __aexit__(self, *args):
+        await self.stop()
+
+    @property
+    def elevators(self) -> tuple[ElevatorAbstract, ...]:
+        return self.__cars
+
+    @property
+    def tick(self) -> int:
+        """Number of ticks run."""
+        return self.__tick
+
+    @property
+    def pending(self) -> int:
+        """Number of calls waiting for the next tick."""
+        return self.__calls.qsize()
+
+    @property
+    def is_running(self) -> bool:
+        return self.__task is not None and not self.__task.done()
+
+    def __check_call(self, call: Call):
+        task = self.__task
+        if (task is not None and task.done() and not task.cancelled()
+                and task.exception() is not None):
+            raise RuntimeError("Controller stopped after an error.")
+        min_floor = self.__min_floor
+        max_floor = self.__max_floor
+        if not (min_floor <= call.floor <= max_floor
+                and min_floor <= call.destination <= max_floor):
+            raise InvalidFloorError(f"Please make sure that floor is "
+                                    f"in range [{min_floor} , {max_floor}]")
+
+    async def submit(self, call: Call):
+        """Queue call, waiting while queue of pending calls is full."""
+        self.__check_call(call)
+        await self.__calls.put(call)
+
+    def try_submit(self, call: Call) -> bool:
+        """Queue call unless queue is full, return whether it was queued."""
+        self.__check_call(call)
+        try:
+            self.__calls.put_nowait(call)
+        except asyncio.QueueFull:
+            return False
+        return True
+
+    def subscribe(self, max_updates: int = 256) -> Subscription:
+        """Return new subscription to state updates."""
+        subscription = Subscription(self, max_updates)
+        self.__subscriptions.append(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription):
+        if subscription in self.__subscriptions:
+            self.__subscriptions.remove(subscription)
+
+    def start(self, until: int | None = None) -> asyncio.Task:
+        """Start tick loop task, see ``run``."""
+        if self.is_running:
+            raise RuntimeError("Controller is already running.")
+        self.__task = asyncio.get_running_loop().create_task(self.run(until))
+        return self.__task
+
+    async def stop(self):
+        """Stop tick loop and end all subscriptions.
+
+        Error which ended the tick loop is raised again.
+        """
+        task = self.__task
+        try:
+            if task is not None:
+                if not task.done():
+                    task.cancel()
+                try:
+                    await task
+                except asyncio.CancelledError:
+                    pass
+        finally:
+            self.__end_subscriptions()
+
+    async def run(self, until: int | None = None):
+        """Run ticks until tick ``until``, forever if it is omitted.
+
+        Subscriptions end when the loop ends.
+        """
+        loop = asyncio.get_running_loop()
+        next_tick_at = loop.time()
+        try:
+            while until is None or self.__tick < until:
+                self.step()
+                next_tick_at += self.__tick_duration
+                await asyncio.sleep(max(next_tick_at - loop.time(), 0))
+        finally:
+            self.__end_subscriptions()
+
+    def step(self):
+        """Run a single tick: take pending calls, move cars, publish."""
+        calls = self.__take_calls()
+        if calls:
+            if self.__dispatcher is not None:
+                self.__dispatcher.add_requests(calls)
+            else:
+                self.__cars[0].add_requests(calls)
+        self.__tick += 1
+        for number, car in enumerate(self.__cars):
+            car.move()
+            self.__publish(number, car)
+
+    def __take_calls(self) -> list[Call]:
+        calls = []
+        queue = self.__calls
+        while not queue.empty():
+            calls.append(queue.get_nowait())
+        return calls
+
+    def __publish(self, number: int, car: ElevatorAbstract):
+        served_calls = car.served_calls
+        state = (car.current_floor, car.current_direction, car.status)
+        if state == self.__states[number] and not served_calls:
+            return
+        self.__states[number] = state
+        if not self.__subscriptions:
+            return
+        update = StateUpdate(
+            tick=self.__tick,
+            car=number,
+            floor=state[0],
+            direction=state[1],
+            status=state[2],
+            served_calls=served_calls,
+        )
+        for subscription in self.__subscriptions:
+            subscription._put(update)
+
+    def __end_subscriptions(self):
+        subscriptions, self.__subscriptions = self.__subscriptions, []
+        for subscription in subscriptions:
+            subscription._end()
@@ -1,9 +1,10 @@
 import abc
 import enum
+import itertools
 import typing as t
-import uuid
 
 import attrs
+import numpy as np
 
 Floor = t.NewType("Floor", int)
 
@@ -33,37 +34,160 @@ def get_opposite_direction(direction: Direction) -> Direction:
     return Direction.UP
 
 
-@attrs.define
+def get_call_direction(floor: Floor, destination: Floor) -> Direction:
+    if destination > floor:
+        return Direction.UP
+    return Direction.DOWN
+
+
+@attrs.frozen
 class Call:
     """Object of elevator call.
 
     Attrs:
         floor: Floor number from which the elevator is called
         destination: Floor number to which the elevator is called.
+        direction: Direction of the call, computed on construction.
     """
     floor: Floor
     destination: Floor = attrs.field()
+    direction: Direction = attrs.field(
+        init=False,
+        eq=False,
+        default=attrs.Factory(
+            lambda self: get_call_direction(self.floor, self.destination),
+            takes_self=True,
+        ),
+    )
 
     @destination.validator
-    def validate_destination(self, value, *args):
+    def validate_destination(self, attribute, value):
         if value == self.floor:
             raise ValueError("Destination floor cannot be equal to floor.")
 
-    @property
-    def direction(self) -> Direction:
-        if self.destination > self.floor:
-            return Direction.UP
-        return Direction.DOWN
 
+def make_calls(floors: np.ndarray, destinations: np.ndarray) -> list[Call]:
+    """Return calls for arrays of floors and destinations.
 
-@attrs.define
+    Calls are immutable, so every distinct floor and destination pair is
+    constructed once and shared by all its calls.
+    """
+    codes = (floors.astype(np.int64) << 32) | (
+        destinations.astype(np.int64) & 0xFFFFFFFF)
+    unique, inverse = np.unique(codes, return_inverse=True)
+    calls = [
+        Call(
+            floor=Floor(code >> 32),
+            destination=Floor((code & 0xFFFFFFFF ^ 0x80000000) - 0x80000000),
+        )
+        for code in unique.tolist()
+    ]
+    return [calls[index] for index in inverse.tolist()]
+
+
+CallBatch = t.Iterable[Call] | np.ndarray
+
+
+def validate_calls(
+        calls: CallBatch,
+        min_floor: int,
+        max_floor: int,
+) -> tuple[list[Call], list[int]]:
+    """Return calls within floors and indexes of the other calls.
+
+    Calls may also be given as an array of floor and destination pairs,
+    which is validated with vectorized comparisons. Pairs with equal
+    floor and destination are rejected as well.
+    """
+    if isinstance(calls, np.ndarray):
+        if calls.ndim != 2 or calls.shape[1] != 2:
+            raise ValueError("Array of calls must have shape (n, 2).")
+        floors = calls[:, 0]
+        destinations = calls[:, 1]
+        valid = (
+            (floors >= min_floor) & (floors <= max_floor)
+            & (destinations >= min_floor) & (destinations <= max_floor)
+            & (floors != destinations)
+        )
+        rejected = np.flatnonzero(~valid).tolist()
+        return make_calls(floors[valid], destinations[valid]), rejected
+    accepted = []
+    rejected = []
+    for index, call in enumerate(calls):
+        if (min_floor <= call.floor <= max_floor
+                and min_floor <= call.destination <= max_floor):
+            accepted.append(call)
+        else:
+            rejected.append(index)
+    return accepted, rejected
+
+
+@attrs.frozen
 class Passenger:
+    """Object of passenger.
+
+    Attrs:
+        call: Call made by passenger.
+        id: Unique passenger number, increasing in order of creation.
+    """
     call: Call | None = attrs.field()
-    id: uuid.UUID = attrs.field(factory=uuid.uuid4, eq=True)
+    id: int = attrs.field(factory=itertools.count(1).__next__, eq=True)
+
+
+@attrs.frozen
+class QueueSnapshot:
+    """Immutable state of an elevator queue of any registered algorithm.
+
+    Calls are immutable, so snapshots and queues restored from them share
+    call objects instead of copying them.
+
+    Attrs:
+        current_floor: Floor of the car.
+        current_direction: Direction of the car.
+        is_stopped: Whether the car is stopped.
+        requests: Pending calls in the order they were added.
+        selected_floors: Floors selected inside the car in ascending order.
+        served_calls: Calls served on the last stop.
+        is_full: Whether the car bypasses hall calls as it is full.
+        park_floor: Floor idle car goes to wait on, if any.
+    """
+    current_floor: Floor
+    current_direction: Direction | None
+    is_stopped: bool
+    requests: tuple[Call, ...]
+    selected_floors: tuple[Floor, ...]
+    served_calls: tuple[Call, ...]
+    is_full: bool = False
+    park_floor: Floor | None = None
+
+
+@attrs.frozen
+class RequestsReport:
+    """Outcome of adding a batch of calls.
+
+    Attrs:
+        accepted: Number of added calls.
+        rejected: Indexes of calls of the batch that were not added.
+    """
+    accepted: int
+    rejected: tuple[int, ...] = ()
 
 
 class ElevatorQueueAbstract(abc.ABC):
-    """Abstract class for algorithm for servicing elevator call queue."""
+    """Abstract class for algorithm for servicing elevator call queue.
+
+    Queues are created with start floor and optional tracer, phase
+    timers, lowest and highest floors of the building as keyword
+    arguments.
+
+    Elevator sets ``is_full`` when the car has no capacity left. A full
+    car bypasses hall calls and stops only on selected floors, hall
+    calls on those floors are still served as passengers leave there.
+    A full car without selected floors serves hall calls as usual, so it
+    never waits with requests pending.
+    """
+
+    is_full: bool = False
 
     @property
     @abc.abstractmethod
@@ -84,15 +208,75 @@ class ElevatorQueueAbstract(abc.ABC):
     def add_request(self, call: Call):
         """Add request to queue."""
 
+    def add_requests(self, calls: t.Sequence[Call]):
+        """Add validated calls to queue at once.
+
+        Queues that cannot add calls in bulk add them one by one.
+        """
+        for call in calls:
+            self.add_request(call)
+
     @property
     @abc.abstractmethod
     def is_stopped(self) -> bool:
         """Return queue movement status."""
 
+    @property
+    @abc.abstractmethod
+    def served_calls(self) -> tuple[Call, ...]:
+        """Return calls served on the last stop."""
+
+    @property
+    @abc.abstractmethod
+    def has_requests(self) -> bool:
+        """Return whether queue has pending calls or selected floors."""
+
+    @property
+    @abc.abstractmethod
+    def pending_stops(self) -> int:
+        """Return number of pending calls and selected floors."""
+
+    @property
+    @abc.abstractmethod
+    def stops_range(self) -> tuple[Floor, Floor] | None:
+        """Return lowest and highest floors queue still has to visit."""
+
+    @abc.abstractmethod
+    def snapshot(self) -> QueueSnapshot:
+        """Return immutable queue state."""
+
+    @abc.abstractmethod
+    def restore(self, snapshot: QueueSnapshot):
+        """Replace queue state with snapshot state."""
+
     @abc.abstractmethod
     def determine_next(self):
         """Determine next queue state."""
 
+    def transit_ticks(self, limit: int) -> int:
+        """Return number of next ticks, up to ``limit``, that only move.
+
+        Queues that cannot predict their movement never skip ticks.
+        """
+        return 0
+
+    def advance(self, max_ticks: int) -> int:
+        """Skip transit ticks and determine next state after them.
+
+        Return number of ticks taken, at most ``max_ticks``.
+        """
+        self.determine_next()
+        return 1
+
+    def park(self, floor: Floor):
+        """Send idle car to floor to wait for next calls there.
+
+        Parking is not a committed stop: the target is dropped as soon as
+        a request is added, and it is not counted in ``selected_floors``,
+        ``pending_stops`` or ``stops_range``, so dispatchers see the car
+        as free. Queues that cannot park keep the car where it is.
+        """
+
 
 class ElevatorAbstract(abc.ABC):
     """Abstract class for elevator implementation."""
@@ -144,10 +328,63 @@ class ElevatorAbstract(abc.ABC):
     def selected_floors(self) -> tuple[Floor, ...]:
         """Return selected floors."""
 
+    @property
+    @abc.abstractmethod
+    def served_calls(self) -> tuple[Call, ...]:
+        """Return hall calls served on the last stop."""
+
+    @property
+    @abc.abstractmethod
+    def pending_stops(self) -> int:
+        """Return number of pending calls and selected floors."""
+
+    @property
+    @abc.abstractmethod
+    def stops_range(self) -> tuple[Floor, Floor] | None:
+        """Return lowest and highest floors elevator still has to visit."""
+
     @abc.abstractmethod
     def add_request(self, call: Call):
         """Add request to queue."""
 
+    def add_requests(self, calls: CallBatch) -> RequestsReport:
+        """Validate a batch of calls and add valid ones.
+
+        Calls with floors outside of the building are reported by index
+        instead of raising, so the batch is never applied partially.
+        """
+        accepted, rejected = validate_calls(
+            calls,
+            self.MIN_FLOOR,
+            self.MAX_FLOOR,
+        )
+        if accepted:
+            self._add_valid_requests(accepted)
+        return RequestsReport(accepted=len(accepted), rejected=tuple(rejected))
+
+    def _add_valid_requests(self, calls: list[Call]):
+        """Add validated calls.
+
+        Elevators that cannot add calls in bulk add them one by one.
+        """
+        for call in calls:
+            self.add_request(call)
+
     @abc.abstractmethod
     def move(self):
         """Move elevator."""
+
+    def transit_ticks(self, limit: int) -> int:
+        """Return number of next ticks, up to ``limit``, that only move.
+
+        Elevators that cannot predict their movement never skip ticks.
+        """
+        return 0
+
+    def advance(self, max_ticks: int) -> int:
+        """Skip transit ticks and move once after them.
+
+        Return number of ticks taken, at most ``max_ticks``.
+        """
+        self.move()
+        return 1
@@ -0,0 +1,228 @@
+import typing as t
+
+import attrs
+
+from core import Call, Direction, ElevatorAbstract, Floor
+
+
+@attrs.define
+class CarState:
+    """Cached state of a car used to estimate arrival times.
+
+    Attrs:
+        floor: Current floor of the car.
+        direction: Current direction of the car.
+        lowest: Lowest floor car still has to visit.
+        highest: Highest floor car still has to visit.
+        stops: Number of pending calls and selected floors.
+        destinations: Floors car will stop at to let passengers out.
+        load: Number of passengers inside the car and of calls assigned
+            to it that did not board yet.
+    """
+    floor: Floor
+    direction: Direction | None
+    lowest: Floor
+    highest: Floor
+    stops: int
+    destinations: set[Floor] = attrs.field(factory=set)
+    load: int = 0
+
+    @classmethod
+    def from_elevator(cls, elevator: ElevatorAbstract) -> "CarState":
+        floor = elevator.current_floor
+        lowest, highest = elevator.stops_range or (floor, floor)
+        stops = elevator.pending_stops
+        destinations = set(elevator.selected_floors)
+        # Pending stops are pending calls and selected floors.
+        waiting = stops - len(destinations)
+        return cls(
+            floor=floor,
+            direction=elevator.current_direction,
+            lowest=lowest,
+            highest=highest,
+            stops=stops,
+            destinations=destinations,
+            load=len(elevator.passengers) + waiting,
+        )
+
+    def assign(self, call: Call):
+        """Account for a call assigned to the car."""
+        self.lowest = min(self.lowest, call.floor, call.destination)
+        self.highest = max(self.highest, call.floor, call.destination)
+        self.stops += 1
+        self.destinations.add(call.destination)
+        self.load += 1
+
+
+def estimate_arrival(state: CarState, call: Call, stop_penalty: int) -> int:
+    """Return estimated number of ticks until car picks up the call.
+
+    A car moving towards the call floor in the call direction picks it up
+    on the way. Otherwise it first travels to its farthest stop in the
+    current direction and then turns back.
+    """
+    floor = state.floor
+    travel = abs(call.floor - floor)
+    if state.direction == Direction.UP:
+        if call.floor < floor or call.direction != Direction.UP:
+            turn = max(state.highest, floor)
+            travel = turn - floor + abs(turn - call.floor)
+    elif state.direction == Direction.DOWN:
+        if call.floor > floor or call.direction != Direction.DOWN:
+            turn = min(state.lowest, floor)
+            travel = floor - turn + abs(call.floor - turn)
+    return travel + stop_penalty * state.stops
+
+
+class GroupDispatcher:
+    """Group controller for a bank of elevators.
+
+    Every hall call is assigned to the car with the lowest estimated
+    time of arrival. Car states are read once per batch of calls and then
+    updated in place after every assignment, so a burst of calls costs
+    one cheap estimate per call and car.
+    """
+
+    def __init__(
+            self,
+            elevators: t.Sequence[ElevatorAbstract],
+            stop_penalty: int = 1,
+    ):
+        if not elevators:
+            raise ValueError("Dispatcher requires at least one elevator.")
+        self.__elevators = tuple(elevators)
+        self._stop_penalty = stop_penalty
+
+    @property
+    def elevators(self) -> tuple[ElevatorAbstract, ...]:
+        return self.__elevators
+
+    def __choose(self, states: list[CarState], call: Call) -> int:
+        penalty = self._stop_penalty
+        best_index = 0
+        best_eta = None
+        for index, state in enumerate(states):
+            eta = estimate_arrival(state, call, penalty)
+            if best_eta is None or eta < best_eta:
+                best_index, best_eta = index, eta
+        return best_index
+
+    def add_request(self, call: Call) -> ElevatorAbstract:
+        """Assign call to the best car and return that car."""
+        return self.add_requests((call,))[0]
+
+    def add_requests(
+            self,
+            calls: t.Iterable[Call],
+    ) -> list[ElevatorAbstract]:
+        """Assign a burst of calls and return the car chosen for each."""
+        states = [CarState.from_elevator(car) for car in self.__elevators]
+        assigned = []
+        for call in calls:
+            index = self.__choose(states, call)
+            car = self.__elevators[index]
+            car.add_request(call)
+            states[index].assign(call)
+            assigned.append(car)
+        return assigned
+
+    def move(self):
+        """Move every car of the bank."""
+        for car in self.__elevators:
+            car.move()
+
+
+def group_by_destination(
+        calls: t.Sequence[Call],
+        capacity: int,
+        spread: int,
+) -> list[list[int]]:
+    """Split calls into groups that can share a trip.
+
+    Calls of a group are made on the same floor in the same direction,
+    their destinations are at most ``spread`` floors apart and there are
+    at most ``capacity`` of them. Return groups of call indices, ordered
+    by the earliest call of every group.
+    """
+    by_origin: dict[tuple[Floor, Direction], list[int]] = {}
+    for index, call in enumerate(calls):
+        by_origin.setdefault((call.floor, call.direction), []).append(index)
+
+    groups: list[list[int]] = []
+    for (_, direction), indices in by_origin.items():
+        indices.sort(
+            key=lambda index: calls[index].destination,
+            reverse=direction == Direction.DOWN,
+        )
+        group: list[int] = []
+        for index in indices:
+            if group and (
+                    len(group) == capacity
+                    or abs(calls[index].destination
+                           - calls[group[0]].destination) > spread):
+                groups.append(group)
+                group = []
+            group.append(index)
+        groups.append(group)
+    groups.sort(key=min)
+    return groups
+
+
+class DestinationDispatcher(GroupDispatcher):
+    """Group controller with destination dispatch.
+
+    Calls waiting on the same floor are grouped by nearby destinations,
+    up to the car capacity, and every group is assigned to a single car.
+    A car is chosen by its estimated time of arrival plus a penalty for
+    every destination it does not stop at yet, so passengers to the same
+    zone ride together and trips make fewer stops, e.g. in up-peak
+    traffic from the lobby.
+
+    Args:
+        elevators: Cars of the bank.
+        stop_penalty: Ticks added to estimated arrival per extra stop.
+        spread: Largest distance between destinations of one group.
+    """
+
+    def __init__(
+            self,
+            elevators: t.Sequence[ElevatorAbstract],
+            stop_penalty: int = 1,
+            spread: int = 2,
+    ):
+        super().__init__(elevators, stop_penalty=stop_penalty)
+        self.__spread = spread
+
+    def __cost(self, state: CarState, group: list[Call]) -> int:
+        new_stops = {call.destination for call in group} - state.destinations
+        eta = estimate_arrival(state, group[0], self._stop_penalty)
+        return eta + self._stop_penalty * len(new_stops)
+
+    def add_requests(
+            self,
+            calls: t.Iterable[Call],
+    ) -> list[ElevatorAbstract]:
+        """Assign a burst of calls and return the car chosen for each."""
+        calls = list(calls)
+        cars = self.elevators
+        states = [CarState.from_elevator(car) for car in cars]
+        capacity = min(car.CAPACITY for car in cars)
+        assigned: list[ElevatorAbstract | None] = [None] * len(calls)
+        for indices in group_by_destination(calls, capacity, self.__spread):
+            group = [calls[index] for index in indices]
+            # Full cars are skipped unless every car is full.
+            candidates = [
+                car_index
+                for car_index, state in enumerate(states)
+                if state.load + len(group) <= cars[car_index].CAPACITY
+            ] or range(len(cars))
+            car_index = min(
+                candidates,
+                key=lambda car_index: self.__cost(states[car_index], group),
+            )
+            for index in sorted(indices):
+                call = calls[index]
+                cars[car_index].add_request(call)
+                states[car_index].assign(call)
+                assigned[index] = cars[car_index]
+        return assigned
@@ -1,11 +1,19 @@
 import operator
 import typing as t
+import attrs
 from loguru import logger
+from algorithms import get_algorithm, register_algorithm
+from call_index import CallIndex
 from core import (Call, Direction, DoorsStatus, ElevatorAbstract,
                   ElevatorQueueAbstract, ElevatorStatus, Floor, Passenger,
-                  get_opposite_direction)
+                  QueueSnapshot, get_opposite_direction)
+from eta import ArrivalPlan
+from floor_set import FloorSet
 from exceptions import (ElevatorDoorsClosedError, ElevatorFullError,
                         InvalidFloorError, PassengerNotInElevatorError)
+from metrics import LatencyMetrics, PhaseTimers
+from parking import ParkingPolicyAbstract
+from tracing import TraceEventKind, TracerAbstract
 
 
 def get_compare_operator(
@@ -17,6 +25,29 @@ def get_compare_operator(
     return operator.gt
 
 
+@attrs.frozen
+class ElevatorSnapshot:
+    """Immutable state of passenger elevator.
+
+    Attrs:
+        algorithm: Name of queue algorithm.
+        queue: State of elevator queue.
+        status: Elevator status.
+        passengers: Passengers inside in order of boarding.
+        min_floor: Lowest floor of the building.
+        max_floor: Highest floor of the building.
+        capacity: Elevator capacity.
+    """
+    algorithm: str
+    queue: QueueSnapshot
+    status: ElevatorStatus
+    passengers: tuple[Passenger, ...]
+    min_floor: int
+    max_floor: int
+    capacity: int
+
+
+@register_algorithm("opsa")
 class ElevatorOPSAQueue(ElevatorQueueAbstract):
     """Implementation of Optimal Passenger Sorting Algorithm.
 
@@ -26,14 +57,63 @@ class ElevatorOPSAQueue(ElevatorQueueAbstract):
     the top floor with a compatible call direction. It is particularly
     well-suited for a single elevator in a building with up to 12 floors,
     ensuring optimal and streamlined service.
+
+    The algorithm does not depend on building floors, so ``min_floor``
+    and ``max_floor`` are accepted only for compatibility with other
+    queues.
     """
 
-    def __init__(self, start_floor: Floor):
-        self.__requests: list[Call] = []
-        self.__selected_floors: set[Floor] = set()
+    def __init__(
+            self,
+            start_floor: Floor,
+            tracer: TracerAbstract | None = None,
+            min_floor: Floor | None = None,
+            max_floor: Floor | None = None,
+            timers: PhaseTimers | None = None,
+    ):
+        self.__tracer = tracer
+        self.__timers = timers
+        self.__requests = CallIndex()
+        self.__selected_floors = FloorSet()
         self.__current_direction: Direction | None = None
         self.__current_floor = start_floor
         self.__is_stopped = False
+        self.__served_calls: tuple[Call, ...] = ()
+        self.__park_floor: Floor | None = None
+
+    @classmethod
+    def from_snapshot(
+            cls,
+            snapshot: QueueSnapshot,
+            tracer: TracerAbstract | None = None,
+            timers: PhaseTimers | None = None,
+    ) -> "ElevatorOPSAQueue":
+        queue = cls(snapshot.current_floor, tracer=tracer, timers=timers)
+        queue.restore(snapshot)
+        return queue
+
+    def snapshot(self) -> QueueSnapshot:
+        return QueueSnapshot(
+            current_floor=self.__current_floor,
+            current_direction=self.__current_direction,
+            is_stopped=self.__is_stopped,
+            requests=tuple(self.__requests),
+            selected_floors=tuple(self.__selected_floors),
+            served_calls=self.__served_calls,
+            is_full=self.is_full,
+            park_floor=self.__park_floor,
+        )
+
+    def restore(self, snapshot: QueueSnapshot):
+        """Replace queue state with snapshot state."""
+        self.__requests = CallIndex(snapshot.requests)
+        self.__selected_floors = FloorSet(snapshot.selected_floors)
+        self.__current_direction = snapshot.current_direction
+        self.__current_floor = snapshot.current_floor
+        self.__is_stopped = snapshot.is_stopped
+        self.__served_calls = snapshot.served_calls
+        self.is_full = snapshot.is_full
+        self.__park_floor = snapshot.park_floor
 
     @property
     def current_floor(self) -> Floor:
@@ -44,6 +124,11 @@ class ElevatorOPSAQueue(ElevatorQueueAbstract):
         """Flag that indicates whether elevator is stopped or not"""
         return self.__is_stopped
 
+    @property
+    def served_calls(self) -> tuple[Call, ...]:
+        """Calls which were served on the last stop."""
+        return self.__served_calls
+
     @property
     def current_direction(self) -> Direction | None:
         return self.__current_direction
@@ -51,95 +136,159 @@ class ElevatorOPSAQueue(ElevatorQueueAbstract):
     @property
     def selected_floors(self) -> tuple[Floor, ...]:
         """Set of floors that were called inside."""
+        if self.__park_floor is not None:
+            # Parking car has no other selected floors.
+            return ()
         return tuple(self.__selected_floors)
 
-    def __get_farthest_request(self, in_current_direction: bool) -> Call:
-        farthest = None
-        for call in self.__requests:
-            if in_current_direction and self.__compare_direction(
-                    call.floor) != self.__current_direction:
-                continue
-            if farthest is None:
-                farthest = call
-                continue
-            if (abs(call.floor - self.__current_floor) >
-                    abs(farthest.floor - self.__current_floor)):
-                farthest = call
-        return farthest
-
-    def __get_farthest_selected_floor(
+    def __get_farthest_request(
             self,
             in_current_direction: bool,
-    ) -> Floor:
-        farthest = None
-        for floor in self.selected_floors:
-            direction = self.__current_direction
-            if (in_current_direction and
-                    self.__compare_direction(floor) != direction):
-                continue
-            if farthest is None:
-                farthest = floor
-                continue
-            if (abs(floor - self.__current_floor) >
-                    abs(floor - self.__current_floor)):
-                farthest = floor
-        return farthest
+    ) -> Call | None:
+        floor = self.__current_floor
+        highest = self.__requests.max_floor()
+        lowest = self.__requests.min_floor()
+        if in_current_direction:
+            if self.__current_direction == Direction.UP:
+                if highest < floor:
+                    return None
+                return self.__requests.earliest(highest)
+            if lowest >= floor:
+                return None
+            return self.__requests.earliest(lowest)
+        if highest - floor > floor - lowest:
+            return self.__requests.earliest(highest)
+        if highest - floor < floor - lowest:
+            return self.__requests.earliest(lowest)
+        return self.__requests.earliest(highest, lowest)
+
+    def __get_farthest_selected_floor(self) -> Floor:
+        floor = self.__current_floor
+        highest = self.__selected_floors.highest()
+        lowest = self.__selected_floors.lowest()
+        if highest - floor >= floor - lowest:
+            return highest
+        return lowest
+
+    def __has_selected_floors_ahead(self, direction: Direction) -> bool:
+        if direction == Direction.UP:
+            return self.__selected_floors.any_above(self.__current_floor)
+        return self.__selected_floors.any_below(self.__current_floor)
+
+    def __cancel_park(self):
+        if self.__park_floor is not None:
+            self.__selected_floors.discard(self.__park_floor)
+            self.__park_floor = None
 
     def add_request(self, call: Call):
-        self.__requests.append(call)
-        logger.info("Request was added to queue.", extra={"call": call})
+        self.__cancel_park()
+        self.__requests.add(call)
+        if self.__tracer is not None:
+            self.__tracer.record(
+                TraceEventKind.ENQUEUE,
+                call.floor,
+                call.destination,
+            )
+
+    def add_requests(self, calls: t.Sequence[Call]):
+        """Add calls at once and trace them as a single event."""
+        if not calls:
+            return
+        self.__cancel_park()
+        self.__requests.extend(calls)
+        if self.__tracer is not None:
+            self.__tracer.record(
+                TraceEventKind.ENQUEUE_BATCH,
+                min(call.floor for call in calls),
+                len(calls),
+            )
 
     @property
     def has_requests(self) -> bool:
         return bool(self.__requests) or bool(self.__selected_floors)
 
+    @property
+    def pending_stops(self) -> int:
+        """Number of pending calls and selected floors."""
+        if self.__park_floor is not None:
+            return 0
+        return len(self.__requests) + len(self.__selected_floors)
+
+    @property
+    def stops_range(self) -> tuple[Floor, Floor] | None:
+        """Lowest and highest floors queue still has to visit."""
+        if self.__park_floor is not None:
+            return None
+        floors = [
+            floor
+            for floor in (
+                self.__requests.min_floor(),
+                self.__requests.max_floor(),
+                self.__selected_floors.lowest(),
+                self.__selected_floors.highest(),
+            )
+            if floor is not None
+        ]
+        if not floors:
+            return None
+        return min(floors), max(floors)
+
     def __compare_direction(self, floor: Floor | None = None) -> Direction:
-        floor = floor or self.current_floor
+        if floor is None:
+            floor = self.__current_floor
         if self.__current_floor > floor:
             return Direction.DOWN
         return Direction.UP
 
+    def __bypasses_calls(self) -> bool:
+        """Return whether full car passes hall calls to selected floors."""
+        return self.is_full and bool(self.__selected_floors)
+
     def __add_selected_floor(self, floor: Floor):
         self.__selected_floors.add(floor)
-        logger.info(
-            "Floor was added to selected floors.",
-            extra={"floor": floor},
-        )
+        if self.__tracer is not None:
+            self.__tracer.record(TraceEventKind.FLOOR_SELECTED, floor)
 
     def __process_requests_to_stop(self) -> bool:
         floor = self.__current_floor
         direction = self.__current_direction
 
-        requests_to_remove: list[Call] = []
-        max_floor = max(self.__requests, key=lambda c: c.floor)
+        # The earliest call on the highest called floor is served in any
+        # direction, so it has to be found before the floor bucket is served.
+        max_floor = None
+        if self.__requests.max_floor() == floor:
+            max_floor = self.__requests.earliest(floor)
 
-        for call in self.__requests:
-            if direction == call.direction and floor == call.floor:
-                requests_to_remove.append(call)
+        requests_to_remove: list[Call] = []
+        if direction is not None:
+            requests_to_remove = self.__requests.pop_bucket(floor, direction)
 
-        if max_floor.floor == floor and max_floor.direction != direction:
+        if max_floor is not None and max_floor.direction != direction:
+            self.__requests.pop_first(floor, max_floor.direction)
             requests_to_remove.append(max_floor)
 
-        if requests_to_remove:
-            for call in requests_to_remove:
-                self.__add_selected_floor(call.destination)
-                self.__requests.remove(call)
-            return True
-        return False
+        for call in requests_to_remove:
+            self.__add_selected_floor(call.destination)
+        self.__served_calls = tuple(requests_to_remove)
+        return bool(requests_to_remove)
 
     def __process_selected_floors_to_stop(self) -> bool:
         if self.__current_floor not in self.__selected_floors:
             return False
-        self.__selected_floors.remove(self.__current_floor)
+        self.__selected_floors.discard(self.__current_floor)
         return True
 
     def __need_to_stop(self) -> bool:
         """Check if elevator need to stop and process stoppage."""
         to_stop = False
+        self.__served_calls = ()
         if self.__current_floor in self.__selected_floors:
-            self.__selected_floors.remove(self.__current_floor)
-            to_stop = True
-        if self.__requests and self.__process_requests_to_stop():
+            self.__selected_floors.discard(self.__current_floor)
+            # Parking car arrives without opening doors.
+            to_stop = self.__park_floor is None
+            self.__park_floor = None
+        if (self.__requests and (to_stop or not self.__bypasses_calls())
+                and self.__process_requests_to_stop()):
             to_stop = True
         return to_stop
 
@@ -149,26 +298,33 @@ class ElevatorOPSAQueue(ElevatorQueueAbstract):
         direction = self.__current_direction
         floor = self.__current_floor
 
+        if self.__bypasses_calls():
+            if direction is None:
+                return self.__compare_direction(
+                    self.__get_farthest_selected_floor(),
+                )
+            if self.__has_selected_floors_ahead(direction):
+                return direction
+            return get_opposite_direction(direction)
+
         # Processing if requests.
-        for request in self.__requests:
-            compare = get_compare_operator(direction)
-            if (request.direction == direction
-                    and compare(self.current_floor, request.floor)):
+        if direction == Direction.UP:
+            highest = self.__requests.max_floor(direction)
+            if highest is not None and highest > floor:
+                return direction
+        elif direction == Direction.DOWN:
+            lowest = self.__requests.min_floor(direction)
+            if lowest is not None and lowest < floor:
                 return direction
 
         # If only selected floors are left.
         if self.__selected_floors:
             if direction is None:
-                farthest_selected_floor = self.__get_farthest_selected_floor(
-                    in_current_direction=direction is not None,
+                return self.__compare_direction(
+                    self.__get_farthest_selected_floor(),
                 )
-                return self.__compare_direction(farthest_selected_floor)
-
-            for call in self.__selected_floors:
-                compare = get_compare_operator(direction)
-                if (self.__compare_direction(call) == direction
-                        and compare(floor, call)):
-                    return direction
+            if self.__has_selected_floors_ahead(direction):
+                return direction
             return get_opposite_direction(direction)
 
         if direction is None or not self.__selected_floors:
@@ -189,37 +345,258 @@ class ElevatorOPSAQueue(ElevatorQueueAbstract):
     def __update_direction(self):
         self.__current_direction = self.__get_new_direction()
 
+    def __move_by(self, floors: int):
+        """Move car by given number of floors in its current direction."""
+        if self.__current_direction == Direction.UP:
+            self.__current_floor += floors
+        else:
+            self.__current_floor -= floors
+
     def __set_next_floor(self):
         if self.__current_direction is None:
             return self.__current_floor
-        if self.__current_direction == Direction.UP:
-            self.__current_floor += 1
+        self.__move_by(1)
+
+    def __trace_next(self, floor: Floor, direction: Direction | None):
+        tracer = self.__tracer
+        current_floor = self.__current_floor
+        current_direction = self.__current_direction or 0
+        if current_floor != floor:
+            tracer.record(TraceEventKind.MOVE, current_floor, direction or 0)
+        if self.__is_stopped:
+            tracer.record(TraceEventKind.STOP, current_floor)
+        if current_direction != (direction or 0):
+            tracer.record(
+                TraceEventKind.DIRECTION_CHANGE,
+                current_floor,
+                current_direction,
+            )
+
+    def transit_ticks(self, limit: int) -> int:
+        """Return number of next ticks, up to ``limit``, that only move.
+
+        A transit tick moves one floor without stopping or changing
+        direction. Floors between the car and the nearest floor with a
+        call or a selected floor are transit if the car keeps going the
+        same way on all of them, which only depends on what is pending
+        beyond that nearest floor.
+        """
+        direction = self.__current_direction
+        if self.__is_stopped:
+            return 0
+        if direction is None:
+            # Idle queue without requests does nothing on every tick.
+            return 0 if self.has_requests else limit
+        floor = self.__current_floor
+        requests = self.__requests
+        ahead = get_compare_operator(direction)
+        if direction == Direction.UP:
+            nearest_selected = self.__selected_floors.next_above(floor)
         else:
-            self.__current_floor -= 1
+            nearest_selected = self.__selected_floors.next_below(floor)
+        has_selected_ahead = nearest_selected is not None
+        if self.__bypasses_calls():
+            # Full car passes hall calls, so only selected floors stop it.
+            if not has_selected_ahead:
+                return 0
+            return min(abs(nearest_selected - floor) - 1, limit)
+        nearest = requests.next_floor(floor, direction)
+        if has_selected_ahead and (
+                nearest is None or ahead(nearest_selected, nearest)):
+            nearest = nearest_selected
+        if nearest is None:
+            return 0
+
+        # Direction is kept by calls in the same direction ahead, then by
+        # selected floors ahead, and only without selected floors by any
+        # call ahead.
+        if direction == Direction.UP:
+            farthest = requests.max_floor(direction)
+        else:
+            farthest = requests.min_floor(direction)
+        keeps_direction = (
+            (farthest is not None and ahead(floor, farthest))
+            or has_selected_ahead
+            or not self.__selected_floors
+        )
+        if not keeps_direction:
+            return 0
+        return min(abs(nearest - floor) - 1, limit)
+
+    def advance(self, max_ticks: int) -> int:
+        """Jump over transit ticks and determine next state after them.
+
+        Return number of ticks taken, at most ``max_ticks``.
+        """
+        floor = self.__current_floor
+        direction = self.__current_direction
+        skipped = self.transit_ticks(max_ticks - 1)
+        if skipped and direction is not None:
+            self.__move_by(skipped)
+        self.__determine_next(floor, direction)
+        return skipped + 1
+
+    def park(self, floor: Floor):
+        """Send idle car to floor as if it was selected inside."""
+        if floor != self.__current_floor:
+            self.__add_selected_floor(floor)
+            self.__park_floor = floor
 
     def determine_next(self):
-        self.__set_next_floor()
-        self.__is_stopped = self.__need_to_stop()
-        self.__update_direction()
-        logger.info(
-            "Next floor was determined.",
-            extra={
-                "current_floor": self.__current_floor,
-                "current_direction": self.__current_direction,
-            },
-        )
+        self.__determine_next(self.__current_floor, self.__current_direction)
+
+    def __determine_next(self, floor: Floor, direction: Direction | None):
+        timers = self.__timers
+        if timers is None:
+            self.__set_next_floor()
+            self.__is_stopped = self.__need_to_stop()
+            self.__update_direction()
+        else:
+            started_at = timers.clock()
+            self.__set_next_floor()
+            started_at = timers.lap("queue.next_floor", started_at)
+            self.__is_stopped = self.__need_to_stop()
+            started_at = timers.lap("queue.stop", started_at)
+            self.__update_direction()
+            timers.lap("queue.direction", started_at)
+        if self.__tracer is not None:
+            self.__trace_next(floor, direction)
 
 
 class PassengerElevator(ElevatorAbstract):
+    """Passenger elevator served by a queue algorithm.
+
+    Building floors and capacity default to class attributes and can be
+    configured per instance, e.g. for high-rise buildings with basements.
+    Queue algorithm is chosen by its registered name, OPSA by default.
+    """
 
     MAX_FLOOR: int = 12
     MIN_FLOOR: int = 1
     CAPACITY: int = 10
+    # Ticks after which ETA plan gives up on a car that does not finish.
+    ETA_LIMIT: int = 100_000
 
-    def __init__(self, start_floor: Floor | None):
-        self.__queue = ElevatorOPSAQueue(start_floor or Floor(self.MIN_FLOOR))
+    def __init__(
+            self,
+            start_floor: Floor | None,
+            tracer: TracerAbstract | None = None,
+            metrics: LatencyMetrics | None = None,
+            min_floor: int | None = None,
+            max_floor: int | None = None,
+            capacity: int | None = None,
+            algorithm: str = "opsa",
+            timers: PhaseTimers | None = None,
+            parking: ParkingPolicyAbstract | None = None,
+    ):
+        if min_floor is not None:
+            self.MIN_FLOOR = min_floor
+        if max_floor is not None:
+            self.MAX_FLOOR = max_floor
+        if capacity is not None:
+            self.CAPACITY = capacity
+        if self.MIN_FLOOR >= self.MAX_FLOOR:
+            raise ValueError("Building must have at least two floors.")
+        if start_floor is None:
+            start_floor = Floor(self.MIN_FLOOR)
+        self.__tracer = tracer
+        self.__metrics = metrics
+        self.__timers = timers
+        self.__parking = parking
+        self.__algorithm = algorithm
+        self.__queue = self.__make_queue(start_floor)
         self.__status: ElevatorStatus = ElevatorStatus.IDLE
         self.__passengers: list[Passenger] = []
+        self.__plan: ArrivalPlan | None = None
+        self.__plan_elapsed = 0
+        # Answers of the plan for the elapsed tick they were given on.
+        self.__answers: dict[Floor, int | None] = {}
+        self.__answers_elapsed = 0
+
+    def __make_queue(self, start_floor: Floor) -> ElevatorQueueAbstract:
+        return get_algorithm(self.__algorithm)(
+            start_floor,
+            tracer=self.__tracer,
+            min_floor=Floor(self.MIN_FLOOR),
+            max_floor=Floor(self.MAX_FLOOR),
+            timers=self.__timers,
+        )
+
+    @property
+    def algorithm(self) -> str:
+        """Name of queue algorithm."""
+        return self.__algorithm
+
+    def snapshot(self) -> ElevatorSnapshot:
+        return ElevatorSnapshot(
+            algorithm=self.__algorithm,
+            queue=self.__queue.snapshot(),
+            status=self.__status,
+            passengers=tuple(self.__passengers),
+            min_floor=self.MIN_FLOOR,
+            max_floor=self.MAX_FLOOR,
+            capacity=self.CAPACITY,
+        )
+
+    def restore(self, snapshot: ElevatorSnapshot):
+        """Replace elevator state with snapshot state.
+
+        Tracer, metrics, timers and parking policy of the elevator are
+        kept.
+        """
+        self.MIN_FLOOR = snapshot.min_floor
+        self.MAX_FLOOR = snapshot.max_floor
+        self.CAPACITY = snapshot.capacity
+        self.__algorithm = snapshot.algorithm
+        self.__queue = self.__make_queue(snapshot.queue.current_floor)
+        self.__queue.restore(snapshot.queue)
+        self.__status = snapshot.status
+        self.__passengers = list(snapshot.passengers)
+        self.__update_load()
+        self.__plan = None
+
+    def fork(
+            self,
+            tracer: TracerAbstract | None = None,
+            metrics: LatencyMetrics | None = None,
+            timers: PhaseTimers | None = None,
+            parking: ParkingPolicyAbstract | None = None,
+    ) -> "PassengerElevator":
+        """Return independent elevator in the same state.
+
+        Forks do not share tracer, metrics, timers and parking policy
+        with the original elevator unless they are passed explicitly.
+        """
+        return self.from_snapshot(
+            self.snapshot(),
+            tracer=tracer,
+            metrics=metrics,
+            timers=timers,
+            parking=parking,
+        )
+
+    @classmethod
+    def from_snapshot(
+            cls,
+            snapshot: ElevatorSnapshot,
+            tracer: TracerAbstract | None = None,
+            metrics: LatencyMetrics | None = None,
+            timers: PhaseTimers | None = None,
+            parking: ParkingPolicyAbstract | None = None,
+    ) -> "PassengerElevator":
+        elevator = cls(
+            start_floor=snapshot.queue.current_floor,
+            tracer=tracer,
+            metrics=metrics,
+            timers=timers,
+            parking=parking,
+            min_floor=snapshot.min_floor,
+            max_floor=snapshot.max_floor,
+            capacity=snapshot.capacity,
+            algorithm=snapshot.algorithm,
+        )
+        elevator.restore(snapshot)
+        return elevator
 
     @property
     def doors(self) -> DoorsStatus:
@@ -239,6 +616,61 @@ class PassengerElevator(ElevatorAbstract):
     def capacity_left(self) -> int:
         return self.CAPACITY - len(self.__passengers)
 
+    @property
+    def metrics(self) -> LatencyMetrics | None:
+        return self.__metrics
+
+    @property
+    def timers(self) -> PhaseTimers | None:
+        return self.__timers
+
+    @property
+    def parking(self) -> ParkingPolicyAbstract | None:
+        return self.__parking
+
+    def __update_load(self):
+        """Let the queue bypass hall calls while the car is full."""
+        is_full = self.capacity_left < 1
+        if is_full != self.__queue.is_full:
+            self.__queue.is_full = is_full
+            self.__plan = None
+
+    def eta(self, floor: Floor) -> int | None:
+        """Return number of ticks until the car is on floor.
+
+        The car is expected to follow its current plan and stay idle on
+        its last stop. Plan is made once, on the first query after
+        requests, load or parking changed it, and other queries only look
+        up the floor. Answers are kept until the car moves, so repeated
+        queries between moves are a dictionary lookup. Return None if the
+        car does not finish its plan within ``ETA_LIMIT`` ticks before
+        reaching the floor.
+        """
+        if not self.MIN_FLOOR <= floor <= self.MAX_FLOOR:
+            raise InvalidFloorError(
+                f"Please make sure that floor is "
+                f"in range [{self.MIN_FLOOR} , {self.MAX_FLOOR}]",
+            )
+        plan = self.__plan
+        if plan is None:
+            queue = get_algorithm(self.__algorithm)(
+                self.current_floor,
+                min_floor=Floor(self.MIN_FLOOR),
+                max_floor=Floor(self.MAX_FLOOR),
+            )
+            queue.restore(self.__queue.snapshot())
+            plan = self.__plan = ArrivalPlan.from_queue(queue, self.ETA_LIMIT)
+            self.__plan_elapsed = 0
+            self.__answers = {}
+        elapsed = self.__plan_elapsed
+        if elapsed != self.__answers_elapsed:
+            self.__answers = {}
+            self.__answers_elapsed = elapsed
+        elif floor in self.__answers:
+            return self.__answers[floor]
+        eta = self.__answers[floor] = plan.eta(floor, elapsed)
+        return eta
+
     def enter_elevator(self, passenger: Passenger):
         if self.doors == DoorsStatus.CLOSED:
             raise ElevatorDoorsClosedError
@@ -248,12 +680,18 @@ class PassengerElevator(ElevatorAbstract):
                 f"Current capacity: {self.CAPACITY}"
             )
         self.__passengers.append(passenger)
+        self.__update_load()
+        if self.__metrics is not None:
+            self.__metrics.on_board(passenger)
 
     def exit_elevator(self, passenger: Passenger):
         if self.doors == DoorsStatus.CLOSED:
             raise ElevatorDoorsClosedError
         if passenger in self.passengers:
             self.__passengers.remove(passenger)
+            self.__update_load()
+            if self.__metrics is not None:
+                self.__metrics.on_exit(passenger)
             logger.info(
                 "Passenger got out of the elevator.",
                 extra={"passenger_id": passenger.id},
@@ -275,21 +713,79 @@ class PassengerElevator(ElevatorAbstract):
     def selected_floors(self) -> tuple[Floor, ...]:
         return self.__queue.selected_floors
 
+    @property
+    def served_calls(self) -> tuple[Call, ...]:
+        return self.__queue.served_calls
+
+    @property
+    def pending_stops(self) -> int:
+        return self.__queue.pending_stops
+
+    @property
+    def stops_range(self) -> tuple[Floor, Floor] | None:
+        return self.__queue.stops_range
+
     def add_request(self, call: Call):
         min_floor = self.MIN_FLOOR
         max_floor = self.MAX_FLOOR
-        if (min_floor >= call.floor <= max_floor and
-                min_floor >= call.destination <= max_floor):
+        if not (min_floor <= call.floor <= max_floor
+                and min_floor <= call.destination <= max_floor):
             raise InvalidFloorError(f"Please make sure that floor is "
                                     f"in range [{min_floor} , {max_floor}]")
         self.__queue.add_request(call)
+        self.__plan = None
+        if self.__parking is not None:
+            self.__parking.record(call)
+
+    def _add_valid_requests(self, calls: list[Call]):
+        self.__queue.add_requests(calls)
+        self.__plan = None
+        if self.__parking is not None:
+            for call in calls:
+                self.__parking.record(call)
+
+    def transit_ticks(self, limit: int) -> int:
+        return self.__queue.transit_ticks(limit)
+
+    def advance(self, max_ticks: int) -> int:
+        status = self.__status
+        ticks = self.__queue.advance(max_ticks)
+        self.__plan_elapsed += ticks
+        self.__update_status(status)
+        return ticks
 
     def move(self):
+        status = self.__status
+        timers = self.__timers
+        self.__plan_elapsed += 1
+        if timers is None:
+            self.__queue.determine_next()
+            self.__update_status(status)
+            return
+        started_at = timers.clock()
         self.__queue.determine_next()
-        if not self.__queue.has_requests:
-            self.__status = ElevatorStatus.IDLE
-        elif self.__queue.is_stopped:
+        started_at = timers.lap("elevator.queue", started_at)
+        self.__update_status(status)
+        timers.lap("elevator.status", started_at)
+
+    def __update_status(self, status: ElevatorStatus):
+        if (self.__parking is not None and status != ElevatorStatus.IDLE
+                and not self.__queue.is_stopped
+                and not self.__queue.has_requests):
+            # Car goes idle, so it is sent where the next call is likely.
+            floor = self.__parking.choose_floor(self.current_floor)
+            if floor is not None:
+                self.__queue.park(floor)
+                self.__plan = None
+        if self.__queue.is_stopped:
             self.__status = ElevatorStatus.WAITING_ON_THE_FLOOR
+        elif not self.__queue.has_requests:
+            self.__status = ElevatorStatus.IDLE
         else:
             self.__status = ElevatorStatus.IN_MOVEMENT
-        logger.info("Elevator moved.", extra={"status": self.__status})
+        if self.__tracer is not None and status != self.__status:
+            self.__tracer.record(
+                TraceEventKind.STATUS_CHANGE,
+                self.current_floor,
+                self.__status,
+            )
@@ -0,0 +1,69 @@
+import bisect
+
+import attrs
+
+from core import ElevatorQueueAbstract, Floor
+
+
+@attrs.frozen
+class ArrivalPlan:
+    """Ticks on which a car following its current plan is on floors.
+
+    Plan is made by stepping a copy of the car's queue until it has no
+    requests left. Queues are deterministic, so the plan stays valid
+    while the car only moves, and ``elapsed`` ticks since the plan was
+    made are enough to answer queries. A full car is expected to have
+    room again after its next stop, where passengers leave.
+
+    Attrs:
+        visits: Ascending ticks on which the car is on every floor.
+        end_tick: Tick on which the car has no requests left.
+        end_floor: Floor on which the car has no requests left.
+        complete: Whether the car finishes all requests in the plan.
+    """
+    visits: dict[Floor, list[int]]
+    end_tick: int
+    end_floor: Floor
+    complete: bool
+
+    @classmethod
+    def from_queue(
+            cls,
+            queue: ElevatorQueueAbstract,
+            limit: int,
+    ) -> "ArrivalPlan":
+        """Return plan of queue for up to ``limit`` ticks.
+
+        Queue is stepped forward, so a copy of the car's queue has to be
+        passed.
+        """
+        visits: dict[Floor, list[int]] = {queue.current_floor: [0]}
+        tick = 0
+        while queue.has_requests and tick < limit:
+            queue.determine_next()
+            tick += 1
+            if queue.is_full and queue.is_stopped:
+                queue.is_full = False
+            visits.setdefault(queue.current_floor, []).append(tick)
+        return cls(
+            visits=visits,
+            end_tick=tick,
+            end_floor=queue.current_floor,
+            complete=not queue.has_requests,
+        )
+
+    def eta(self, floor: Floor, elapsed: int = 0) -> int | None:
+        """Return ticks until the car is on floor ``elapsed`` ticks later.
+
+        Floors the car does not visit after that are reached from the
+        floor where it finishes the plan. Return None if the car does not
+        finish the plan before reaching the floor.
+        """
+        ticks = self.visits.get(floor)
+        if ticks:
+            index = bisect.bisect_left(ticks, elapsed)
+            if index < len(ticks):
+                return ticks[index] - elapsed
+        if not self.complete:
+            return None
+        return max(self.end_tick - elapsed, 0) + abs(floor - self.end_floor)
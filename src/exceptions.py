@@ -12,3 +12,7 @@ class InvalidFloorError(Exception):
 
 class ElevatorDoorsClosedError(Exception):
     """Elevator doors are closed."""
+
+
+class InvalidTraceError(Exception):
+    """File is not a trace of supported version."""
@@ -0,0 +1,100 @@
+import abc
+import csv
+import json
+import os
+import pathlib
+import typing as t
+
+Record = dict[str, t.Any]
+
+FORMATS = ("csv", "jsonl")
+
+
+class RecordWriterAbstract(abc.ABC):
+    """Buffered writer of flat records to a text file.
+
+    Records are kept in a list and written in bulk when ``buffer_size``
+    of them are collected or writer is closed, so a record costs one
+    list append on the simulation hot path.
+    """
+
+    def __init__(self, path: str | os.PathLike, buffer_size: int = 4096):
+        self._file = open(path, "w", newline="")
+        self.__buffer: list[Record] = []
+        self.__buffer_size = buffer_size
+        self.__written = 0
+
+    def __enter__(self) -> "RecordWriterAbstract":
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    @property
+    def written(self) -> int:
+        """Number of written records."""
+        return self.__written + len(self.__buffer)
+
+    def write(self, record: Record):
+        self.__buffer.append(record)
+        if len(self.__buffer) >= self.__buffer_size:
+            self.flush()
+
+    @abc.abstractmethod
+    def _write_records(self, records: list[Record]):
+        """Write records to file at once."""
+
+    def flush(self):
+        if self.__buffer:
+            self._write_records(self.__buffer)
+            self.__written += len(self.__buffer)
+            self.__buffer = []
+        self._file.flush()
+
+    def close(self):
+        if not self._file.closed:
+            self.flush()
+            self._file.close()
+
+
+class CsvRecordWriter(RecordWriterAbstract):
+    """Writer of records as CSV rows with a header of first record keys."""
+
+    def __init__(self, path: str | os.PathLike, buffer_size: int = 4096):
+        super().__init__(path, buffer_size)
+        self.__writer = csv.writer(self._file)
+        self.__fields: list[str] | None = None
+
+    def _write_records(self, records: list[Record]):
+        if self.__fields is None:
+            self.__fields = list(records[0])
+            self.__writer.writerow(self.__fields)
+        fields = self.__fields
+        self.__writer.writerows(
+            [record[field] for field in fields] for record in records
+        )
+
+
+class JsonlRecordWriter(RecordWriterAbstract):
+    """Writer of records as JSON objects, one per line."""
+
+    def _write_records(self, records: list[Record]):
+        dumps = json.dumps
+        self._file.write("".join(dumps(record) + "\n" for record in records))
+
+
+def open_record_writer(
+        path: str | os.PathLike,
+        format: str | None = None,
+        buffer_size: int = 4096,
+) -> RecordWriterAbstract:
+    """Return writer of given format, by default taken from file suffix."""
+    if format is None:
+        format = pathlib.Path(path).suffix.lstrip(".").lower()
+    if format == "csv":
+        return CsvRecordWriter(path, buffer_size)
+    if format == "jsonl":
+        return JsonlRecordWriter(path, buffer_size)
+    raise ValueError(
+        f"Unknown format {format!r}, choose one of: {', '.join(FORMATS)}.",
+    )
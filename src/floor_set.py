@@ -0,0 +1,92 @@
+import typing as t
+
+from core import Floor
+
+
+class FloorSet:
+    """Set of floors backed by an integer bitset.
+
+    Bit ``i`` stands for floor ``base + i``. Base starts at the first
+    added floor and is lowered when a floor below it is added, so any
+    building height and basements are supported. Lowest, highest and
+    nearest floors are found with bit operations instead of scans.
+    """
+
+    def __init__(self, floors: t.Iterable[Floor] = ()):
+        self.__bits = 0
+        self.__base = 0
+        for floor in floors:
+            self.add(floor)
+
+    def __len__(self) -> int:
+        return self.__bits.bit_count()
+
+    def __bool__(self) -> bool:
+        return bool(self.__bits)
+
+    def __contains__(self, floor: Floor) -> bool:
+        offset = floor - self.__base
+        return offset >= 0 and bool(self.__bits >> offset & 1)
+
+    def __iter__(self) -> t.Iterator[Floor]:
+        """Iterate over floors in ascending order."""
+        bits = self.__bits
+        while bits:
+            lowest = bits & -bits
+            yield Floor(self.__base + lowest.bit_length() - 1)
+            bits ^= lowest
+
+    def add(self, floor: Floor):
+        if not self.__bits:
+            self.__base = floor
+        elif floor < self.__base:
+            self.__bits <<= self.__base - floor
+            self.__base = floor
+        self.__bits |= 1 << (floor - self.__base)
+
+    def discard(self, floor: Floor):
+        if floor in self:
+            self.__bits ^= 1 << (floor - self.__base)
+
+    def lowest(self) -> Floor | None:
+        bits = self.__bits
+        if not bits:
+            return None
+        return Floor(self.__base + (bits & -bits).bit_length() - 1)
+
+    def highest(self) -> Floor | None:
+        if not self.__bits:
+            return None
+        return Floor(self.__base + self.__bits.bit_length() - 1)
+
+    def __above(self, floor: Floor) -> int:
+        offset = floor - self.__base + 1
+        if offset <= 0:
+            return self.__bits
+        return self.__bits >> offset << offset
+
+    def __below(self, floor: Floor) -> int:
+        offset = floor - self.__base
+        if offset <= 0:
+            return 0
+        return self.__bits & ((1 << offset) - 1)
+
+    def any_above(self, floor: Floor) -> bool:
+        return bool(self.__above(floor))
+
+    def any_below(self, floor: Floor) -> bool:
+        return bool(self.__below(floor))
+
+    def next_above(self, floor: Floor) -> Floor | None:
+        """Return the nearest floor above given floor."""
+        bits = self.__above(floor)
+        if not bits:
+            return None
+        return Floor(self.__base + (bits & -bits).bit_length() - 1)
+
+    def next_below(self, floor: Floor) -> Floor | None:
+        """Return the nearest floor below given floor."""
+        bits = self.__below(floor)
+        if not bits:
+            return None
+        return Floor(self.__base + bits.bit_length() - 1)
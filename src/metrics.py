@@ -0,0 +1,207 @@
+import math
+import time
+import typing as t
+
+from core import Passenger
+
+Clock = t.Callable[[], int]
+
+
+class StreamingHistogram:
+    """Histogram of non-negative integers with bounded memory.
+
+    Values below ``2 * 2 ** precision`` are counted exactly. Larger values
+    fall into log-linear buckets: every power of two range is split into
+    ``2 ** precision`` equal buckets, so the relative error of a
+    percentile is below ``2 ** -precision``. Memory depends only on the
+    largest recorded value, never on number of samples.
+    """
+
+    def __init__(self, precision: int = 5):
+        self.__precision = precision
+        self.__sub_buckets = 1 << precision
+        self.__counts: list[int] = []
+        self.__count = 0
+        self.__total = 0
+        self.__min: int | None = None
+        self.__max: int | None = None
+
+    @property
+    def count(self) -> int:
+        return self.__count
+
+    @property
+    def min(self) -> int | None:
+        return self.__min
+
+    @property
+    def max(self) -> int | None:
+        return self.__max
+
+    @property
+    def mean(self) -> float:
+        return self.__total / self.__count if self.__count else 0.0
+
+    @property
+    def buckets(self) -> int:
+        """Number of allocated buckets."""
+        return len(self.__counts)
+
+    def __index(self, value: int) -> int:
+        shift = max(value.bit_length() - self.__precision - 1, 0)
+        return shift * self.__sub_buckets + (value >> shift)
+
+    def __bounds(self, index: int) -> tuple[int, int]:
+        shift = max(index // self.__sub_buckets - 1, 0)
+        mantissa = index - shift * self.__sub_buckets
+        return mantissa << shift, ((mantissa + 1) << shift) - 1
+
+    def record(self, value: int, count: int = 1):
+        if value < 0:
+            raise ValueError("Histogram accepts only non-negative values.")
+        index = self.__index(value)
+        counts = self.__counts
+        if index >= len(counts):
+            counts.extend([0] * (index + 1 - len(counts)))
+        counts[index] += count
+        self.__count += count
+        self.__total += value * count
+        if self.__min is None or value < self.__min:
+            self.__min = value
+        if self.__max is None or value > self.__max:
+            self.__max = value
+
+    def percentile(self, percent: float) -> int | None:
+        """Return value below or equal to which ``percent`` of values are."""
+        if not self.__count:
+            return None
+        rank = max(math.ceil(percent / 100 * self.__count), 1)
+        seen = 0
+        for index, count in enumerate(self.__counts):
+            seen += count
+            if seen >= rank:
+                _, high = self.__bounds(index)
+                return max(min(high, self.__max), self.__min)
+        return self.__max
+
+    def merge(self, other: "StreamingHistogram"):
+        """Add counts of other histogram with the same precision."""
+        if other.__precision != self.__precision:
+            raise ValueError("Histograms have different precision.")
+        if not other.__count:
+            return
+        counts = self.__counts
+        if len(other.__counts) > len(counts):
+            counts.extend([0] * (len(other.__counts) - len(counts)))
+        for index, count in enumerate(other.__counts):
+            counts[index] += count
+        self.__count += other.__count
+        self.__total += other.__total
+        if self.__min is None or other.__min < self.__min:
+            self.__min = other.__min
+        if self.__max is None or other.__max > self.__max:
+            self.__max = other.__max
+
+
+class LatencyMetrics:
+    """Collector of passenger wait and ride times.
+
+    Wait time is the time from call to boarding, ride time is the time
+    from boarding to exit. Only passengers in flight are remembered,
+    finished ones are reduced to histogram counts.
+
+    Args:
+        clock: Source of current time. Defaults to monotonic nanoseconds,
+            simulations replace it with the virtual clock.
+    """
+
+    def __init__(self, clock: Clock = time.monotonic_ns, precision: int = 5):
+        self.clock = clock
+        self.wait = StreamingHistogram(precision)
+        self.ride = StreamingHistogram(precision)
+        self.__called_at: dict[int, int] = {}
+        self.__boarded_at: dict[int, int] = {}
+
+    @property
+    def in_flight(self) -> int:
+        """Number of passengers waiting or riding."""
+        return len(self.__called_at) + len(self.__boarded_at)
+
+    def on_call(self, passenger: Passenger):
+        self.__called_at[passenger.id] = self.clock()
+
+    def on_board(self, passenger: Passenger):
+        now = self.clock()
+        called_at = self.__called_at.pop(passenger.id, None)
+        if called_at is not None:
+            self.wait.record(now - called_at)
+        self.__boarded_at[passenger.id] = now
+
+    def on_exit(self, passenger: Passenger):
+        boarded_at = self.__boarded_at.pop(passenger.id, None)
+        if boarded_at is not None:
+            self.ride.record(self.clock() - boarded_at)
+
+    def summary(self) -> dict[str, float | int | None]:
+        """Return counts, means and p50/p95/p99 of wait and ride times."""
+        summary: dict[str, float | int | None] = {}
+        for name, histogram in (("wait", self.wait), ("ride", self.ride)):
+            summary[f"{name}_count"] = histogram.count
+            summary[f"{name}_mean"] = histogram.mean
+            for percent in (50, 95, 99):
+                summary[f"{name}_p{percent}"] = histogram.percentile(percent)
+        return summary
+
+
+class PhaseTimers:
+    """Cumulative wall-clock nanoseconds and call counts per phase.
+
+    Elevators and queues accept optional timers and time phases of every
+    tick with ``lap``, e.g.::
+
+        started_at = timers.clock()
+        ...
+        started_at = timers.lap("queue.stop", started_at)
+
+    Timers are read at run time with ``summary``.
+    """
+
+    def __init__(self, clock: Clock = time.perf_counter_ns):
+        self.clock = clock
+        self.__totals: dict[str, int] = {}
+        self.__counts: dict[str, int] = {}
+
+    def lap(self, phase: str, started_at: int) -> int:
+        """Add time elapsed since ``started_at`` to phase, return now."""
+        now = self.clock()
+        self.__totals[phase] = self.__totals.get(phase, 0) + now - started_at
+        self.__counts[phase] = self.__counts.get(phase, 0) + 1
+        return now
+
+    def total_ns(self, phase: str) -> int:
+        return self.__totals.get(phase, 0)
+
+    def count(self, phase: str) -> int:
+        return self.__counts.get(phase, 0)
+
+    def reset(self):
+        self.__totals.clear()
+        self.__counts.clear()
+
+    def summary(self) -> dict[str, dict[str, float | int]]:
+        """Return total and mean nanoseconds and calls of every phase.
+
+        Phases are ordered from the most to the least total time.
+        """
+        return {
+            phase: {
+                "total_ns": total,
+                "calls": self.__counts[phase],
+                "mean_ns": total / self.__counts[phase],
+            }
+            for phase, total in sorted(
+                self.__totals.items(),
+                key=lambda item: item[1],
+                reverse=True,
+            )
+        }
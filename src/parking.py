@@ -0,0 +1,111 @@
+import abc
+import time
+import typing as t
+
+from core import Call, Floor
+
+Clock = t.Callable[[], int]
+
+TICKS_PER_HOUR = 3600
+TICKS_PER_DAY = 24 * TICKS_PER_HOUR
+
+
+class ParkingPolicyAbstract(abc.ABC):
+    """Abstract class for policy choosing where an idle car waits.
+
+    Elevators accept an optional policy, tell it about every call and
+    ask it for a floor every time the car goes idle. Policies read time
+    from their ``clock``, which simulations switch to the virtual clock.
+    """
+
+    clock: Clock
+
+    @abc.abstractmethod
+    def record(self, call: Call):
+        """Learn from a new call."""
+
+    @abc.abstractmethod
+    def choose_floor(self, floor: Floor) -> Floor | None:
+        """Return floor for idle car on ``floor``, None to stay there."""
+
+
+class DemandParking(ParkingPolicyAbstract):
+    """Policy parking idle car on the floor with the highest demand.
+
+    Call origins are counted per floor in time-of-day slots, e.g. hours
+    of a day. Counts decay exponentially with ``half_life`` ticks, so
+    the histogram follows changing traffic. Expected demand of a floor
+    is its decayed count in the slot of current time.
+
+    Decay is applied lazily: counts are stored scaled by ``2 ** (age /
+    half_life)`` relative to a common origin, so recording a call and
+    comparing floors never touch other counts.
+
+    Args:
+        clock: Source of current tick. Defaults to seconds of wall-clock
+            time, simulations replace it with the virtual clock.
+        half_life: Ticks in which weight of a call halves.
+        slot_ticks: Ticks in a time-of-day slot.
+        slots: Number of slots in a day.
+        min_demand: Expected demand below which car stays where it is.
+    """
+
+    # Counts are rescaled before scale factor exceeds 2 ** RESCALE_AFTER.
+    RESCALE_AFTER = 512
+
+    def __init__(
+            self,
+            clock: Clock = lambda: int(time.time()),
+            half_life: int = TICKS_PER_DAY,
+            slot_ticks: int = TICKS_PER_HOUR,
+            slots: int = 24,
+            min_demand: float = 1.0,
+    ):
+        self.clock = clock
+        self.__half_life = half_life
+        self.__slot_ticks = slot_ticks
+        self.__slots = slots
+        self.__min_demand = min_demand
+        self.__counts: list[dict[Floor, float]] = [{} for _ in range(slots)]
+        self.__origin: int | None = None
+
+    def __slot(self, tick: int) -> dict[Floor, float]:
+        return self.__counts[tick // self.__slot_ticks % self.__slots]
+
+    def __scale(self, tick: int) -> float:
+        """Return weight of a call on ``tick`` in stored units."""
+        if self.__origin is None:
+            self.__origin = tick
+        exponent = (tick - self.__origin) / self.__half_life
+        if exponent > self.RESCALE_AFTER:
+            factor = 2 ** -exponent
+            for counts in self.__counts:
+                for floor in counts:
+                    counts[floor] *= factor
+            self.__origin = tick
+            exponent = 0
+        return 2 ** exponent
+
+    def record(self, call: Call):
+        tick = self.clock()
+        # Scale is taken first, as it may rescale stored counts.
+        weight = self.__scale(tick)
+        counts = self.__slot(tick)
+        counts[call.floor] = counts.get(call.floor, 0) + weight
+
+    def demand(self, floor: Floor, tick: int | None = None) -> float:
+        """Return expected demand of floor at tick, now by default."""
+        if tick is None:
+            tick = self.clock()
+        scale = self.__scale(tick)
+        return self.__slot(tick).get(floor, 0) / scale
+
+    def choose_floor(self, floor: Floor) -> Floor | None:
+        tick = self.clock()
+        counts = self.__slot(tick)
+        if not counts:
+            return None
+        best = max(counts, key=counts.__getitem__)
+        if best == floor or self.demand(best, tick) < self.__min_demand:
+            return None
+        return best
@@ -0,0 +1,94 @@
+import typing as t
+
+import numpy as np
+
+from core import Direction
+
+NOT_YET = -1
+
+
+class PassengerTable:
+    """Array-backed table of passengers for bulk simulation runs.
+
+    Every passenger is a row number in a set of NumPy columns instead of
+    a Python object. Passenger id is the row number. Tick columns hold
+    ``NOT_YET`` until the event happens. Columns grow by doubling.
+    """
+
+    def __init__(self, capacity: int = 1024):
+        self.__size = 0
+        self.floor = np.zeros(capacity, dtype=np.int32)
+        self.destination = np.zeros(capacity, dtype=np.int32)
+        self.direction = np.zeros(capacity, dtype=np.int8)
+        self.called_at = np.full(capacity, NOT_YET, dtype=np.int64)
+        self.boarded_at = np.full(capacity, NOT_YET, dtype=np.int64)
+        self.exited_at = np.full(capacity, NOT_YET, dtype=np.int64)
+
+    def __len__(self) -> int:
+        return self.__size
+
+    @property
+    def capacity(self) -> int:
+        return self.floor.shape[0]
+
+    def __reserve(self, size: int):
+        if size <= self.capacity:
+            return
+        capacity = max(size, 2 * self.capacity)
+        for name in ("floor", "destination", "direction", "called_at",
+                     "boarded_at", "exited_at"):
+            column = getattr(self, name)
+            grown = np.full(
+                capacity,
+                NOT_YET if column.dtype == np.int64 else 0,
+                dtype=column.dtype,
+            )
+            grown[:column.shape[0]] = column
+            setattr(self, name, grown)
+
+    def add(self, floor: int, destination: int, called_at: int) -> int:
+        """Add passenger and return its id."""
+        return int(self.add_many([floor], [destination], called_at)[0])
+
+    def add_many(
+            self,
+            floors: t.Sequence[int] | np.ndarray,
+            destinations: t.Sequence[int] | np.ndarray,
+            called_at: int | t.Sequence[int] | np.ndarray,
+    ) -> np.ndarray:
+        """Add passengers in bulk and return their ids."""
+        floors = np.asarray(floors, dtype=np.int32)
+        destinations = np.asarray(destinations, dtype=np.int32)
+        if np.any(floors == destinations):
+            raise ValueError("Destination floor cannot be equal to floor.")
+        start = self.__size
+        end = start + floors.shape[0]
+        self.__reserve(end)
+        self.floor[start:end] = floors
+        self.destination[start:end] = destinations
+        self.direction[start:end] = np.where(
+            destinations > floors,
+            Direction.UP,
+            Direction.DOWN,
+        )
+        self.called_at[start:end] = called_at
+        self.__size = end
+        return np.arange(start, end, dtype=np.int64)
+
+    def board(self, ids: int | t.Sequence[int] | np.ndarray, tick: int):
+        self.boarded_at[ids] = tick
+
+    def exit(self, ids: int | t.Sequence[int] | np.ndarray, tick: int):
+        self.exited_at[ids] = tick
+
+    def wait_times(self) -> np.ndarray:
+        """Return wait times of passengers that have boarded."""
+        boarded = self.boarded_at[:self.__size]
+        mask = boarded != NOT_YET
+        return boarded[mask] - self.called_at[:self.__size][mask]
+
+    def ride_times(self) -> np.ndarray:
+        """Return ride times of passengers that have exited."""
+        exited = self.exited_at[:self.__size]
+        mask = exited != NOT_YET
+        return exited[mask] - self.boarded_at[:self.__size][mask]
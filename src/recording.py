@@ -0,0 +1,217 @@
+import enum
+import os
+import typing as t
+
+import numpy as np
+
+from core import Call, ElevatorAbstract
+from exceptions import InvalidTraceError
+from traffic import ArrivalChunk, ArrivalsAbstract
+
+MAGIC = b"ELVTRACE"
+VERSION = 1
+HEADER_DTYPE = np.dtype([
+    ("magic", "S8"),
+    ("version", "<u4"),
+    ("record_size", "<u4"),
+])
+RECORD_DTYPE = np.dtype([
+    ("tick", "<u8"),
+    ("kind", "u1"),
+    ("car", "u1"),
+    ("floor", "<i2"),
+    ("destination", "<i2"),
+    ("direction", "u1"),
+    ("status", "u1"),
+])
+FLOOR_LIMITS = (
+    int(np.iinfo(RECORD_DTYPE["floor"]).min),
+    int(np.iinfo(RECORD_DTYPE["floor"]).max),
+)
+MAX_CARS = int(np.iinfo(RECORD_DTYPE["car"]).max) + 1
+
+
+class RecordKind(enum.IntEnum):
+    """Kind of trace record."""
+    CALL = 1
+    STATE = 2
+
+
+class TraceRecorder:
+    """Writer of calls and elevator states to a fixed-width binary trace.
+
+    File starts with a header followed by ``RECORD_DTYPE`` records in
+    tick order. Records are buffered in a NumPy array and written in
+    bulk when buffer is full or recorder is closed.
+
+    Records store floors and car numbers in fixed-width fields, so the
+    building and the number of cars are checked once, when the recorder
+    is created, instead of on every record. They default to the widest
+    ones the fields hold.
+    """
+
+    def __init__(
+            self,
+            path: str | os.PathLike,
+            record_states: bool = False,
+            buffer_size: int = 65536,
+            min_floor: int = FLOOR_LIMITS[0],
+            max_floor: int = FLOOR_LIMITS[1],
+            cars: int = MAX_CARS,
+    ):
+        if not FLOOR_LIMITS[0] <= min_floor <= max_floor <= FLOOR_LIMITS[1]:
+            raise ValueError(
+                f"Recorded floors must be in range "
+                f"[{FLOOR_LIMITS[0]}, {FLOOR_LIMITS[1]}].",
+            )
+        if not 0 < cars <= MAX_CARS:
+            raise ValueError(f"Recorder supports up to {MAX_CARS} cars.")
+        self.record_states = record_states
+        self.min_floor = min_floor
+        self.max_floor = max_floor
+        self.cars = cars
+        self.__file = open(path, "wb")
+        header = np.zeros(1, dtype=HEADER_DTYPE)
+        header[0] = (MAGIC, VERSION, RECORD_DTYPE.itemsize)
+        header.tofile(self.__file)
+        self.__buffer = np.zeros(buffer_size, dtype=RECORD_DTYPE)
+        self.__size = 0
+        self.__written = 0
+
+    def __enter__(self) -> "TraceRecorder":
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    def check(self, elevators: t.Sequence[ElevatorAbstract]):
+        """Raise ValueError if records of elevators do not fit recorder."""
+        if len(elevators) > self.cars:
+            raise ValueError(
+                f"Recorder was created for up to {self.cars} cars.",
+            )
+        for elevator in elevators:
+            if (elevator.MIN_FLOOR < self.min_floor
+                    or elevator.MAX_FLOOR > self.max_floor):
+                raise ValueError(
+                    f"Recorder was created for floors in range "
+                    f"[{self.min_floor}, {self.max_floor}].",
+                )
+
+    @property
+    def written(self) -> int:
+        """Number of recorded records."""
+        return self.__written + self.__size
+
+    def __append(self, record: tuple):
+        self.__buffer[self.__size] = record
+        self.__size += 1
+        if self.__size == self.__buffer.shape[0]:
+            self.flush()
+
+    def record_call(self, tick: int, call: Call, car: int = 0):
+        self.__append((
+            tick, RecordKind.CALL, car, call.floor, call.destination,
+            call.direction, 0,
+        ))
+
+    def record_state(
+            self,
+            tick: int,
+            elevator: ElevatorAbstract,
+            car: int = 0,
+    ):
+        self.__append((
+            tick, RecordKind.STATE, car, elevator.current_floor, 0,
+            elevator.current_direction or 0, elevator.status,
+        ))
+
+    def flush(self):
+        self.__buffer[:self.__size].tofile(self.__file)
+        self.__written += self.__size
+        self.__size = 0
+        self.__file.flush()
+
+    def close(self):
+        if not self.__file.closed:
+            self.flush()
+            self.__file.close()
+
+
+class TraceReplayer(ArrivalsAbstract):
+    """Reader of binary traces written by ``TraceRecorder``.
+
+    File is memory-mapped and accessed as NumPy columns, so records are
+    never parsed one by one and only touched pages are read from disk.
+    """
+
+    def __init__(self, path: str | os.PathLike):
+        header = np.fromfile(path, dtype=HEADER_DTYPE, count=1)
+        if (header.shape[0] != 1 or header[0]["magic"] != MAGIC
+                or header[0]["version"] != VERSION
+                or header[0]["record_size"] != RECORD_DTYPE.itemsize):
+            raise InvalidTraceError(f"{path} is not a supported trace.")
+        if os.path.getsize(path) > HEADER_DTYPE.itemsize:
+            self.records = np.memmap(
+                path,
+                dtype=RECORD_DTYPE,
+                mode="r",
+                offset=HEADER_DTYPE.itemsize,
+            )
+        else:
+            self.records = np.zeros(0, dtype=RECORD_DTYPE)
+        is_call = self.records["kind"] == RecordKind.CALL
+        if is_call.all():
+            # Call-only traces stay memory-mapped without copying.
+            self.calls = self.records
+            self.states = self.records[:0]
+        else:
+            self.calls = self.records[is_call]
+            self.states = self.records[~is_call]
+
+    def __len__(self) -> int:
+        return self.calls.shape[0]
+
+    def chunks(
+            self,
+            chunk_size: int = 65536,
+            until: int | None = None,
+    ) -> t.Iterator[ArrivalChunk]:
+        """Yield consecutive chunks of call records.
+
+        Only calls recorded before tick ``until`` are yielded if it is set.
+        """
+        calls = self.calls
+        if until is not None:
+            calls = calls[:np.searchsorted(calls["tick"], until)]
+        for start in range(0, calls.shape[0], chunk_size):
+            chunk = calls[start:start + chunk_size]
+            yield ArrivalChunk(
+                ticks=chunk["tick"],
+                floors=chunk["floor"],
+                destinations=chunk["destination"],
+            )
+
+    def iter_batches(
+            self,
+            batch_size: int = 65536,
+            until: int | None = None,
+    ) -> t.Iterator[tuple[np.ndarray, list[Call]]]:
+        """Yield ticks and calls of consecutive batches of call records."""
+        for chunk in self.chunks(batch_size, until):
+            yield chunk.ticks, chunk.calls()
+
+    def feed(
+            self,
+            elevator: ElevatorAbstract,
+            until: int | None = None,
+    ) -> int:
+        """Add calls recorded before ``until`` to elevator at once.
+
+        Every batch of calls is validated and added in bulk, calls outside
+        of the building are skipped. Return number of added calls.
+        """
+        added = 0
+        for _, calls in self.iter_batches(until=until):
+            added += elevator.add_requests(calls).accepted
+        return added
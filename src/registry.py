@@ -0,0 +1,88 @@
+import collections
+
+from core import Direction, ElevatorAbstract, Floor, Passenger
+from metrics import LatencyMetrics
+
+
+class HallCallRegistry:
+    """Registry of passengers waiting for an elevator.
+
+    Passengers wait in FIFO queues per floor and direction of their call,
+    so finding who boards on a floor does not depend on the number of
+    waiting passengers.
+    """
+
+    def __init__(self, metrics: LatencyMetrics | None = None):
+        self.__metrics = metrics
+        self.__waiting: dict[
+            tuple[Floor, Direction],
+            collections.deque[Passenger],
+        ] = collections.defaultdict(collections.deque)
+        self.__size = 0
+
+    def __len__(self) -> int:
+        return self.__size
+
+    def add(self, passenger: Passenger):
+        """Register passenger waiting on the floor of their call."""
+        call = passenger.call
+        self.__waiting[call.floor, call.direction].append(passenger)
+        self.__size += 1
+        if self.__metrics is not None:
+            self.__metrics.on_call(passenger)
+
+    def waiting(self, floor: Floor, direction: Direction | None = None) -> int:
+        """Return number of passengers waiting on floor."""
+        if direction is not None:
+            queue = self.__waiting.get((floor, direction))
+            return len(queue) if queue else 0
+        return self.waiting(floor, Direction.UP) + self.waiting(
+            floor, Direction.DOWN)
+
+    def passengers(
+            self,
+            floor: Floor,
+            direction: Direction,
+    ) -> tuple[Passenger, ...]:
+        """Return passengers waiting on floor in order of arrival."""
+        return tuple(self.__waiting.get((floor, direction), ()))
+
+    def board(self, elevator: ElevatorAbstract) -> list[Passenger]:
+        """Board passengers whose calls elevator served on its last stop.
+
+        Only passengers whose own call was served board, in order of
+        arrival while elevator has capacity left, so the destination of
+        every boarded passenger is selected. Calls are matched by identity
+        and every served call boards a single passenger. Calls of
+        passengers left behind are requested again, so they are not lost
+        when elevator is full.
+        """
+        served_calls = elevator.served_calls
+        served = collections.Counter(id(call) for call in served_calls)
+        keys = dict.fromkeys(
+            (call.floor, call.direction) for call in served_calls
+        )
+        boarded = []
+        for key in keys:
+            queue = self.__waiting.get(key)
+            if not queue:
+                continue
+            staying = collections.deque()
+            for passenger in queue:
+                call_id = id(passenger.call)
+                if not served[call_id]:
+                    staying.append(passenger)
+                    continue
+                served[call_id] -= 1
+                if elevator.capacity_left > 0:
+                    elevator.enter_elevator(passenger)
+                    boarded.append(passenger)
+                    self.__size -= 1
+                else:
+                    elevator.add_request(passenger.call)
+                    staying.append(passenger)
+            if staying:
+                self.__waiting[key] = staying
+            else:
+                del self.__waiting[key]
+        return boarded
@@ -1,24 +1,59 @@
+import argparse
+import cProfile
+import json
+import pstats
 import random
-from loguru import logger
-from elevator import Call, DoorsStatus, Floor, Passenger, PassengerElevator
-from exceptions import ElevatorFullError, PassengerNotInElevatorError
 import time
+import typing as t
+from loguru import logger
+from dispatcher import GroupDispatcher
+from elevator import Call, Floor, Passenger, PassengerElevator
+from exceptions import PassengerNotInElevatorError
+from export import FORMATS, RecordWriterAbstract, open_record_writer
+from metrics import PhaseTimers, StreamingHistogram
+from parking import DemandParking
+from recording import TraceRecorder
+from registry import HallCallRegistry
+from simulation import Event, EventType, Simulation
+from tracing import RingBufferTracer, log_sink
+from traffic import ArrivalsAbstract
 from decimal import Decimal
+import attrs
 import sys
 
-
-logger.add(sys.stderr, format="{extra}")
+ARRIVAL_RATE = Decimal("0.3")
+BATCH_TICKS = 100_000
 
 
-def make_decision() -> bool:
+def make_decision(
+        rate: float | Decimal = ARRIVAL_RATE,
+        rng: random.Random = random,
+) -> bool:
     """Return True if decided to add request."""
-    return random.random() < Decimal("0.3")
+    return rng.random() < rate
 
 
-def generate_passenger_with_call(elevator: PassengerElevator) -> Passenger:
+def get_arrival_delay(
+        rate: float | Decimal = ARRIVAL_RATE,
+        rng: random.Random = random,
+) -> int:
+    """Return number of ticks until next passenger makes a call."""
+    # Comparing floats with Decimal is several times slower than with
+    # float, so the rate is converted once instead of on every tick.
+    rate = float(rate)
+    delay = 1
+    while not make_decision(rate, rng):
+        delay += 1
+    return delay
+
+
+def generate_passenger_with_call(
+        elevator: PassengerElevator,
+        rng: random.Random = random,
+) -> Passenger:
     min_floor = elevator.MIN_FLOOR
     max_floor = elevator.MAX_FLOOR
-    floor, destination = random.sample(range(min_floor, max_floor + 1), 2)
+    floor, destination = rng.sample(range(min_floor, max_floor + 1), 2)
     passenger = Passenger(
         call=Call(
             floor=Floor(floor),
@@ -28,42 +63,420 @@ def generate_passenger_with_call(elevator: PassengerElevator) -> Passenger:
     return passenger
 
 
-passengers_made_calls: list[Passenger] = []
+@attrs.define
+class SimulationStats:
+    """KPIs collected during simulation.
+
+    Attrs:
+        ticks: Number of simulated ticks.
+        called: Number of passengers that made a call.
+        boarded: Number of passengers that entered elevator.
+        delivered: Number of passengers that reached destination.
+        wait: Histogram of ticks boarded passengers waited for elevator.
+        trips: Number of times elevator started moving in a new direction.
+    """
+    ticks: int = 0
+    called: int = 0
+    boarded: int = 0
+    delivered: int = 0
+    wait: StreamingHistogram = attrs.field(factory=StreamingHistogram)
+    trips: int = 0
+
+
+def simulate(
+        elevator: PassengerElevator | GroupDispatcher,
+        until: int | None = None,
+        arrival_rate: float | Decimal = ARRIVAL_RATE,
+        rng: random.Random = random,
+        tick_duration: float | None = None,
+        tracer: RingBufferTracer | None = None,
+        recorder: TraceRecorder | None = None,
+        arrivals: ArrivalsAbstract | None = None,
+        skip_ahead: bool = False,
+        states: RecordWriterAbstract | None = None,
+        passengers: RecordWriterAbstract | None = None,
+) -> SimulationStats:
+    """Simulate random passengers served by elevators and return KPIs.
+
+    Latency metrics and parking policies of the elevators, if any, are
+    switched to the virtual clock of the simulation. Phase timers of the
+    elevators, if any, also time exits and boarding on every stop.
+
+    Args:
+        elevator: Elevator or group dispatcher of elevators serving
+            passengers.
+        until: Virtual tick to stop on. Simulation runs forever if omitted.
+        arrival_rate: Probability of a new call on every tick.
+        rng: Source of random numbers.
+        tick_duration: Wall-clock seconds per tick. None runs simulation
+            as fast as possible.
+        tracer: Tracer of elevator events, drained to log every tick.
+        recorder: Recorder of call arrivals and, if it records states,
+            elevator state on every tick.
+        arrivals: Source of calls, such as a recorded trace or a traffic
+            model, to take instead of ``rng``.
+        skip_ahead: Jump over ticks in which elevator only moves between
+            floors.
+        states: Writer of state of every car on every tick.
+        passengers: Writer of every delivered passenger.
+    """
+    if isinstance(elevator, GroupDispatcher):
+        dispatcher = elevator
+        cars = dispatcher.elevators
+    else:
+        dispatcher = None
+        cars = (elevator,)
+    if recorder is not None:
+        recorder.check(cars)
+    simulation = Simulation(
+        cars,
+        tick_duration=tick_duration,
+        skip_ahead=skip_ahead,
+    )
+    registries: dict[PassengerElevator, HallCallRegistry] = {}
+    for car in cars:
+        if car.metrics is not None:
+            car.metrics.clock = lambda: simulation.now
+        if car.parking is not None:
+            car.parking.clock = lambda: simulation.now
+        registries[car] = HallCallRegistry(metrics=car.metrics)
+    numbers = {car: number for number, car in enumerate(cars)}
+    stats = SimulationStats()
+    called_at: dict[int, int] = {}
+    # Call and boarding ticks of riding passengers, kept only to write
+    # passenger records on exit.
+    boarded_at: dict[int, tuple[int, int]] = {}
+    directions = [car.current_direction for car in cars]
+
+    def schedule_call():
+        passenger = generate_passenger_with_call(elevator=cars[0], rng=rng)
+        simulation.schedule(
+            get_arrival_delay(arrival_rate, rng),
+            EventType.CALL_ARRIVAL,
+            passenger,
+        )
+
+    def on_call_arrival(sim: Simulation, event: Event):
+        passenger = event.payload
+        if dispatcher is None:
+            car = elevator
+            car.add_request(passenger.call)
+        else:
+            car = dispatcher.add_request(passenger.call)
+        registries[car].add(passenger)
+        called_at[passenger.id] = sim.now
+        stats.called += 1
+        if recorder is not None:
+            recorder.record_call(sim.now, passenger.call, numbers[car])
+        if arrivals is None:
+            schedule_call()
+
+    def on_doors_opened(sim: Simulation, event: Event):
+        car = event.payload
+        timers = car.timers
+        if timers is None:
+            exit_passengers(sim, car)
+            board_passengers(sim, car)
+            return
+        started_at = timers.clock()
+        exit_passengers(sim, car)
+        started_at = timers.lap("run.exit", started_at)
+        board_passengers(sim, car)
+        timers.lap("run.board", started_at)
+
+    def exit_passengers(sim: Simulation, car: PassengerElevator):
+        for passenger in car.passengers:
+            if car.current_floor == passenger.call.destination:
+                try:
+                    car.exit_elevator(passenger)
+                except PassengerNotInElevatorError:
+                    logger.warning(
+                        "Passenger is not in elevator.",
+                        extra={"passenger_id": passenger.id},
+                    )
+                    continue
+                stats.delivered += 1
+                if passengers is not None:
+                    write_passenger(sim, car, passenger)
+
+    def board_passengers(sim: Simulation, car: PassengerElevator):
+        for passenger in registries[car].board(car):
+            called = called_at.pop(passenger.id)
+            stats.wait.record(sim.now - called)
+            stats.boarded += 1
+            if passengers is not None:
+                boarded_at[passenger.id] = called, sim.now
+
+    def write_passenger(
+            sim: Simulation,
+            car: PassengerElevator,
+            passenger: Passenger,
+    ):
+        called, boarded = boarded_at.pop(passenger.id)
+        passengers.write({
+            "passenger": passenger.id,
+            "car": numbers[car],
+            "floor": passenger.call.floor,
+            "destination": passenger.call.destination,
+            "called_at": called,
+            "boarded_at": boarded,
+            "delivered_at": sim.now,
+            "wait": boarded - called,
+            "ride": sim.now - boarded,
+        })
+
+    def on_tick(_: Simulation, event: Event):
+        now = simulation.now
+        for number, car in enumerate(cars):
+            direction = car.current_direction
+            if direction not in (None, directions[number]):
+                stats.trips += 1
+            directions[number] = direction
+            if recorder is not None and recorder.record_states:
+                recorder.record_state(now, car, number)
+            if states is not None:
+                states.write({
+                    "tick": now,
+                    "car": number,
+                    "floor": car.current_floor,
+                    "direction": int(direction or 0),
+                    "status": car.status.value,
+                    "passengers": len(car.passengers),
+                    "pending_stops": car.pending_stops,
+                })
+        stats.ticks += event.payload
+        if tracer is not None:
+            tracer.drain_to(log_sink)
+
+    simulation.subscribe(EventType.CALL_ARRIVAL, on_call_arrival)
+    simulation.subscribe(EventType.DOORS_OPENED, on_doors_opened)
+    simulation.subscribe(EventType.TICK, on_tick)
+    if arrivals is None:
+        schedule_call()
+    else:
+        arrivals.attach(simulation)
+    simulation.run(until=until)
+    return stats
+
+
+def make_elevator(
+        max_floor: int = PassengerElevator.MAX_FLOOR,
+        capacity: int = PassengerElevator.CAPACITY,
+        cars: int = 1,
+        tracer: RingBufferTracer | None = None,
+        timers: PhaseTimers | None = None,
+        parking: bool = False,
+) -> PassengerElevator | GroupDispatcher:
+    """Return elevator, or dispatcher of a bank of ``cars`` elevators.
+
+    With ``parking`` every car parks by its own demand histogram.
+    """
+    elevators = [
+        PassengerElevator(
+            start_floor=None,
+            tracer=tracer,
+            max_floor=max_floor,
+            capacity=capacity,
+            timers=timers,
+            parking=DemandParking() if parking else None,
+        )
+        for _ in range(cars)
+    ]
+    if cars == 1:
+        return elevators[0]
+    return GroupDispatcher(elevators)
 
 
-def run():
+def run(
+        until: int | None = None,
+        tick_duration: float | None = 1.0,
+        tracer: RingBufferTracer | None = None,
+        timers: PhaseTimers | None = None,
+        seed: int | None = None,
+        arrival_rate: float | Decimal = ARRIVAL_RATE,
+        max_floor: int = PassengerElevator.MAX_FLOOR,
+        capacity: int = PassengerElevator.CAPACITY,
+        cars: int = 1,
+        parking: bool = False,
+        states: RecordWriterAbstract | None = None,
+        passengers: RecordWriterAbstract | None = None,
+) -> SimulationStats:
+    """Run simulation.
+
+    Args:
+        until: Virtual tick to stop on. Simulation runs forever if omitted.
+        tick_duration: Wall-clock seconds per tick. Pass None to run
+            simulation as fast as possible.
+        tracer: Tracer of elevator events, drained to log every tick.
+        timers: Timers of phases of every tick.
+        seed: Seed of random numbers generator, global one is used if
+            omitted.
+        arrival_rate: Probability of a new call on every tick.
+        max_floor: Highest floor of the building.
+        capacity: Capacity of every car.
+        cars: Number of cars, more than one are run by a dispatcher.
+        parking: Park idle cars on floors with the highest demand.
+        states: Writer of state of every car on every tick.
+        passengers: Writer of every delivered passenger.
+    """
     logger.info("Start simulation.")
-    elevator = PassengerElevator(start_floor=Floor(1))
-    while True:
-        decision = make_decision()
-        if decision is True:
-            passenger = generate_passenger_with_call(elevator=elevator)
-            elevator.add_request(passenger.call)
-            passengers_made_calls.append(passenger)
-
-        if elevator.doors == DoorsStatus.OPEN:
-            for passenger in elevator.passengers:
-                if elevator.current_floor == passenger.call.destination:
-                    try:
-                        elevator.exit_elevator(passenger)
-                    except PassengerNotInElevatorError:
-                        logger.warning(
-                            "Passenger is not in elevator.",
-                            extra={"passenger_id": passenger.id},
-                        )
-                        continue
-
-            for passenger in passengers_made_calls:
-                if elevator.current_floor == passenger.call.floor:
-                    try:
-                        elevator.enter_elevator(passenger)
-                        passengers_made_calls.remove(passenger)
-                    except ElevatorFullError:
-                        logger.info("Elevator capacity was exceeded.")
-                        break
-        elevator.move()
-        time.sleep(1)
+    return simulate(
+        make_elevator(max_floor, capacity, cars, tracer, timers, parking),
+        until=until,
+        arrival_rate=arrival_rate,
+        rng=random if seed is None else random.Random(seed),
+        tick_duration=tick_duration,
+        tracer=tracer,
+        states=states,
+        passengers=passengers,
+    )
+
+
+def profile(
+        report: str,
+        sort: str = "cumulative",
+        limit: int = 40,
+        **kwargs,
+) -> SimulationStats:
+    """Run simulation as fast as possible under cProfile.
+
+    Write ``limit`` hot spots sorted by ``sort`` key of ``pstats`` to
+    ``report`` file. Other arguments are passed to ``run``.
+    """
+    profiler = cProfile.Profile()
+    stats = profiler.runcall(run, tick_duration=None, **kwargs)
+    with open(report, "w") as file:
+        pstats.Stats(profiler, stream=file).sort_stats(sort).print_stats(limit)
+    return stats
+
+
+def summarize(stats: SimulationStats, seconds: float) -> dict[str, t.Any]:
+    """Return KPIs of simulation and its wall-clock speed."""
+    return {
+        "ticks": stats.ticks,
+        "called": stats.called,
+        "boarded": stats.boarded,
+        "delivered": stats.delivered,
+        "mean_wait": stats.wait.mean,
+        "p95_wait": stats.wait.percentile(95),
+        "trips": stats.trips,
+        "seconds": round(seconds, 3),
+        "ticks_per_second": round(stats.ticks / seconds) if seconds else None,
+    }
+
+
+def print_timers(timers: PhaseTimers):
+    print(f"{'phase':<20} {'calls':>10} {'total ms':>10} {'mean ns':>10}")
+    for phase, row in timers.summary().items():
+        print(
+            f"{phase:<20} {row['calls']:>10} "
+            f"{row['total_ns'] / 1e6:>10.1f} {row['mean_ns']:>10.0f}"
+        )
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Run elevator simulation.")
+    parser.add_argument(
+        "--batch",
+        action="store_true",
+        help="Run headless as fast as possible without logging and print "
+             "a JSON summary.",
+    )
+    parser.add_argument(
+        "--ticks",
+        type=int,
+        help=f"Ticks to simulate, {BATCH_TICKS} in batch and profile modes "
+             "and forever otherwise.",
+    )
+    parser.add_argument("--seed", type=int)
+    parser.add_argument("--rate", type=float, default=float(ARRIVAL_RATE),
+                        help="probability of a new call on every tick")
+    parser.add_argument("--floors", type=int,
+                        default=PassengerElevator.MAX_FLOOR,
+                        help="highest floor of the building")
+    parser.add_argument("--capacity", type=int,
+                        default=PassengerElevator.CAPACITY)
+    parser.add_argument("--cars", type=int, default=1)
+    parser.add_argument(
+        "--parking",
+        action="store_true",
+        help="Park idle cars on floors with the highest learned demand.",
+    )
+    parser.add_argument(
+        "--output",
+        help="File to stream records to, CSV or JSONL by its suffix.",
+    )
+    parser.add_argument("--format", choices=FORMATS)
+    parser.add_argument(
+        "--records",
+        choices=("passengers", "ticks"),
+        default="passengers",
+        help="Write a record per delivered passenger or per car and tick.",
+    )
+    parser.add_argument(
+        "--profile",
+        metavar="REPORT",
+        help="Run as fast as possible under cProfile without logging and "
+             "write sorted hot spots to REPORT.",
+    )
+    parser.add_argument(
+        "--sort",
+        default="cumulative",
+        help="pstats sort key of the profile report.",
+    )
+    parser.add_argument(
+        "--timers",
+        action="store_true",
+        help="Print time spent in phases of ticks when simulation ends.",
+    )
+    args = parser.parse_args(argv)
+
+    headless = args.batch or args.profile is not None
+    ticks = args.ticks
+    if headless and ticks is None:
+        ticks = BATCH_TICKS
+    timers = PhaseTimers() if args.timers else None
+    writer = None
+    if args.output is not None:
+        try:
+            writer = open_record_writer(args.output, args.format)
+        except ValueError as error:
+            parser.error(str(error))
+    kwargs = dict(
+        until=ticks,
+        timers=timers,
+        seed=args.seed,
+        arrival_rate=args.rate,
+        max_floor=args.floors,
+        capacity=args.capacity,
+        cars=args.cars,
+        parking=args.parking,
+        states=writer if args.records == "ticks" else None,
+        passengers=writer if args.records == "passengers" else None,
+    )
+    started_at = time.perf_counter()
+    try:
+        if args.profile is not None:
+            logger.remove()
+            stats = profile(args.profile, sort=args.sort, **kwargs)
+        elif args.batch:
+            logger.remove()
+            stats = run(tick_duration=None, **kwargs)
+        else:
+            logger.add(sys.stderr, format="{extra}")
+            stats = run(tracer=RingBufferTracer(), **kwargs)
+    finally:
+        if writer is not None:
+            writer.close()
+    if headless:
+        summary = summarize(stats, time.perf_counter() - started_at)
+        print(json.dumps(summary))
+    if args.profile is not None:
+        print(f"Profile report written to {args.profile}.", file=sys.stderr)
+    if timers is not None:
+        print_timers(timers)
+    return 0
 
 
 if __name__ == '__main__':
-    run()
+    sys.exit(main())
@@ -0,0 +1,193 @@
+import enum
+import heapq
+import time
+import typing as t
+
+import attrs
+
+from core import DoorsStatus, ElevatorAbstract
+
+
+class EventType(enum.IntEnum):
+    """Simulation event type.
+
+    Values also define processing priority of events scheduled on the
+    same tick: calls arrive first and elevators move last.
+    """
+    CALL_ARRIVAL = 1
+    DOORS_CLOSED = 2
+    FLOOR_REACHED = 3
+    DOORS_OPENED = 4
+    BOARDING_DONE = 5
+    TICK = 6
+
+
+@attrs.frozen
+class Event:
+    """Object of simulation event.
+
+    Attrs:
+        time: Virtual tick on which event happens.
+        type: Event type.
+        payload: Event data, e.g. passenger for call arrival or elevator
+            for elevator state transitions.
+    """
+    time: int
+    type: EventType
+    payload: t.Any = None
+
+
+Handler = t.Callable[["Simulation", Event], None]
+
+
+class Simulation:
+    """Discrete-event simulation engine with a virtual clock.
+
+    Events are kept in a priority queue ordered by time, type and
+    scheduling order. The clock jumps straight to the next event, so the
+    simulation runs as fast as the CPU allows. Passing ``tick_duration``
+    enables real-time pacing: every virtual tick lasts that many seconds
+    of wall-clock time.
+
+    With ``skip_ahead`` elevators jump over ticks in which they only move
+    between floors, as long as no other event is due. Such a tick event
+    carries number of ticks it covers as payload, and floors passed in
+    transit are not reported as reached.
+    """
+
+    def __init__(
+            self,
+            elevators: t.Sequence[ElevatorAbstract],
+            tick_duration: float | None = None,
+            skip_ahead: bool = False,
+    ):
+        if skip_ahead and tick_duration is not None:
+            raise ValueError(
+                "Skip-ahead cannot be used with real-time pacing.",
+            )
+        self.__elevators = tuple(elevators)
+        self.__tick_duration = tick_duration
+        self.__skip_ahead = skip_ahead
+        self.__until: int | None = None
+        self.__events: list[tuple[int, int, int, Event]] = []
+        self.__handlers: dict[EventType, list[Handler]] = {}
+        self.__now = 0
+        self.__seq = 0
+        self.__started_at: float | None = None
+        self.schedule(0, EventType.TICK, 1)
+
+    @property
+    def now(self) -> int:
+        """Current virtual tick."""
+        return self.__now
+
+    @property
+    def elevators(self) -> tuple[ElevatorAbstract, ...]:
+        return self.__elevators
+
+    @property
+    def pending_events(self) -> int:
+        return len(self.__events)
+
+    def subscribe(self, event_type: EventType, handler: Handler):
+        """Call handler every time event of given type is processed."""
+        self.__handlers.setdefault(event_type, []).append(handler)
+
+    def schedule(
+            self,
+            delay: int,
+            event_type: EventType,
+            payload: t.Any = None,
+    ) -> Event:
+        """Schedule event ``delay`` ticks after current virtual time."""
+        if delay < 0:
+            raise ValueError("Event cannot be scheduled in the past.")
+        event = Event(
+            time=self.__now + delay,
+            type=event_type,
+            payload=payload,
+        )
+        heapq.heappush(
+            self.__events,
+            (event.time, event_type, self.__seq, event),
+        )
+        self.__seq += 1
+        return event
+
+    def __pace(self, event_time: int):
+        offset = event_time * self.__tick_duration
+        if self.__started_at is None:
+            self.__started_at = time.monotonic() - offset
+        delay = self.__started_at + offset - time.monotonic()
+        if delay > 0:
+            time.sleep(delay)
+
+    def __max_ticks(self) -> int:
+        """Return number of ticks elevators may take before next event."""
+        limit = None
+        if self.__events:
+            limit = self.__events[0][0] - self.__now
+        if self.__until is not None:
+            until = self.__until - self.__now
+            limit = until if limit is None else min(limit, until)
+        if limit is None:
+            return 1
+        skip = limit - 1
+        for elevator in self.__elevators:
+            skip = elevator.transit_ticks(skip)
+            if not skip:
+                break
+        return skip + 1
+
+    def __tick(self) -> int:
+        ticks = self.__max_ticks() if self.__skip_ahead else 1
+        self.__now += ticks - 1
+        for elevator in self.__elevators:
+            floor = elevator.current_floor
+            doors = elevator.doors
+            if ticks > 1:
+                elevator.advance(ticks)
+            else:
+                elevator.move()
+            floor_changed = elevator.current_floor != floor
+            if floor_changed:
+                self.schedule(0, EventType.FLOOR_REACHED, elevator)
+            if doors == DoorsStatus.OPEN and (
+                    floor_changed or elevator.doors == DoorsStatus.CLOSED):
+                self.schedule(0, EventType.DOORS_CLOSED, elevator)
+            # Every tick with open doors is a new stop, even on the same floor.
+            if elevator.doors == DoorsStatus.OPEN:
+                self.schedule(0, EventType.DOORS_OPENED, elevator)
+        self.schedule(1, EventType.TICK, 1)
+        return ticks
+
+    def step(self) -> Event | None:
+        """Process next event and return it."""
+        if not self.__events:
+            return None
+        event_time, _, _, event = heapq.heappop(self.__events)
+        if self.__tick_duration is not None:
+            self.__pace(event_time)
+        self.__now = event_time
+        if event.type == EventType.TICK:
+            ticks = self.__tick()
+            if ticks > 1:
+                event = attrs.evolve(event, time=self.__now, payload=ticks)
+        for handler in self.__handlers.get(event.type, ()):
+            handler(self, event)
+        if event.type == EventType.DOORS_OPENED:
+            self.schedule(0, EventType.BOARDING_DONE, event.payload)
+        return event
+
+    def run(self, until: int | None = None):
+        """Process events until virtual time reaches ``until``.
+
+        Without ``until`` simulation runs forever.
+        """
+        events = self.__events
+        self.__until = until
+        while events and (until is None or events[0][0] < until):
+            self.step()
+        self.__until = None
+        if until is not None:
+            self.__now = max(self.__now, until)
@@ -0,0 +1,222 @@
+import argparse
+import concurrent.futures
+import csv
+import itertools
+import os
+import random
+import statistics
+import sys
+import typing as t
+
+import attrs
+from loguru import logger
+
+from elevator import PassengerElevator
+from run import simulate
+
+TICKS_PER_HOUR = 3600
+
+
+@attrs.frozen
+class SweepConfig:
+    """Configuration of a single simulation run.
+
+    Attrs:
+        seed: Seed of run's random numbers generator.
+        arrival_rate: Probability of a new call on every tick.
+        max_floor: Highest floor of the building.
+        capacity: Elevator capacity.
+        ticks: Number of ticks to simulate.
+    """
+    seed: int
+    arrival_rate: float
+    max_floor: int = PassengerElevator.MAX_FLOOR
+    capacity: int = PassengerElevator.CAPACITY
+    ticks: int = 10_000
+
+
+@attrs.frozen
+class RunResult:
+    """KPIs of a single simulation run.
+
+    Attrs:
+        config: Configuration of the run.
+        throughput: Delivered passengers per hour, one tick is one second.
+        mean_wait: Mean ticks passenger waited for elevator.
+        p95_wait: 95th percentile of waiting ticks.
+        trips: Number of times elevator started moving in a new direction.
+        delivered: Number of passengers that reached destination.
+    """
+    config: SweepConfig
+    throughput: float
+    mean_wait: float
+    p95_wait: float
+    trips: int
+    delivered: int
+
+    def as_row(self) -> dict[str, t.Any]:
+        row = attrs.asdict(self.config)
+        row.update(attrs.asdict(self, filter=lambda a, _: a.name != "config"))
+        return row
+
+
+def make_grid(
+        runs: int,
+        arrival_rates: t.Iterable[float],
+        max_floors: t.Iterable[int] = (PassengerElevator.MAX_FLOOR,),
+        capacities: t.Iterable[int] = (PassengerElevator.CAPACITY,),
+        ticks: int = 10_000,
+        base_seed: int = 0,
+) -> list[SweepConfig]:
+    """Return configs of ``runs`` seeds for every parameter combination.
+
+    Every run gets its own seed, so results do not depend on which
+    worker executes the run.
+    """
+    combinations = itertools.product(
+        arrival_rates,
+        max_floors,
+        capacities,
+        range(runs),
+    )
+    return [
+        SweepConfig(
+            seed=base_seed + index,
+            arrival_rate=arrival_rate,
+            max_floor=max_floor,
+            capacity=capacity,
+            ticks=ticks,
+        )
+        for index, (arrival_rate, max_floor, capacity, _) in enumerate(
+            combinations,
+        )
+    ]
+
+
+def run_config(config: SweepConfig) -> RunResult:
+    """Run a single simulation and return its KPIs."""
+    elevator = PassengerElevator(
+        start_floor=None,
+        max_floor=config.max_floor,
+        capacity=config.capacity,
+    )
+    stats = simulate(
+        elevator,
+        until=config.ticks,
+        arrival_rate=config.arrival_rate,
+        rng=random.Random(config.seed),
+    )
+    return RunResult(
+        config=config,
+        throughput=stats.delivered * TICKS_PER_HOUR / max(stats.ticks, 1),
+        mean_wait=stats.wait.mean,
+        p95_wait=float(stats.wait.percentile(95) or 0),
+        trips=stats.trips,
+        delivered=stats.delivered,
+    )
+
+
+def init_worker():
+    """Silence simulation logs of a worker process, as batch runs do."""
+    logger.remove()
+
+
+def run_sweep(
+        configs: t.Iterable[SweepConfig],
+        workers: int | None = None,
+        chunksize: int = 4,
+) -> t.Iterator[RunResult]:
+    """Run configs in a process pool and yield results in configs order."""
+    with concurrent.futures.ProcessPoolExecutor(
+            max_workers=workers or os.cpu_count(),
+            initializer=init_worker,
+    ) as executor:
+        yield from executor.map(run_config, configs, chunksize=chunksize)
+
+
+# Columns of aggregated table, in order.
+AGGREGATE_FIELDS = (
+    "arrival_rate",
+    "max_floor",
+    "capacity",
+    "runs",
+    "throughput",
+    "mean_wait",
+    "p95_wait",
+    "trips",
+)
+
+
+def aggregate(results: t.Iterable[RunResult]) -> list[dict[str, t.Any]]:
+    """Return mean KPIs per parameter combination over seeds."""
+    groups: dict[tuple, list[RunResult]] = {}
+    for result in results:
+        config = result.config
+        key = (config.arrival_rate, config.max_floor, config.capacity)
+        groups.setdefault(key, []).append(result)
+
+    table = []
+    for (arrival_rate, max_floor, capacity), group in sorted(groups.items()):
+        table.append({
+            "arrival_rate": arrival_rate,
+            "max_floor": max_floor,
+            "capacity": capacity,
+            "runs": len(group),
+            "throughput": statistics.fmean(r.throughput for r in group),
+            "mean_wait": statistics.fmean(r.mean_wait for r in group),
+            "p95_wait": statistics.fmean(r.p95_wait for r in group),
+            "trips": statistics.fmean(r.trips for r in group),
+        })
+    return table
+
+
+def main(argv: list[str] | None = None):
+    parser = argparse.ArgumentParser(
+        description="Run simulations over a grid of parameters.",
+    )
+    parser.add_argument("--runs", type=int, default=10,
+                        help="seeds per parameter combination")
+    parser.add_argument("--rates", type=float, nargs="+", default=[0.3])
+    parser.add_argument("--floors", type=int, nargs="+",
+                        default=[PassengerElevator.MAX_FLOOR])
+    parser.add_argument("--capacities", type=int, nargs="+",
+                        default=[PassengerElevator.CAPACITY])
+    parser.add_argument("--ticks", type=int, default=10_000)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--workers", type=int)
+    parser.add_argument("--output", help="CSV file for per-run results")
+    args = parser.parse_args(argv)
+
+    logger.remove()
+    configs = make_grid(
+        runs=args.runs,
+        arrival_rates=args.rates,
+        max_floors=args.floors,
+        capacities=args.capacities,
+        ticks=args.ticks,
+        base_seed=args.seed,
+    )
+    results = []
+    output = open(args.output, "w", newline="") if args.output else None
+    try:
+        writer = None
+        for result in run_sweep(configs, workers=args.workers):
+            results.append(result)
+            if output is not None:
+                row = result.as_row()
+                if writer is None:
+                    writer = csv.DictWriter(output, fieldnames=list(row))
+                    writer.writeheader()
+                writer.writerow(row)
+    finally:
+        if output is not None:
+            output.close()
+
+    table = aggregate(results)
+    writer = csv.DictWriter(sys.stdout, fieldnames=AGGREGATE_FIELDS)
+    writer.writeheader()
+    writer.writerows(table)
+
+
+if __name__ == "__main__":
+    main()
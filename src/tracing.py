@@ -0,0 +1,147 @@
+import abc
+import array
+import enum
+import typing as t
+
+import attrs
+from loguru import logger
+
+
+class TraceEventKind(enum.IntEnum):
+    """Kind of traced elevator event."""
+    ENQUEUE = 1
+    FLOOR_SELECTED = 2
+    MOVE = 3
+    STOP = 4
+    DIRECTION_CHANGE = 5
+    STATUS_CHANGE = 6
+    ENQUEUE_BATCH = 7
+
+
+@attrs.frozen
+class TraceEvent:
+    """Object of traced event.
+
+    Attrs:
+        seq: Sequence number of event in tracer.
+        kind: Event kind.
+        floor: Floor on which event happened, lowest call floor for
+            ``ENQUEUE_BATCH``.
+        value: Kind-specific value: call destination for ``ENQUEUE``,
+            direction of travel for ``MOVE``, new direction for
+            ``DIRECTION_CHANGE`` (0 for no direction), new status for
+            ``STATUS_CHANGE``, number of calls for ``ENQUEUE_BATCH``.
+    """
+    seq: int
+    kind: TraceEventKind
+    floor: int
+    value: int = 0
+
+
+Sink = t.Callable[[list[TraceEvent]], None]
+
+
+class TracerAbstract(abc.ABC):
+    """Abstract class for elevator event tracer.
+
+    Elevators and queues accept an optional tracer and skip tracing
+    entirely when none is given.
+    """
+
+    @abc.abstractmethod
+    def record(self, kind: TraceEventKind, floor: int, value: int = 0):
+        """Record event."""
+
+
+class RingBufferTracer(TracerAbstract):
+    """Tracer that writes events into a preallocated ring buffer.
+
+    When buffer is full, the oldest events are overwritten and counted as
+    dropped. Events are read back in batches with ``drain``.
+    """
+
+    def __init__(self, capacity: int = 65536):
+        if capacity < 1:
+            raise ValueError("Tracer capacity must be positive.")
+        self.__capacity = capacity
+        self.__kinds = array.array("b", bytes(capacity))
+        self.__floors = array.array("q", bytes(8 * capacity))
+        self.__values = array.array("q", bytes(8 * capacity))
+        self.__head = 0
+        self.__tail = 0
+        self.__dropped = 0
+
+    @property
+    def capacity(self) -> int:
+        return self.__capacity
+
+    @property
+    def dropped(self) -> int:
+        """Number of events overwritten before they were drained."""
+        return self.__dropped
+
+    def __len__(self) -> int:
+        return self.__head - self.__tail
+
+    def record(self, kind: TraceEventKind, floor: int, value: int = 0):
+        index = self.__head % self.__capacity
+        self.__kinds[index] = kind
+        self.__floors[index] = floor
+        self.__values[index] = value
+        self.__head += 1
+        if self.__head - self.__tail > self.__capacity:
+            self.__tail += 1
+            self.__dropped += 1
+
+    def drain(self, limit: int | None = None) -> list[TraceEvent]:
+        """Remove and return up to ``limit`` oldest events."""
+        end = self.__head
+        if limit is not None:
+            end = min(end, self.__tail + limit)
+        events = []
+        for seq in range(self.__tail, end):
+            index = seq % self.__capacity
+            events.append(TraceEvent(
+                seq=seq,
+                kind=TraceEventKind(self.__kinds[index]),
+                floor=self.__floors[index],
+                value=self.__values[index],
+            ))
+        self.__tail = end
+        return events
+
+    def drain_to(self, sink: Sink, batch_size: int = 4096) -> int:
+        """Drain all events to sink in batches and return their number."""
+        drained = 0
+        while len(self):
+            batch = self.drain(batch_size)
+            sink(batch)
+            drained += len(batch)
+        return drained
+
+
+def log_sink(events: list[TraceEvent]):
+    """Sink that writes events to loguru."""
+    for event in events:
+        logger.info(
+            "Elevator event was traced.",
+            extra={
+                "seq": event.seq,
+                "kind": event.kind.name,
+                "floor": event.floor,
+                "value": event.value,
+            },
+        )
+
+
+class FileSink:
+    """Sink that appends events to a file as tab-separated lines."""
+
+    def __init__(self, stream: t.TextIO):
+        self.__stream = stream
+
+    def __call__(self, events: list[TraceEvent]):
+        self.__stream.writelines(
+            f"{event.seq}\t{event.kind.name}\t{event.floor}\t{event.value}\n"
+            for event in events
+        )
@@ -0,0 +1,241 @@
+import abc
+import typing as t
+
+import attrs
+import numpy as np
+
+from core import Call, Floor, Passenger, make_calls
+from simulation import Event, EventType, Simulation
+
+TICKS_PER_HOUR = 3600
+TICKS_PER_DAY = 24 * TICKS_PER_HOUR
+
+
+@attrs.frozen
+class ArrivalChunk:
+    """Calls arriving during a range of ticks, in tick order.
+
+    Attrs:
+        ticks: Tick of every call.
+        floors: Floor of every call.
+        destinations: Destination of every call.
+    """
+    ticks: np.ndarray
+    floors: np.ndarray
+    destinations: np.ndarray
+
+    def __len__(self) -> int:
+        return self.ticks.shape[0]
+
+    def calls(self) -> list[Call]:
+        return make_calls(self.floors, self.destinations)
+
+
+class ArrivalsAbstract(abc.ABC):
+    """Source of call arrivals produced in chunks."""
+
+    @abc.abstractmethod
+    def chunks(self, chunk_size: int) -> t.Iterator[ArrivalChunk]:
+        """Yield chunks of arrivals in tick order."""
+
+    def attach(self, simulation: Simulation, chunk_size: int = 65536):
+        """Schedule arrivals as call arrivals of simulation.
+
+        Chunks are produced lazily and calls are scheduled one tick at a
+        time, every call arrives as a new passenger.
+        """
+        chunks = self.chunks(chunk_size)
+        chunk: ArrivalChunk | None = None
+        calls: list[Call] = []
+        position = 0
+        last: Passenger | None = None
+
+        def schedule_next_tick():
+            nonlocal chunk, calls, position, last
+            while chunk is None or position >= len(chunk):
+                chunk = next(chunks, None)
+                if chunk is None:
+                    return
+                calls = chunk.calls()
+                position = 0
+            ticks = chunk.ticks
+            tick = int(ticks[position])
+            end = int(np.searchsorted(ticks, tick, side="right"))
+            for call in calls[position:end]:
+                last = Passenger(call=call)
+                simulation.schedule(
+                    max(tick - simulation.now, 0),
+                    EventType.CALL_ARRIVAL,
+                    last,
+                )
+            position = end
+
+        def on_call_arrival(_: Simulation, event: Event):
+            if event.payload is last:
+                schedule_next_tick()
+
+        simulation.subscribe(EventType.CALL_ARRIVAL, on_call_arrival)
+        schedule_next_tick()
+
+
+def uniform_matrix(floors: int) -> np.ndarray:
+    """Return origin/destination weights of uniform interfloor traffic."""
+    matrix = np.ones((floors, floors))
+    np.fill_diagonal(matrix, 0)
+    return matrix
+
+
+def up_peak_matrix(
+        floors: int,
+        lobby: int = 0,
+        lobby_share: float = 0.9,
+) -> np.ndarray:
+    """Return weights of traffic mostly from the lobby to upper floors.
+
+    ``lobby`` is the index of the lobby floor counted from the lowest
+    floor, ``lobby_share`` is the share of calls made in the lobby.
+    """
+    matrix = uniform_matrix(floors)
+    matrix *= (1 - lobby_share) / matrix.sum()
+    outgoing = np.ones(floors)
+    outgoing[lobby] = 0
+    matrix[lobby] += lobby_share * outgoing / outgoing.sum()
+    return matrix
+
+
+def down_peak_matrix(
+        floors: int,
+        lobby: int = 0,
+        lobby_share: float = 0.9,
+) -> np.ndarray:
+    """Return weights of traffic mostly from upper floors to the lobby."""
+    return up_peak_matrix(floors, lobby, lobby_share).T.copy()
+
+
+def lunch_matrix(floors: int, lobby: int = 0) -> np.ndarray:
+    """Return weights of lunch traffic, half of it to and from the lobby."""
+    matrix = up_peak_matrix(floors, lobby, lobby_share=0.25)
+    return matrix + down_peak_matrix(floors, lobby, lobby_share=0.25)
+
+
+@attrs.frozen
+class TrafficPeriod:
+    """Poisson arrivals with constant intensity during a period of time.
+
+    Attrs:
+        start: First tick of the period.
+        end: Tick after the last tick of the period.
+        rate: Mean number of calls per tick.
+        matrix: Weights of origin/destination floor pairs, indexed from
+            the lowest floor of the building.
+    """
+    start: int
+    end: int
+    rate: float
+    matrix: np.ndarray = attrs.field(eq=False)
+
+
+def office_day(
+        floors: int,
+        rate: float = 0.3,
+        lobby: int = 0,
+        start: int = 0,
+) -> list[TrafficPeriod]:
+    """Return periods of a day in an office building.
+
+    Morning up-peak, lunch and evening down-peak have ``rate`` intensity,
+    interfloor traffic during working hours a third of it and night
+    traffic a twentieth.
+    """
+    hour = TICKS_PER_HOUR
+    uniform = uniform_matrix(floors)
+    periods = [
+        (0, 7, rate / 20, uniform),
+        (7, 10, rate, up_peak_matrix(floors, lobby)),
+        (10, 12, rate / 3, uniform),
+        (12, 14, rate, lunch_matrix(floors, lobby)),
+        (14, 17, rate / 3, uniform),
+        (17, 19, rate, down_peak_matrix(floors, lobby)),
+        (19, 24, rate / 20, uniform),
+    ]
+    return [
+        TrafficPeriod(
+            start=start + first * hour,
+            end=start + last * hour,
+            rate=period_rate,
+            matrix=matrix,
+        )
+        for first, last, period_rate, matrix in periods
+    ]
+
+
+class TrafficModel(ArrivalsAbstract):
+    """Generator of calls from traffic periods.
+
+    Arrivals of a chunk of ticks are drawn at once: per-tick Poisson
+    counts and origin/destination pairs come from single NumPy calls, so
+    cost per call does not depend on number of ticks and a full day is
+    never materialized.
+
+    Args:
+        periods: Traffic periods, may overlap.
+        min_floor: Floor of the first row and column of period matrices.
+        seed: Seed of random numbers generator.
+    """
+
+    def __init__(
+            self,
+            periods: t.Sequence[TrafficPeriod],
+            min_floor: int = 1,
+            seed: int | None = None,
+    ):
+        self.__periods = tuple(periods)
+        self.__min_floor = min_floor
+        self.__seed = seed
+        self.__pairs = []
+        for period in self.__periods:
+            matrix = np.asarray(period.matrix, dtype=float)
+            if matrix.ndim != 2 or matrix.shape[0] != matrix.shape[1]:
+                raise ValueError("Traffic matrix must be square.")
+            weights = matrix.copy()
+            np.fill_diagonal(weights, 0)
+            self.__pairs.append(weights.ravel() / weights.sum())
+
+    @property
+    def end(self) -> int:
+        """Tick after the last arrival."""
+        return max((period.end for period in self.__periods), default=0)
+
+    def chunks(self, chunk_size: int = TICKS_PER_HOUR) -> t.Iterator[
+            ArrivalChunk]:
+        """Yield arrivals of ``chunk_size`` ticks at a time.
+
+        Chunks are drawn with a new generator every time, so iterating
+        again yields the same arrivals.
+        """
+        rng = np.random.default_rng(self.__seed)
+        first = min((period.start for period in self.__periods), default=0)
+        for chunk_start in range(first, self.end, chunk_size):
+            chunk_end = chunk_start + chunk_size
+            ticks, floors, destinations = [], [], []
+            for period, pairs in zip(self.__periods, self.__pairs):
+                start = max(period.start, chunk_start)
+                end = min(period.end, chunk_end)
+                if start >= end:
+                    continue
+                counts = rng.poisson(period.rate, size=end - start)
+                period_ticks = np.repeat(np.arange(start, end), counts)
+                chosen = rng.choice(pairs.shape[0], size=counts.sum(), p=pairs)
+                size = int(np.sqrt(pairs.shape[0]))
+                ticks.append(period_ticks)
+                floors.append(chosen // size + self.__min_floor)
+                destinations.append(chosen % size + self.__min_floor)
+            if not ticks:
+                continue
+            ticks = np.concatenate(ticks)
+            order = np.argsort(ticks, kind="stable")
+            yield ArrivalChunk(
+                ticks=ticks[order],
+                floors=np.concatenate(floors)[order],
+                destinations=np.concatenate(destinations)[order],
+            )
@@ -0,0 +1,79 @@
+import random
+
+import pytest
+
+from algorithms import ALGORITHMS, get_algorithm
+from core import Call, Floor
+from elevator import ElevatorOPSAQueue, PassengerElevator
+from run import simulate
+
+
+def test_registry():
+    assert {"opsa", "scan", "look", "eta"} <= set(ALGORITHMS)
+    assert get_algorithm("opsa") is ElevatorOPSAQueue
+    with pytest.raises(ValueError):
+        get_algorithm("unknown")
+
+
+def run_until_idle(queue, calls: list[Call]) -> list[int]:
+    for call in calls:
+        queue.add_request(call)
+    floors = []
+    while queue.has_requests:
+        queue.determine_next()
+        floors.append(queue.current_floor)
+    return floors
+
+
+def test_scan_turns_at_building_end():
+    queue = get_algorithm("scan")(
+        Floor(1), min_floor=Floor(1), max_floor=Floor(10))
+    call = Call(floor=Floor(5), destination=Floor(3))
+    floors = run_until_idle(queue, [call])
+    assert max(floors) == 10
+    assert floors[-1] == 3
+
+
+def test_look_turns_at_last_stop():
+    queue = get_algorithm("look")(
+        Floor(1), min_floor=Floor(1), max_floor=Floor(10))
+    call = Call(floor=Floor(5), destination=Floor(3))
+    floors = run_until_idle(queue, [call])
+    assert max(floors) == 5
+    assert floors[-1] == 3
+
+
+def test_eta_serves_nearest_stop_first():
+    queue = get_algorithm("eta")(Floor(5))
+    queue.add_request(Call(floor=Floor(9), destination=Floor(10)))
+    queue.add_request(Call(floor=Floor(3), destination=Floor(1)))
+    while not queue.is_stopped:
+        queue.determine_next()
+    assert queue.current_floor == 3
+
+
+@pytest.mark.parametrize("algorithm", sorted(ALGORITHMS))
+def test_every_algorithm_delivers_passengers(algorithm: str):
+    elevator = PassengerElevator(start_floor=None, algorithm=algorithm)
+    stats = simulate(
+        elevator,
+        until=3_000,
+        arrival_rate=0.05,
+        rng=random.Random(0),
+    )
+    assert stats.delivered >= stats.called - elevator.CAPACITY > 0
+
+
+@pytest.mark.parametrize("algorithm", sorted(ALGORITHMS))
+def test_fork_keeps_algorithm(algorithm: str):
+    elevator = PassengerElevator(start_floor=None, algorithm=algorithm)
+    elevator.add_request(Call(floor=Floor(4), destination=Floor(2)))
+    elevator.move()
+    elevator.move()
+    branch = elevator.fork()
+    assert branch.algorithm == algorithm
+    assert branch.snapshot() == elevator.snapshot()
+    for current in (elevator, branch):
+        for _ in range(10):
+            current.move()
+    assert branch.snapshot() == elevator.snapshot()
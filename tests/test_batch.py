@@ -0,0 +1,122 @@
+import random
+
+import numpy as np
+import pytest
+
+from batch import NO_DIRECTION, BatchOPSASimulator
+from core import Call, ElevatorStatus, Floor
+from elevator import ElevatorOPSAQueue
+
+
+@pytest.mark.parametrize("seed", range(3))
+def test_conforms_to_scalar_queue(seed: int):
+    rng = random.Random(seed)
+    buildings = 50
+    simulator = BatchOPSASimulator(
+        buildings=buildings,
+        min_floor=1,
+        max_floor=12,
+        slots=4,
+    )
+    queues = [ElevatorOPSAQueue(start_floor=Floor(1))
+              for _ in range(buildings)]
+
+    for _ in range(300):
+        calls = [
+            (building, *rng.sample(range(1, 13), 2))
+            for building in range(buildings)
+            for _ in range(rng.choice((0, 0, 0, 1, 2)))
+        ]
+        rng.shuffle(calls)
+        for building, floor, destination in calls:
+            queues[building].add_request(
+                Call(floor=Floor(floor), destination=Floor(destination)),
+            )
+        if calls:
+            simulator.add_calls(*zip(*calls))
+
+        simulator.step()
+        for building, queue in enumerate(queues):
+            queue.determine_next()
+            direction = queue.current_direction or NO_DIRECTION
+            assert simulator.floor[building] == queue.current_floor
+            assert simulator.direction[building] == direction
+            assert simulator.is_stopped[building] == queue.is_stopped
+            assert simulator.selected_floors(building) == tuple(
+                sorted(queue.selected_floors))
+            assert bool(
+                simulator.pending[building] or simulator.selected[building]
+            ) == queue.has_requests
+
+
+def test_status_follows_stops():
+    simulator = BatchOPSASimulator(buildings=2, min_floor=1, max_floor=12)
+    simulator.add_calls([0], [3], [5])
+    statuses = []
+    for _ in range(6):
+        simulator.step()
+        statuses.append(int(simulator.status[0]))
+    assert statuses == [
+        ElevatorStatus.IN_MOVEMENT,
+        ElevatorStatus.IN_MOVEMENT,
+        ElevatorStatus.WAITING_ON_THE_FLOOR,
+        ElevatorStatus.IN_MOVEMENT,
+        ElevatorStatus.WAITING_ON_THE_FLOOR,
+        ElevatorStatus.IDLE,
+    ]
+    assert np.all(simulator.status[1:] == ElevatorStatus.IDLE)
+
+
+def test_floor_limit():
+    with pytest.raises(ValueError):
+        BatchOPSASimulator(buildings=1, min_floor=1, max_floor=65)
+
+
+@pytest.mark.parametrize("seed", range(3))
+def test_conforms_to_scalar_queue_from_idle_start(seed: int):
+    rng = random.Random(seed)
+    buildings = 20
+    simulator = BatchOPSASimulator(
+        buildings=buildings,
+        min_floor=1,
+        max_floor=12,
+        start_floor=7,
+    )
+    queues = [ElevatorOPSAQueue(start_floor=Floor(7))
+              for _ in range(buildings)]
+
+    for _ in range(300):
+        calls = []
+        for building, queue in enumerate(queues):
+            # Calls mostly come to idle cars, often on the car floor.
+            if queue.has_requests or rng.random() < 0.5:
+                continue
+            floor = int(queue.current_floor)
+            if rng.random() < 0.5:
+                floor = rng.randint(1, 12)
+            destination = rng.choice(
+                [other for other in range(1, 13) if other != floor])
+            calls.append((building, floor, destination))
+        for building, floor, destination in calls:
+            queues[building].add_request(
+                Call(floor=Floor(floor), destination=Floor(destination)),
+            )
+        if calls:
+            simulator.add_calls(*zip(*calls))
+
+        simulator.step()
+        for building, queue in enumerate(queues):
+            queue.determine_next()
+            direction = queue.current_direction or NO_DIRECTION
+            assert simulator.floor[building] == queue.current_floor
+            assert simulator.direction[building] == direction
+            assert simulator.selected_floors(building) == tuple(
+                sorted(queue.selected_floors))
+
+
+@pytest.mark.parametrize("floor, destination", [(0, 5), (5, 13), (-2, 20)])
+def test_calls_outside_of_building_are_rejected(floor: int, destination: int):
+    simulator = BatchOPSASimulator(buildings=2, min_floor=1, max_floor=12)
+    with pytest.raises(ValueError):
+        simulator.add_calls([0, 1], [2, floor], [4, destination])
+    assert not simulator.pending.any()
@@ -0,0 +1,72 @@
+from call_index import CallIndex
+from core import Call, Direction, Floor
+
+
+def test_buckets_by_floor_and_direction():
+    index = CallIndex()
+    first = Call(floor=Floor(3), destination=Floor(7))
+    second = Call(floor=Floor(3), destination=Floor(1))
+    third = Call(floor=Floor(3), destination=Floor(9))
+    for call in (first, second, third):
+        index.add(call)
+
+    assert len(index) == 3
+    assert index.count(Floor(3), Direction.UP) == 2
+    assert index.earliest(Floor(3)) is first
+    assert index.pop_bucket(Floor(3), Direction.UP) == [first, third]
+    assert index.earliest(Floor(3)) is second
+    assert len(index) == 1
+
+
+def test_min_and_max_floors():
+    index = CallIndex()
+    assert index.max_floor() is None
+    for floor, destination in ((5, 1), (2, 8), (9, 10), (4, 3)):
+        index.add(Call(floor=Floor(floor), destination=Floor(destination)))
+
+    assert index.min_floor() == 2
+    assert index.max_floor() == 9
+    assert index.max_floor(Direction.DOWN) == 5
+    assert index.min_floor(Direction.DOWN) == 4
+
+    index.pop_first(Floor(9), Direction.UP)
+    assert index.max_floor() == 5
+    assert index.max_floor(Direction.UP) == 2
+
+
+def test_iterates_in_insertion_order():
+    index = CallIndex()
+    calls = [
+        Call(floor=Floor(4), destination=Floor(1)),
+        Call(floor=Floor(1), destination=Floor(4)),
+        Call(floor=Floor(4), destination=Floor(6)),
+    ]
+    for call in calls:
+        index.add(call)
+    assert list(index) == calls
+
+
+def test_extend_keeps_order_with_added_calls():
+    index = CallIndex([Call(floor=Floor(4), destination=Floor(6))])
+    calls = [
+        Call(floor=Floor(4), destination=Floor(8)),
+        Call(floor=Floor(2), destination=Floor(1)),
+    ]
+    index.extend(calls)
+    assert len(index) == 3
+    assert index.pop_bucket(Floor(4), Direction.UP) == [
+        Call(floor=Floor(4), destination=Floor(6)),
+        calls[0],
+    ]
+    assert index.min_floor(Direction.DOWN) == 2
+
+
+def test_next_floor():
+    index = CallIndex()
+    for floor, destination in ((5, 1), (2, 8), (9, 10)):
+        index.add(Call(floor=Floor(floor), destination=Floor(destination)))
+
+    assert index.next_floor(Floor(2), Direction.UP) == 5
+    assert index.next_floor(Floor(5), Direction.DOWN) == 2
+    assert index.next_floor(Floor(9), Direction.UP) is None
+    assert index.next_floor(Floor(2), Direction.DOWN) is None
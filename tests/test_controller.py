@@ -0,0 +1,158 @@
+import asyncio
+import random
+
+import pytest
+
+from controller import ElevatorController, StateUpdate
+from core import Call, ElevatorStatus, Floor
+from dispatcher import GroupDispatcher
+from elevator import PassengerElevator
+from exceptions import InvalidFloorError
+
+
+def make_calls(count: int, seed: int) -> list[Call]:
+    rng = random.Random(seed)
+    calls = []
+    for _ in range(count):
+        floor, destination = rng.sample(range(1, 13), 2)
+        calls.append(Call(floor=Floor(floor), destination=Floor(destination)))
+    return calls
+
+
+def test_panels_calls_are_served():
+    panel_calls = [make_calls(10, seed) for seed in range(5)]
+
+    async def panel(controller: ElevatorController, calls: list[Call]):
+        for call in calls:
+            await controller.submit(call)
+            await asyncio.sleep(0)
+
+    async def watch(subscription) -> list[StateUpdate]:
+        return [update async for update in subscription]
+
+    async def main() -> list[StateUpdate]:
+        elevators = [PassengerElevator(start_floor=None) for _ in range(2)]
+        controller = ElevatorController(
+            GroupDispatcher(elevators),
+            tick_duration=0,
+            max_pending=4,
+        )
+        watcher = asyncio.create_task(watch(controller.subscribe(10_000)))
+        controller.start(until=500)
+        await asyncio.gather(*(
+            panel(controller, calls) for calls in panel_calls
+        ))
+        await watcher
+        assert controller.tick == 500
+        assert not any(elevator.pending_stops for elevator in elevators)
+        return watcher.result()
+
+    updates = asyncio.run(main())
+    served = [call for update in updates for call in update.served_calls]
+    assert sorted(map(id, served)) == sorted(
+        id(call) for calls in panel_calls for call in calls
+    )
+    assert {update.car for update in updates} == {0, 1}
+    assert updates[-1].status == ElevatorStatus.IDLE
+
+
+def test_backpressure():
+    async def main():
+        controller = ElevatorController(
+            PassengerElevator(start_floor=None),
+            tick_duration=0,
+            max_pending=2,
+        )
+        calls = make_calls(3, seed=0)
+        assert controller.try_submit(calls[0])
+        assert controller.try_submit(calls[1])
+        assert not controller.try_submit(calls[2])
+        submitted = asyncio.create_task(controller.submit(calls[2]))
+        await asyncio.sleep(0)
+        assert not submitted.done()
+
+        controller.step()
+        await submitted
+        assert controller.pending == 1
+        assert controller.elevators[0].pending_stops >= 1
+
+    asyncio.run(main())
+
+
+def test_slow_subscriber_does_not_block_ticks():
+    async def main():
+        controller = ElevatorController(
+            PassengerElevator(start_floor=None),
+            tick_duration=0,
+        )
+        subscription = controller.subscribe(max_updates=2)
+        for call in make_calls(5, seed=1):
+            controller.try_submit(call)
+        await controller.run(until=100)
+        assert subscription.dropped > 0
+        updates = [update async for update in subscription]
+        # The end of the subscription takes a place in its queue.
+        assert len(updates) == 1
+        assert updates[-1].status == ElevatorStatus.IDLE
+
+    asyncio.run(main())
+
+
+def test_stop_ends_subscriptions():
+    async def main():
+        async with ElevatorController(
+                PassengerElevator(start_floor=None),
+                tick_duration=0.01,
+        ) as controller:
+            subscription = controller.subscribe()
+            await controller.submit(make_calls(1, seed=2)[0])
+            await asyncio.sleep(0.05)
+            assert controller.is_running
+        assert not controller.is_running
+        assert [update async for update in subscription]
+
+    asyncio.run(main())
+
+
+def test_call_outside_of_building_is_rejected():
+    async def main():
+        controller = ElevatorController(
+            PassengerElevator(start_floor=None),
+            tick_duration=0,
+        )
+        controller.start()
+        with pytest.raises(InvalidFloorError):
+            await controller.submit(
+                Call(floor=Floor(3), destination=Floor(40)),
+            )
+        with pytest.raises(InvalidFloorError):
+            controller.try_submit(Call(floor=Floor(0), destination=Floor(3)))
+        await controller.submit(Call(floor=Floor(3), destination=Floor(5)))
+        await asyncio.sleep(0.01)
+        assert controller.is_running
+        assert controller.tick > 0
+        assert controller.pending == 0
+        await controller.stop()
+
+    asyncio.run(main())
+
+
+def test_stop_raises_error_of_tick_loop():
+    class BrokenElevator(PassengerElevator):
+        def move(self):
+            raise RuntimeError("Broken elevator.")
+
+    async def main():
+        controller = ElevatorController(
+            BrokenElevator(start_floor=None),
+            tick_duration=0,
+        )
+        controller.start()
+        await asyncio.sleep(0.01)
+        assert not controller.is_running
+        with pytest.raises(RuntimeError, match="after an error"):
+            controller.try_submit(Call(floor=Floor(3), destination=Floor(5)))
+        with pytest.raises(RuntimeError, match="Broken elevator"):
+            await controller.stop()
+
+    asyncio.run(main())
@@ -0,0 +1,32 @@
+import attrs
+import pytest
+
+from core import Call, Direction, Floor, Passenger
+
+
+def test_call_direction_is_stored():
+    call = Call(floor=Floor(5), destination=Floor(2))
+    assert call.direction == Direction.DOWN
+    assert Call(floor=Floor(2), destination=Floor(5)).direction == Direction.UP
+    assert "direction" in attrs.fields_dict(Call)
+
+
+def test_call_is_frozen():
+    call = Call(floor=Floor(5), destination=Floor(2))
+    with pytest.raises(attrs.exceptions.FrozenInstanceError):
+        call.floor = Floor(1)
+    assert call == Call(floor=Floor(5), destination=Floor(2))
+    assert hash(call) == hash(Call(floor=Floor(5), destination=Floor(2)))
+
+
+def test_call_destination_validation():
+    with pytest.raises(ValueError):
+        Call(floor=Floor(3), destination=Floor(3))
+
+
+def test_passenger_ids_increase():
+    call = Call(floor=Floor(1), destination=Floor(2))
+    first, second = Passenger(call=call), Passenger(call=call)
+    assert isinstance(first.id, int)
+    assert second.id > first.id
+    assert first != second
@@ -0,0 +1,120 @@
+import random
+
+import pytest
+
+from core import Call, Direction, Floor
+from dispatcher import (CarState, DestinationDispatcher, GroupDispatcher,
+                        estimate_arrival, group_by_destination)
+from elevator import PassengerElevator
+
+
+def test_nearest_idle_car_is_chosen():
+    cars = [PassengerElevator(start_floor=Floor(floor)) for floor in (1, 10)]
+    dispatcher = GroupDispatcher(cars)
+    car = dispatcher.add_request(Call(floor=Floor(9), destination=Floor(2)))
+    assert car is cars[1]
+
+
+def test_car_on_the_way_is_preferred():
+    moving = PassengerElevator(start_floor=Floor(1))
+    moving.add_request(Call(floor=Floor(1), destination=Floor(12)))
+    for _ in range(3):
+        moving.move()
+    assert moving.current_direction == Direction.UP
+    idle = PassengerElevator(start_floor=Floor(1))
+    dispatcher = GroupDispatcher([idle, moving])
+
+    car = dispatcher.add_request(Call(floor=Floor(8), destination=Floor(10)))
+    assert car is moving
+
+
+def test_burst_is_spread_between_cars():
+    cars = [PassengerElevator(start_floor=Floor(1)) for _ in range(4)]
+    dispatcher = GroupDispatcher(cars, stop_penalty=2)
+    calls = [Call(floor=Floor(1), destination=Floor(5)) for _ in range(8)]
+    assigned = dispatcher.add_requests(calls)
+    assert {id(car) for car in assigned} == {id(car) for car in cars}
+
+
+@pytest.mark.parametrize(
+    "direction, call, expected",
+    [
+        (Direction.UP, Call(floor=Floor(7), destination=Floor(9)), 2),
+        (Direction.UP, Call(floor=Floor(7), destination=Floor(2)), 8),
+        (Direction.UP, Call(floor=Floor(3), destination=Floor(4)), 12),
+        (Direction.DOWN, Call(floor=Floor(3), destination=Floor(1)), 2),
+        (None, Call(floor=Floor(9), destination=Floor(1)), 4),
+    ],
+)
+def test_estimate_arrival(direction, call, expected):
+    state = CarState(
+        floor=Floor(5),
+        direction=direction,
+        lowest=Floor(5),
+        highest=Floor(10),
+        stops=0,
+    )
+    assert estimate_arrival(state, call, stop_penalty=1) == expected
+
+
+def test_dispatcher_requires_cars():
+    with pytest.raises(ValueError):
+        GroupDispatcher([])
+
+
+def test_group_by_destination():
+    calls = [
+        Call(floor=Floor(1), destination=Floor(destination))
+        for destination in (9, 2, 3, 10, 4, 3, 8)
+    ] + [Call(floor=Floor(5), destination=Floor(1))]
+    groups = group_by_destination(calls, capacity=3, spread=2)
+    assert [[calls[i].destination for i in group] for group in groups] == [
+        [8, 9, 10], [2, 3, 3], [4], [1],
+    ]
+
+
+def test_destination_dispatch_cuts_stops_per_trip():
+    rng = random.Random(0)
+    calls = [
+        Call(floor=Floor(1), destination=Floor(rng.randint(2, 20)))
+        for _ in range(40)
+    ]
+
+    def stops(dispatcher_class) -> int:
+        cars = [
+            PassengerElevator(start_floor=None, max_floor=20)
+            for _ in range(4)
+        ]
+        assigned = dispatcher_class(cars).add_requests(calls)
+        destinations: dict[int, set[int]] = {}
+        for call, car in zip(calls, assigned):
+            destinations.setdefault(id(car), set()).add(call.destination)
+        return sum(len(floors) for floors in destinations.values())
+
+    assert stops(DestinationDispatcher) < stops(GroupDispatcher) * 0.7
+
+
+def test_destination_dispatch_counts_assigned_calls_in_load():
+    cars = [PassengerElevator(start_floor=Floor(1)) for _ in range(2)]
+    dispatcher = DestinationDispatcher(cars)
+    first = dispatcher.add_requests([
+        Call(floor=Floor(1), destination=Floor(5))
+        for _ in range(PassengerElevator.CAPACITY)
+    ])
+    assert CarState.from_elevator(first[0]).load == PassengerElevator.CAPACITY
+
+    second = dispatcher.add_request(Call(floor=Floor(1), destination=Floor(5)))
+    assert second is not first[0]
+
+
+def test_destination_dispatch_groups_share_car():
+    cars = [PassengerElevator(start_floor=Floor(1)) for _ in range(2)]
+    dispatcher = DestinationDispatcher(cars)
+    calls = [
+        Call(floor=Floor(1), destination=Floor(destination))
+        for destination in (10, 3, 11, 2)
+    ]
+    first, second, third, fourth = dispatcher.add_requests(calls)
+    assert first is third
+    assert second is fourth
+    assert first is not second
@@ -1,5 +1,13 @@
-from core import DoorsStatus, Passenger
+import random
+
+import numpy as np
+import pytest
+
+from algorithms import get_algorithm
+from core import Call, DoorsStatus, ElevatorAbstract, Floor, Passenger
 from elevator import PassengerElevator
+from exceptions import InvalidFloorError
+from run import simulate
 
 
 def test_passenger_enter(elevator: PassengerElevator, passenger: Passenger):
@@ -13,3 +21,167 @@ def test_passenger_enter(elevator: PassengerElevator, passenger: Passenger):
             assert passenger in elevator.passengers
 
         elevator.move()
+
+
+def test_high_rise_with_basements():
+    elevator = PassengerElevator(
+        start_floor=Floor(0),
+        min_floor=-3,
+        max_floor=250,
+        capacity=20,
+    )
+    assert elevator.current_floor == 0
+    assert (elevator.MIN_FLOOR, elevator.MAX_FLOOR) == (-3, 250)
+    assert elevator.capacity_left == 20
+    assert PassengerElevator.MAX_FLOOR == 12
+
+    elevator.add_request(Call(floor=Floor(240), destination=Floor(-3)))
+    while not elevator.served_calls:
+        elevator.move()
+    assert elevator.current_floor == 240
+    assert elevator.selected_floors == (-3,)
+    assert elevator.stops_range == (-3, -3)
+
+
+@pytest.mark.parametrize("floor, destination", [(0, 5), (5, 13), (-2, 20)])
+def test_request_outside_of_building(floor: int, destination: int):
+    elevator = PassengerElevator(start_floor=Floor(1))
+    with pytest.raises(InvalidFloorError):
+        elevator.add_request(
+            Call(floor=Floor(floor), destination=Floor(destination)),
+        )
+    assert not elevator.snapshot().queue.requests
+
+
+def test_add_requests_reports_rejected_calls():
+    elevator = PassengerElevator(start_floor=Floor(1))
+    calls = [
+        Call(floor=Floor(2), destination=Floor(5)),
+        Call(floor=Floor(0), destination=Floor(5)),
+        Call(floor=Floor(12), destination=Floor(1)),
+        Call(floor=Floor(3), destination=Floor(13)),
+    ]
+    report = elevator.add_requests(iter(calls))
+    assert report.accepted == 2
+    assert report.rejected == (1, 3)
+    assert list(elevator.snapshot().queue.requests) == [calls[0], calls[2]]
+
+
+def test_add_requests_from_array():
+    elevator = PassengerElevator(start_floor=Floor(1))
+    report = elevator.add_requests(
+        np.array([[2, 5], [4, 4], [12, 0], [7, 3]]),
+    )
+    assert report.accepted == 2
+    assert report.rejected == (1, 2)
+    assert list(elevator.snapshot().queue.requests) == [
+        Call(floor=Floor(2), destination=Floor(5)),
+        Call(floor=Floor(7), destination=Floor(3)),
+    ]
+    with pytest.raises(ValueError):
+        elevator.add_requests(np.array([1, 2, 3]))
+
+
+class OneByOneElevator(PassengerElevator):
+    """Elevator adding a batch of calls through ``add_request``."""
+
+    _add_valid_requests = ElevatorAbstract._add_valid_requests
+
+
+def test_default_add_requests_skips_rejected_calls():
+    elevator = OneByOneElevator(start_floor=Floor(1))
+    calls = [
+        Call(floor=Floor(2), destination=Floor(5)),
+        Call(floor=Floor(3), destination=Floor(13)),
+        Call(floor=Floor(7), destination=Floor(3)),
+    ]
+    report = elevator.add_requests(calls)
+    assert report.accepted == 2
+    assert report.rejected == (1,)
+    assert list(elevator.snapshot().queue.requests) == [calls[0], calls[2]]
+
+
+def test_high_rise_simulation():
+    elevator = PassengerElevator(
+        start_floor=None,
+        min_floor=-5,
+        max_floor=220,
+    )
+    stats = simulate(
+        elevator,
+        until=20_000,
+        arrival_rate=0.02,
+        rng=random.Random(1),
+        skip_ahead=True,
+    )
+    assert stats.delivered > 0
+
+
+def test_fork_is_independent(
+        elevator: PassengerElevator,
+        passenger: Passenger,
+):
+    elevator.add_request(passenger.call)
+    while elevator.doors != DoorsStatus.OPEN:
+        elevator.move()
+    elevator.enter_elevator(passenger)
+    checkpoint = elevator.snapshot()
+
+    branch = elevator.fork()
+    assert branch.snapshot() == checkpoint
+    branch.exit_elevator(passenger)
+    branch.add_request(Call(floor=Floor(2), destination=Floor(3)))
+    branch.move()
+    assert passenger in elevator.passengers
+    assert elevator.snapshot() == checkpoint
+
+    elevator.move()
+    elevator.restore(checkpoint)
+    assert elevator.snapshot() == checkpoint
+    assert elevator.doors == DoorsStatus.OPEN
+
+
+@pytest.mark.parametrize("algorithm", ["opsa", "scan", "look", "eta"])
+def test_full_car_bypasses_hall_calls(algorithm: str):
+    elevator = PassengerElevator(
+        start_floor=Floor(1),
+        capacity=1,
+        algorithm=algorithm,
+    )
+    passenger = Passenger(call=Call(floor=Floor(1), destination=Floor(6)))
+    elevator.add_request(passenger.call)
+    elevator.move()
+    elevator.enter_elevator(passenger)
+    bypassed = Call(floor=Floor(3), destination=Floor(5))
+    served = Call(floor=Floor(6), destination=Floor(8))
+    elevator.add_request(bypassed)
+    elevator.add_request(served)
+
+    elevator.move()
+    while elevator.doors != DoorsStatus.OPEN:
+        elevator.move()
+    assert elevator.current_floor == 6
+    assert elevator.served_calls == (served,)
+
+    elevator.exit_elevator(passenger)
+    while bypassed not in elevator.served_calls:
+        elevator.move()
+    assert elevator.current_floor == 3
+
+
+@pytest.mark.parametrize("algorithm", ["opsa", "scan", "look", "eta"])
+def test_full_car_without_selected_floors_serves_calls(algorithm: str):
+    queue = get_algorithm(algorithm)(Floor(1), max_floor=Floor(12))
+    queue.is_full = True
+    call = Call(floor=Floor(4), destination=Floor(2))
+    queue.add_request(call)
+    for _ in range(50):
+        queue.determine_next()
+        if queue.served_calls:
+            break
+    assert queue.current_floor == 4
+    assert queue.served_calls == (call,)
+
+    copy = get_algorithm(algorithm)(Floor(1), max_floor=Floor(12))
+    copy.restore(queue.snapshot())
+    assert copy.is_full
@@ -0,0 +1,105 @@
+import random
+
+import pytest
+
+from core import Call, Floor, Passenger
+from elevator import PassengerElevator
+from eta import ArrivalPlan
+from exceptions import InvalidFloorError
+
+
+def first_arrivals(elevator: PassengerElevator) -> dict[int, int]:
+    """Return tick of first arrival on every floor by stepping a fork."""
+    fork = elevator.fork()
+    arrivals = {fork.current_floor: 0}
+    tick = 0
+    while fork.pending_stops:
+        fork.move()
+        tick += 1
+        arrivals.setdefault(fork.current_floor, tick)
+    return arrivals
+
+
+@pytest.mark.parametrize("algorithm", ["opsa", "scan", "look", "eta"])
+def test_eta_matches_stepping(algorithm: str):
+    rng = random.Random(4)
+    elevator = PassengerElevator(
+        start_floor=None,
+        max_floor=20,
+        algorithm=algorithm,
+    )
+    for _ in range(50):
+        floor, destination = rng.sample(range(1, 21), 2)
+        elevator.add_request(Call(floor=Floor(floor), destination=destination))
+        for _ in range(rng.randrange(5)):
+            elevator.move()
+            arrivals = first_arrivals(elevator)
+            for floor, tick in arrivals.items():
+                assert elevator.eta(Floor(floor)) == tick
+
+
+def test_eta_is_cached_until_plan_changes():
+    elevator = PassengerElevator(start_floor=Floor(1))
+    elevator.add_request(Call(floor=Floor(5), destination=Floor(2)))
+    # Idle car takes a tick to choose direction.
+    assert elevator.eta(Floor(5)) == 5
+    assert elevator.eta(Floor(12)) == 8 + 10
+    elevator.move()
+    elevator.move()
+    assert elevator.eta(Floor(5)) == 3
+
+    elevator.add_request(Call(floor=Floor(4), destination=Floor(9)))
+    assert elevator.eta(Floor(9)) > elevator.eta(Floor(5)) == 3
+    with pytest.raises(InvalidFloorError):
+        elevator.eta(Floor(13))
+
+
+def test_eta_follows_load():
+    elevator = PassengerElevator(start_floor=Floor(1), capacity=1)
+    passenger = Passenger(call=Call(floor=Floor(1), destination=Floor(6)))
+    elevator.add_request(passenger.call)
+    elevator.move()
+    elevator.add_request(Call(floor=Floor(3), destination=Floor(5)))
+    assert elevator.eta(Floor(12)) == 5 + 6
+    elevator.enter_elevator(passenger)
+    # Full car bypasses the hall call and returns for it from floor 6.
+    assert elevator.eta(Floor(12)) > 5 + 6
+    assert elevator.eta(Floor(12)) == 17
+
+
+def test_incomplete_plan():
+    plan = ArrivalPlan(
+        visits={1: [0], 2: [1]},
+        end_tick=1,
+        end_floor=Floor(2),
+        complete=False,
+    )
+    assert plan.eta(Floor(2)) == 1
+    assert plan.eta(Floor(2), elapsed=2) is None
+    assert plan.eta(Floor(3)) is None
+
+
+def test_plan_is_kept_until_it_changes(monkeypatch):
+    plans = []
+    from_queue = ArrivalPlan.from_queue
+    monkeypatch.setattr(
+        ArrivalPlan,
+        "from_queue",
+        lambda queue, limit: plans.append(from_queue(queue, limit))
+        or plans[-1],
+    )
+    elevator = PassengerElevator(start_floor=Floor(1), capacity=1)
+    elevator.add_request(Call(floor=Floor(1), destination=Floor(6)))
+    assert [elevator.eta(Floor(6)) for _ in range(3)] == [6, 6, 6]
+    elevator.move()
+    assert elevator.eta(Floor(6)) == 5
+    assert len(plans) == 1
+
+    elevator.add_request(Call(floor=Floor(4), destination=Floor(2)))
+    assert elevator.eta(Floor(6)) == 5
+    assert len(plans) == 2
+    elevator.enter_elevator(
+        Passenger(call=Call(floor=Floor(1), destination=Floor(6))),
+    )
+    assert [elevator.eta(Floor(4)) for _ in range(3)] == [3, 3, 3]
+    assert len(plans) == 3
@@ -0,0 +1,44 @@
+import csv
+import json
+
+import pytest
+
+from export import CsvRecordWriter, JsonlRecordWriter, open_record_writer
+
+
+def test_csv_writer_flushes_in_bulk(tmp_path):
+    path = tmp_path / "records.csv"
+    with CsvRecordWriter(path, buffer_size=2) as writer:
+        writer.write({"tick": 0, "floor": 1})
+        assert path.read_text() == ""
+        writer.write({"tick": 1, "floor": 2})
+        writer.write({"tick": 2, "floor": 3})
+        assert writer.written == 3
+    with open(path, newline="") as file:
+        rows = list(csv.DictReader(file))
+    assert rows == [
+        {"tick": "0", "floor": "1"},
+        {"tick": "1", "floor": "2"},
+        {"tick": "2", "floor": "3"},
+    ]
+
+
+def test_jsonl_writer(tmp_path):
+    path = tmp_path / "records.jsonl"
+    with JsonlRecordWriter(path) as writer:
+        writer.write({"tick": 0, "wait": 1.5})
+        writer.write({"tick": 1, "wait": None})
+    lines = path.read_text().splitlines()
+    assert [json.loads(line) for line in lines] == [
+        {"tick": 0, "wait": 1.5},
+        {"tick": 1, "wait": None},
+    ]
+
+
+def test_open_record_writer(tmp_path):
+    with open_record_writer(tmp_path / "a.CSV") as writer:
+        assert isinstance(writer, CsvRecordWriter)
+    with open_record_writer(tmp_path / "b.out", "jsonl") as writer:
+        assert isinstance(writer, JsonlRecordWriter)
+    with pytest.raises(ValueError):
+        open_record_writer(tmp_path / "c.txt")
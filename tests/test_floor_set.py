@@ -0,0 +1,39 @@
+from floor_set import FloorSet
+
+
+def test_add_discard_and_iterate():
+    floors = FloorSet([5, 2, 9])
+    floors.add(5)
+    assert len(floors) == 3
+    assert list(floors) == [2, 5, 9]
+    assert 5 in floors and 3 not in floors and -1 not in floors
+    floors.discard(5)
+    floors.discard(7)
+    assert list(floors) == [2, 9]
+
+
+def test_rebase_below_lowest_floor():
+    floors = FloorSet([200, 10])
+    floors.add(-4)
+    assert list(floors) == [-4, 10, 200]
+    assert floors.lowest() == -4
+    assert floors.highest() == 200
+
+
+def test_nearest_floors():
+    floors = FloorSet([-2, 3, 150])
+    assert floors.any_above(3) and not floors.any_above(150)
+    assert floors.any_below(3) and not floors.any_below(-2)
+    assert floors.next_above(3) == 150
+    assert floors.next_above(-10) == -2
+    assert floors.next_above(150) is None
+    assert floors.next_below(150) == 3
+    assert floors.next_below(-2) is None
+    assert floors.next_below(1000) == 150
+
+
+def test_empty():
+    floors = FloorSet()
+    assert not floors
+    assert floors.lowest() is None and floors.highest() is None
+    assert floors.next_above(0) is None and floors.next_below(0) is None
@@ -0,0 +1,138 @@
+import random
+
+import attrs
+import pytest
+
+from core import Call, DoorsStatus, Floor, Passenger
+from elevator import PassengerElevator
+from metrics import LatencyMetrics, PhaseTimers, StreamingHistogram
+from registry import HallCallRegistry
+from run import simulate
+
+
+def test_small_values_are_exact():
+    histogram = StreamingHistogram()
+    for value in range(1, 11):
+        histogram.record(value)
+    assert histogram.count == 10
+    assert histogram.mean == 5.5
+    assert histogram.percentile(50) == 5
+    assert histogram.percentile(90) == 9
+    assert histogram.percentile(100) == 10
+    assert (histogram.min, histogram.max) == (1, 10)
+
+
+@pytest.mark.parametrize("percent", [50, 95, 99])
+def test_percentile_relative_error(percent: float):
+    rng = random.Random(0)
+    values = [int(rng.expovariate(1 / 5_000)) for _ in range(20_000)]
+    histogram = StreamingHistogram(precision=5)
+    for value in values:
+        histogram.record(value)
+    exact = sorted(values)[int(percent / 100 * len(values)) - 1]
+    assert abs(histogram.percentile(percent) - exact) <= exact / 2 ** 5 + 1
+
+
+def test_memory_does_not_depend_on_samples():
+    histogram = StreamingHistogram()
+    for value in range(1_000):
+        histogram.record(value)
+    buckets = histogram.buckets
+    for _ in range(10):
+        for value in range(1_000):
+            histogram.record(value)
+    assert histogram.buckets == buckets
+    assert histogram.count == 11_000
+
+
+def test_merge():
+    first, second = StreamingHistogram(), StreamingHistogram()
+    for value in range(100):
+        first.record(value)
+        second.record(value + 1_000)
+    first.merge(second)
+    assert first.count == 200
+    assert (first.min, first.max) == (0, 1_099)
+    assert first.percentile(50) == 99
+
+
+def test_empty_histogram():
+    assert StreamingHistogram().percentile(95) is None
+
+
+def test_elevator_hooks():
+    now = 0
+    metrics = LatencyMetrics(clock=lambda: now)
+    registry = HallCallRegistry(metrics=metrics)
+    elevator = PassengerElevator(start_floor=Floor(1), metrics=metrics)
+    passenger = Passenger(call=Call(floor=Floor(3), destination=Floor(5)))
+    registry.add(passenger)
+    elevator.add_request(passenger.call)
+
+    while passenger not in elevator.passengers:
+        now += 1
+        elevator.move()
+        if elevator.doors == DoorsStatus.OPEN:
+            registry.board(elevator)
+    while passenger in elevator.passengers:
+        now += 1
+        elevator.move()
+        if (elevator.doors == DoorsStatus.OPEN
+                and elevator.current_floor == passenger.call.destination):
+            elevator.exit_elevator(passenger)
+
+    summary = metrics.summary()
+    assert summary["wait_count"] == summary["ride_count"] == 1
+    assert summary["wait_p50"] == 3
+    assert summary["ride_p99"] == 2
+    assert metrics.in_flight == 0
+
+
+def test_phase_timers_accumulate():
+    ticks = iter([0, 5, 7, 10, 20, 30])
+    timers = PhaseTimers(clock=lambda: next(ticks))
+    started_at = timers.clock()
+    started_at = timers.lap("first", started_at)
+    started_at = timers.lap("second", started_at)
+    timers.lap("first", started_at)
+    timers.lap("second", timers.clock())
+    assert started_at == 7
+    assert (timers.total_ns("first"), timers.count("first")) == (8, 2)
+    assert (timers.total_ns("second"), timers.count("second")) == (12, 2)
+    assert list(timers.summary()) == ["second", "first"]
+    assert timers.summary()["first"]["mean_ns"] == 4
+    timers.reset()
+    assert timers.summary() == {}
+
+
+@pytest.mark.parametrize("algorithm", ["opsa", "look"])
+def test_timed_and_untimed_ticks_match(algorithm: str):
+    untimed, timed = (
+        simulate(
+            PassengerElevator(
+                start_floor=None,
+                algorithm=algorithm,
+                timers=timers,
+            ),
+            until=500,
+            rng=random.Random(0),
+        )
+        for timers in (None, PhaseTimers())
+    )
+    assert attrs.evolve(untimed, wait=timed.wait) == timed
+    assert untimed.wait.mean == timed.wait.mean
+
+
+@pytest.mark.parametrize("algorithm", ["opsa", "look"])
+def test_elevator_times_phases(algorithm: str):
+    timers = PhaseTimers()
+    elevator = PassengerElevator(
+        start_floor=None,
+        algorithm=algorithm,
+        timers=timers,
+    )
+    simulate(elevator, until=500, rng=random.Random(0))
+    assert timers.count("elevator.queue") == 500
+    for phase in ("queue.next_floor", "queue.stop", "queue.direction"):
+        assert timers.count(phase) == 500
+    assert timers.count("run.board") == timers.count("run.exit") > 0
@@ -0,0 +1,110 @@
+import pytest
+
+from algorithms import get_algorithm
+from core import Call, DoorsStatus, ElevatorStatus, Floor
+from elevator import PassengerElevator
+from parking import DemandParking
+from run import simulate
+from traffic import TICKS_PER_HOUR, TrafficModel, TrafficPeriod, up_peak_matrix
+
+
+class Clock:
+    def __init__(self):
+        self.now = 0
+
+    def __call__(self) -> int:
+        return self.now
+
+
+def test_demand_decays_and_follows_time_of_day():
+    clock = Clock()
+    parking = DemandParking(clock=clock, half_life=100, slot_ticks=10, slots=2)
+    for floor in (3, 3, 5):
+        parking.record(Call(floor=Floor(floor), destination=Floor(1)))
+    assert parking.demand(Floor(3)) == 2
+    assert parking.choose_floor(Floor(1)) == 3
+    assert parking.choose_floor(Floor(3)) is None
+
+    clock.now = 10
+    assert parking.choose_floor(Floor(1)) is None
+    clock.now = 100
+    assert parking.demand(Floor(3)) == 1
+    assert parking.choose_floor(Floor(1)) == 3
+    for _ in range(3):
+        parking.record(Call(floor=Floor(5), destination=Floor(1)))
+    assert parking.choose_floor(Floor(1)) == 5
+
+    clock.now = 100_000
+    assert parking.choose_floor(Floor(1)) is None
+    parking.record(Call(floor=Floor(7), destination=Floor(1)))
+    assert parking.demand(Floor(7)) == 1
+
+
+def test_idle_car_parks_on_busiest_floor():
+    clock = Clock()
+    elevator = PassengerElevator(
+        start_floor=Floor(1),
+        parking=DemandParking(clock=clock),
+    )
+    elevator.add_request(Call(floor=Floor(6), destination=Floor(2)))
+    stops = []
+    elevator.move()
+    while elevator.status != ElevatorStatus.IDLE:
+        if elevator.status == ElevatorStatus.WAITING_ON_THE_FLOOR:
+            stops.append(elevator.current_floor)
+        elevator.move()
+    # Car parks on the call floor without stopping there.
+    assert stops == [6, 2]
+    assert elevator.current_floor == 6
+    assert elevator.doors == DoorsStatus.CLOSED
+
+
+def test_parking_reduces_up_peak_wait():
+    waits = []
+    for parking in (None, DemandParking()):
+        period = TrafficPeriod(
+            start=0, end=3 * TICKS_PER_HOUR, rate=0.02,
+            matrix=up_peak_matrix(30),
+        )
+        stats = simulate(
+            PassengerElevator(start_floor=None, max_floor=30, parking=parking),
+            until=3 * TICKS_PER_HOUR,
+            arrivals=TrafficModel([period], seed=1),
+        )
+        waits.append(stats.wait.mean)
+    assert waits[1] < 0.8 * waits[0]
+
+
+@pytest.mark.parametrize("algorithm", ["opsa", "look"])
+def test_parking_is_not_a_committed_stop(algorithm: str):
+    queue = get_algorithm(algorithm)(Floor(1), max_floor=Floor(12))
+    queue.park(Floor(9))
+    assert queue.has_requests
+    assert (queue.pending_stops, queue.stops_range) == (0, None)
+    assert queue.selected_floors == ()
+    for _ in range(3):
+        queue.determine_next()
+    assert queue.current_floor == 3
+
+    copy = get_algorithm(algorithm)(Floor(1), max_floor=Floor(12))
+    copy.restore(queue.snapshot())
+    assert copy.snapshot() == queue.snapshot()
+
+    call = Call(floor=Floor(2), destination=Floor(1))
+    queue.add_request(call)
+    assert queue.pending_stops == 1
+    while not queue.served_calls:
+        queue.determine_next()
+    assert queue.current_floor == 2
+    assert queue.selected_floors == (1,)
+
+
+@pytest.mark.parametrize("algorithm", ["opsa", "look"])
+def test_parked_car_does_not_stop(algorithm: str):
+    queue = get_algorithm(algorithm)(Floor(1), max_floor=Floor(12))
+    queue.park(Floor(4))
+    while queue.has_requests:
+        queue.determine_next()
+        assert not queue.is_stopped
+    assert queue.current_floor == 4
+    assert queue.current_direction is None
@@ -0,0 +1,36 @@
+import numpy as np
+import pytest
+
+from core import Direction
+from passenger_table import NOT_YET, PassengerTable
+
+
+def test_add_and_grow():
+    table = PassengerTable(capacity=2)
+    first = table.add(floor=1, destination=5, called_at=3)
+    ids = table.add_many([7, 2, 9], [3, 4, 1], called_at=[4, 5, 6])
+
+    assert first == 0
+    assert list(ids) == [1, 2, 3]
+    assert len(table) == 4
+    assert table.capacity >= 4
+    assert list(table.direction[:4]) == [
+        Direction.UP, Direction.DOWN, Direction.UP, Direction.DOWN,
+    ]
+    assert list(table.called_at[:4]) == [3, 4, 5, 6]
+    assert np.all(table.boarded_at[:4] == NOT_YET)
+
+
+def test_wait_and_ride_times():
+    table = PassengerTable()
+    ids = table.add_many([1, 2, 3], [4, 5, 6], called_at=10)
+    table.board(ids[:2], tick=15)
+    table.exit(ids[0], tick=20)
+
+    assert list(table.wait_times()) == [5, 5]
+    assert list(table.ride_times()) == [5]
+
+
+def test_invalid_destination():
+    with pytest.raises(ValueError):
+        PassengerTable().add(floor=3, destination=3, called_at=0)
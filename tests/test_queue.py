@@ -1,7 +1,10 @@
+import random
+
 import pytest
 
 from src.core import Call, Floor
 from src.elevator import ElevatorOPSAQueue
+from tests.opsa_reference import ReferenceOPSAQueue
 
 
 @pytest.mark.parametrize(
@@ -87,3 +90,80 @@ def test_movement_up_and_down(call: Call, eda_queue: ElevatorOPSAQueue):
         if ((eda_queue.current_floor == call.destination and reverse_move)
                 or eda_queue.current_floor == call.floor):
             assert eda_queue.is_stopped is True
+
+
+@pytest.mark.parametrize("max_floor", (12, 60))
+@pytest.mark.parametrize("seed", range(20))
+def test_matches_reference_queue(seed: int, max_floor: int):
+    rng = random.Random(seed)
+    queue = ElevatorOPSAQueue(start_floor=Floor(1))
+    reference = ReferenceOPSAQueue(start_floor=Floor(1))
+    for _ in range(500):
+        if rng.random() < 0.4:
+            floor, destination = rng.sample(range(1, max_floor + 1), 2)
+            call = Call(floor=Floor(floor), destination=Floor(destination))
+            queue.add_request(call)
+            reference.add_request(call)
+        queue.determine_next()
+        reference.determine_next()
+        assert queue.current_floor == reference.current_floor
+        assert queue.current_direction == reference.current_direction
+        assert queue.is_stopped == reference.is_stopped
+        assert sorted(queue.selected_floors) == sorted(
+            reference.selected_floors)
+        assert queue.has_requests == reference.has_requests
+
+
+def test_advance_jumps_to_next_stop():
+    queue = ElevatorOPSAQueue(start_floor=Floor(1))
+    queue.add_request(Call(floor=Floor(40), destination=Floor(2)))
+    queue.determine_next()
+    assert queue.advance(max_ticks=100) == 39
+    assert queue.current_floor == 40
+    assert queue.is_stopped
+
+
+@pytest.mark.parametrize("seed", range(20))
+def test_advance_matches_ticking(seed: int):
+    rng = random.Random(seed)
+    queue = ElevatorOPSAQueue(start_floor=Floor(1))
+    ticking = ElevatorOPSAQueue(start_floor=Floor(1))
+    for _ in range(300):
+        if rng.random() < 0.2:
+            floor, destination = rng.sample(range(1, 41), 2)
+            call = Call(floor=Floor(floor), destination=Floor(destination))
+            queue.add_request(call)
+            ticking.add_request(call)
+        for _ in range(queue.advance(max_ticks=rng.randint(1, 20))):
+            ticking.determine_next()
+        assert queue.current_floor == ticking.current_floor
+        assert queue.current_direction == ticking.current_direction
+        assert queue.is_stopped == ticking.is_stopped
+        assert queue.served_calls == ticking.served_calls
+        assert sorted(queue.selected_floors) == sorted(
+            ticking.selected_floors)
+
+
+@pytest.mark.parametrize("seed", range(10))
+def test_restored_queue_matches_original(seed: int):
+    rng = random.Random(seed)
+    queue = ElevatorOPSAQueue(start_floor=Floor(1))
+    calls = []
+    for _ in range(400):
+        floor, destination = rng.sample(range(1, 21), 2)
+        calls.append(Call(floor=Floor(floor), destination=Floor(destination)))
+    for call in calls[:100]:
+        queue.add_request(call)
+        queue.determine_next()
+
+    snapshot = queue.snapshot()
+    branch = ElevatorOPSAQueue.from_snapshot(snapshot)
+    assert branch.snapshot() == snapshot
+    for call in calls[100:]:
+        for current in (queue, branch):
+            current.add_request(call)
+            current.determine_next()
+        assert branch.snapshot() == queue.snapshot()
+
+    queue.restore(snapshot)
+    assert queue.snapshot() == snapshot
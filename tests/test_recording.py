@@ -0,0 +1,108 @@
+import random
+
+import pytest
+
+from core import Call, Floor
+from elevator import PassengerElevator
+from exceptions import InvalidTraceError
+from recording import RecordKind, TraceRecorder, TraceReplayer
+from run import simulate
+
+
+def test_round_trip(tmp_path):
+    path = tmp_path / "calls.trace"
+    calls = [
+        Call(floor=Floor(1), destination=Floor(5)),
+        Call(floor=Floor(7), destination=Floor(2)),
+        Call(floor=Floor(3), destination=Floor(12)),
+    ]
+    with TraceRecorder(path, buffer_size=2) as recorder:
+        for tick, call in enumerate(calls):
+            recorder.record_call(tick * 2, call)
+        assert recorder.written == 3
+
+    replayer = TraceReplayer(path)
+    assert len(replayer) == 3
+    batches = list(replayer.iter_batches(batch_size=2))
+    assert [len(batch) for _, batch in batches] == [2, 1]
+    assert [call for _, batch in batches for call in batch] == calls
+    assert batches[0][0].tolist() == [0, 2]
+
+
+def test_states_are_separated_from_calls(tmp_path):
+    path = tmp_path / "states.trace"
+    elevator = PassengerElevator(start_floor=Floor(1))
+    with TraceRecorder(path, record_states=True) as recorder:
+        recorder.record_state(0, elevator)
+        recorder.record_call(1, Call(floor=Floor(2), destination=Floor(4)))
+        recorder.record_state(1, elevator)
+
+    replayer = TraceReplayer(path)
+    assert len(replayer) == 1
+    assert replayer.states.shape[0] == 2
+    assert (replayer.states["kind"] == RecordKind.STATE).all()
+    assert replayer.states["floor"].tolist() == [1, 1]
+
+
+def test_invalid_file_is_rejected(tmp_path):
+    path = tmp_path / "garbage.trace"
+    path.write_bytes(b"not a trace at all")
+    with pytest.raises(InvalidTraceError):
+        TraceReplayer(path)
+
+
+def test_feed_until(tmp_path):
+    path = tmp_path / "calls.trace"
+    with TraceRecorder(path) as recorder:
+        for tick in range(10):
+            recorder.record_call(
+                tick,
+                Call(floor=Floor(1), destination=Floor(tick % 10 + 2)),
+            )
+
+    elevator = PassengerElevator(start_floor=Floor(5))
+    assert TraceReplayer(path).feed(elevator, until=4) == 4
+    assert elevator.pending_stops == 4
+
+
+def test_replayed_simulation_matches_recorded(tmp_path):
+    path = tmp_path / "run.trace"
+    with TraceRecorder(path) as recorder:
+        recorded = simulate(
+            PassengerElevator(start_floor=Floor(1)),
+            until=2_000,
+            rng=random.Random(7),
+            recorder=recorder,
+        )
+
+    replayed = simulate(
+        PassengerElevator(start_floor=Floor(1)),
+        until=2_000,
+        arrivals=TraceReplayer(path),
+    )
+    assert replayed.called == recorded.called > 0
+    assert replayed.delivered == recorded.delivered
+    assert replayed.wait.mean == recorded.wait.mean
+
+
+@pytest.mark.parametrize("limits", [
+    {"min_floor": -40_000},
+    {"max_floor": 40_000},
+    {"min_floor": 5, "max_floor": 2},
+    {"cars": 0},
+    {"cars": 300},
+])
+def test_recorder_rejects_fields_out_of_range(tmp_path, limits: dict):
+    with pytest.raises(ValueError):
+        TraceRecorder(tmp_path / "run.trace", **limits)
+
+
+def test_simulation_must_fit_recorder(tmp_path):
+    with TraceRecorder(tmp_path / "run.trace", max_floor=12) as recorder:
+        with pytest.raises(ValueError):
+            simulate(
+                PassengerElevator(start_floor=None, max_floor=20),
+                until=10,
+                recorder=recorder,
+            )
+        assert recorder.written == 0
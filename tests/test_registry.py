@@ -0,0 +1,75 @@
+from core import Call, Direction, DoorsStatus, Floor, Passenger
+from elevator import PassengerElevator
+from registry import HallCallRegistry
+
+
+def make_passenger(floor: int, destination: int) -> Passenger:
+    call = Call(floor=Floor(floor), destination=Floor(destination))
+    return Passenger(call=call)
+
+
+def move_to_stop(elevator: PassengerElevator, floor: int):
+    for _ in range(50):
+        elevator.move()
+        if (elevator.current_floor == floor
+                and elevator.doors == DoorsStatus.OPEN):
+            return
+    raise AssertionError(f"Elevator did not stop on floor {floor}.")
+
+
+def test_waiting_by_floor_and_direction():
+    registry = HallCallRegistry()
+    for floor, destination in ((3, 5), (3, 1), (3, 7), (4, 1)):
+        registry.add(make_passenger(floor, destination))
+
+    assert len(registry) == 4
+    assert registry.waiting(Floor(3)) == 3
+    assert registry.waiting(Floor(3), Direction.UP) == 2
+    assert registry.waiting(Floor(5)) == 0
+    assert [p.call.destination for p in registry.passengers(
+        Floor(3), Direction.UP)] == [5, 7]
+
+
+def test_board_served_direction_only():
+    elevator = PassengerElevator(start_floor=Floor(1))
+    registry = HallCallRegistry()
+    up, down = make_passenger(3, 6), make_passenger(3, 1)
+    for passenger in (up, down):
+        registry.add(passenger)
+    elevator.add_request(up.call)
+
+    move_to_stop(elevator, 3)
+    assert registry.board(elevator) == [up]
+    assert elevator.passengers == (up,)
+    assert registry.waiting(Floor(3), Direction.DOWN) == 1
+
+
+def test_board_only_passengers_of_served_calls():
+    elevator = PassengerElevator(start_floor=Floor(1))
+    registry = HallCallRegistry()
+    first, second = make_passenger(3, 8), make_passenger(3, 6)
+    for passenger in (first, second):
+        registry.add(passenger)
+    elevator.add_request(second.call)
+
+    move_to_stop(elevator, 3)
+    assert registry.board(elevator) == [second]
+    assert elevator.selected_floors == (6,)
+    assert registry.passengers(Floor(3), Direction.UP) == (first,)
+
+
+def test_partial_boarding_requests_call_again():
+    elevator = PassengerElevator(start_floor=Floor(1))
+    registry = HallCallRegistry()
+    passengers = [make_passenger(2, 5) for _ in range(elevator.CAPACITY + 2)]
+    for passenger in passengers:
+        registry.add(passenger)
+        elevator.add_request(passenger.call)
+
+    move_to_stop(elevator, 2)
+    boarded = registry.board(elevator)
+    assert boarded == passengers[:elevator.CAPACITY]
+    assert elevator.capacity_left == 0
+    assert registry.waiting(Floor(2), Direction.UP) == 2
+    # Calls of passengers left behind are pending again.
+    assert elevator.pending_stops == 1 + 2
@@ -0,0 +1,150 @@
+import json
+import random
+import time
+
+from core import Call, DoorsStatus, Floor, Passenger
+from elevator import PassengerElevator
+from export import open_record_writer
+from run import main, profile, run, simulate
+from simulation import Event, EventType, Simulation
+
+
+def test_events_processed_in_time_order(elevator: PassengerElevator):
+    simulation = Simulation([elevator])
+    processed: list[Event] = []
+    simulation.subscribe(
+        EventType.CALL_ARRIVAL,
+        lambda _, event: processed.append(event),
+    )
+    simulation.schedule(5, EventType.CALL_ARRIVAL, "second")
+    simulation.schedule(2, EventType.CALL_ARRIVAL, "first")
+    simulation.schedule(5, EventType.CALL_ARRIVAL, "third")
+    simulation.run(until=10)
+
+    assert [event.payload for event in processed] == [
+        "first", "second", "third",
+    ]
+    assert [event.time for event in processed] == [2, 5, 5]
+    assert simulation.now == 10
+
+
+def test_virtual_clock_does_not_sleep(elevator: PassengerElevator):
+    simulation = Simulation([elevator])
+    started_at = time.monotonic()
+    simulation.run(until=10_000)
+    assert time.monotonic() - started_at < 5
+    assert simulation.now == 10_000
+
+
+def test_realtime_pacing(elevator: PassengerElevator):
+    simulation = Simulation([elevator], tick_duration=0.01)
+    started_at = time.monotonic()
+    simulation.run(until=10)
+    assert time.monotonic() - started_at >= 0.09
+
+
+def test_passenger_delivered(elevator: PassengerElevator):
+    simulation = Simulation([elevator])
+    passenger = Passenger(call=Call(floor=Floor(3), destination=Floor(6)))
+    delivered: list[int] = []
+
+    def on_call_arrival(_: Simulation, event: Event):
+        elevator.add_request(event.payload.call)
+
+    def on_doors_opened(sim: Simulation, _: Event):
+        assert elevator.doors == DoorsStatus.OPEN
+        if elevator.current_floor == passenger.call.floor:
+            elevator.enter_elevator(passenger)
+        elif elevator.current_floor == passenger.call.destination:
+            elevator.exit_elevator(passenger)
+            delivered.append(sim.now)
+
+    simulation.subscribe(EventType.CALL_ARRIVAL, on_call_arrival)
+    simulation.subscribe(EventType.DOORS_OPENED, on_doors_opened)
+    simulation.schedule(1, EventType.CALL_ARRIVAL, passenger)
+    simulation.run(until=50)
+
+    assert len(delivered) == 1
+    assert passenger not in elevator.passengers
+
+
+def test_skip_ahead_covers_transit_ticks():
+    elevator = PassengerElevator(start_floor=Floor(1))
+    simulation = Simulation([elevator], skip_ahead=True)
+    ticks: list[Event] = []
+    simulation.subscribe(EventType.TICK, lambda _, event: ticks.append(event))
+    simulation.schedule(
+        1,
+        EventType.CALL_ARRIVAL,
+        Passenger(call=Call(floor=Floor(12), destination=Floor(1))),
+    )
+    simulation.subscribe(
+        EventType.CALL_ARRIVAL,
+        lambda _, event: elevator.add_request(event.payload.call),
+    )
+    simulation.run(until=13)
+
+    assert sum(event.payload for event in ticks) == 13
+    assert len(ticks) < 13
+    assert elevator.current_floor == 12
+    assert elevator.doors == DoorsStatus.OPEN
+
+
+def test_skip_ahead_matches_ticking():
+    ticking = simulate(
+        PassengerElevator(start_floor=Floor(1)),
+        until=5_000,
+        arrival_rate=0.05,
+        rng=random.Random(3),
+    )
+    skipping = simulate(
+        PassengerElevator(start_floor=Floor(1)),
+        until=5_000,
+        arrival_rate=0.05,
+        rng=random.Random(3),
+        skip_ahead=True,
+    )
+    assert skipping.ticks == ticking.ticks == 5_000
+    assert skipping.delivered == ticking.delivered > 0
+    assert skipping.trips == ticking.trips
+    assert skipping.wait.mean == ticking.wait.mean
+
+
+def test_profile_writes_report(tmp_path):
+    report = tmp_path / "profile.txt"
+    stats = profile(str(report), until=300, limit=5)
+    assert stats.ticks == 300
+    text = report.read_text()
+    assert "cumulative" in text
+    assert "simulate" in text
+
+
+def test_run_streams_records_of_cars(tmp_path):
+    path = tmp_path / "passengers.jsonl"
+    with open_record_writer(path) as writer:
+        stats = run(
+            until=2_000,
+            tick_duration=None,
+            seed=0,
+            max_floor=20,
+            cars=3,
+            passengers=writer,
+        )
+    records = [json.loads(line) for line in path.read_text().splitlines()]
+    assert len(records) == stats.delivered > 0
+    assert {record["car"] for record in records} == {0, 1, 2}
+    assert all(
+        record["called_at"] + record["wait"] == record["boarded_at"]
+        for record in records
+    )
+
+
+def test_batch_cli(tmp_path, capsys):
+    path = tmp_path / "states.csv"
+    main([
+        "--batch", "--ticks", "300", "--seed", "1", "--cars", "2",
+        "--output", str(path), "--records", "ticks",
+    ])
+    summary = json.loads(capsys.readouterr().out)
+    assert summary["ticks"] == 300
+    assert len(path.read_text().splitlines()) == 1 + 2 * 300
@@ -0,0 +1,57 @@
+import sys
+
+from loguru import logger
+
+from sweep import (AGGREGATE_FIELDS, aggregate, main, make_grid, run_config,
+                   run_sweep)
+
+
+def test_grid_has_unique_seeds():
+    configs = make_grid(
+        runs=3,
+        arrival_rates=(0.1, 0.3),
+        max_floors=(12, 20),
+        ticks=100,
+    )
+    assert len(configs) == 12
+    assert len({config.seed for config in configs}) == 12
+
+
+def test_run_is_deterministic():
+    config = make_grid(runs=1, arrival_rates=(0.3,), ticks=2_000)[0]
+    first, second = run_config(config), run_config(config)
+    assert first == second
+    assert first.delivered > 0
+    assert first.p95_wait >= first.mean_wait > 0
+
+
+def test_sweep_matches_sequential_runs():
+    configs = make_grid(
+        runs=2,
+        arrival_rates=(0.2,),
+        capacities=(2, 10),
+        ticks=500,
+    )
+    results = list(run_sweep(configs, workers=2, chunksize=1))
+    assert results == [run_config(config) for config in configs]
+
+    table = aggregate(results)
+    assert [row["capacity"] for row in table] == [2, 10]
+    assert all(row["runs"] == 2 for row in table)
+    assert all(tuple(row) == AGGREGATE_FIELDS for row in table)
+
+
+def test_empty_sweep_prints_header(capsys):
+    main(["--runs", "0"])
+    assert capsys.readouterr().out.strip() == ",".join(AGGREGATE_FIELDS)
+
+
+def test_workers_do_not_log(capfd):
+    config = make_grid(runs=1, arrival_rates=(0.3,), ticks=200)[0]
+    handler = logger.add(sys.stderr)
+    try:
+        results = list(run_sweep([config], workers=1))
+    finally:
+        logger.remove(handler)
+    assert results == [run_config(config)]
+    assert capfd.readouterr().err == ""
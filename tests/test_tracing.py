@@ -0,0 +1,78 @@
+import io
+
+from core import Call, Direction, ElevatorStatus, Floor
+from elevator import PassengerElevator
+from tracing import FileSink, RingBufferTracer, TraceEventKind
+
+
+def test_ring_buffer_overwrites_oldest():
+    tracer = RingBufferTracer(capacity=3)
+    for floor in range(5):
+        tracer.record(TraceEventKind.MOVE, floor, Direction.UP)
+
+    assert len(tracer) == 3
+    assert tracer.dropped == 2
+    events = tracer.drain()
+    assert [event.floor for event in events] == [2, 3, 4]
+    assert [event.seq for event in events] == [2, 3, 4]
+    assert len(tracer) == 0
+
+
+def test_drain_to_sink_in_batches():
+    tracer = RingBufferTracer(capacity=16)
+    for floor in range(10):
+        tracer.record(TraceEventKind.STOP, floor)
+    batches = []
+    assert tracer.drain_to(batches.append, batch_size=4) == 10
+    assert [len(batch) for batch in batches] == [4, 4, 2]
+
+
+def test_file_sink():
+    tracer = RingBufferTracer()
+    tracer.record(TraceEventKind.ENQUEUE, 3, 7)
+    stream = io.StringIO()
+    tracer.drain_to(FileSink(stream))
+    assert stream.getvalue() == "0\tENQUEUE\t3\t7\n"
+
+
+def test_elevator_events_are_traced():
+    tracer = RingBufferTracer()
+    elevator = PassengerElevator(start_floor=Floor(1), tracer=tracer)
+    elevator.add_request(Call(floor=Floor(2), destination=Floor(3)))
+    for _ in range(3):
+        elevator.move()
+
+    kinds = [(event.kind, event.floor) for event in tracer.drain()]
+    assert kinds == [
+        (TraceEventKind.ENQUEUE, 2),
+        (TraceEventKind.DIRECTION_CHANGE, 1),
+        (TraceEventKind.STATUS_CHANGE, 1),
+        (TraceEventKind.FLOOR_SELECTED, 3),
+        (TraceEventKind.MOVE, 2),
+        (TraceEventKind.STOP, 2),
+        (TraceEventKind.STATUS_CHANGE, 2),
+        (TraceEventKind.MOVE, 3),
+        (TraceEventKind.STOP, 3),
+        (TraceEventKind.DIRECTION_CHANGE, 3),
+    ]
+    assert elevator.status == ElevatorStatus.WAITING_ON_THE_FLOOR
+
+
+def test_batch_of_calls_is_traced_once():
+    tracer = RingBufferTracer()
+    elevator = PassengerElevator(start_floor=Floor(1), tracer=tracer)
+    elevator.add_requests([
+        Call(floor=Floor(6), destination=Floor(3)),
+        Call(floor=Floor(4), destination=Floor(9)),
+    ])
+    events = tracer.drain()
+    assert len(events) == 1
+    assert events[0].kind == TraceEventKind.ENQUEUE_BATCH
+    assert (events[0].floor, events[0].value) == (4, 2)
+
+
+def test_untraced_elevator():
+    elevator = PassengerElevator(start_floor=Floor(1))
+    elevator.add_request(Call(floor=Floor(2), destination=Floor(3)))
+    elevator.move()
+    assert elevator.current_floor == 1
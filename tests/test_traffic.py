@@ -0,0 +1,72 @@
+import numpy as np
+import pytest
+
+from core import make_calls
+from elevator import PassengerElevator
+from run import simulate
+from traffic import (TICKS_PER_HOUR, TrafficModel, TrafficPeriod, office_day,
+                     uniform_matrix, up_peak_matrix)
+
+
+def test_make_calls_shares_equal_calls():
+    calls = make_calls(np.array([1, -2, 1]), np.array([5, 3, 5]))
+    assert [(call.floor, call.destination) for call in calls] == [
+        (1, 5), (-2, 3), (1, 5),
+    ]
+    assert calls[0] is calls[2]
+
+
+def test_model_is_deterministic_by_seed():
+    periods = office_day(floors=12)
+    first = list(TrafficModel(periods, seed=3).chunks())
+    second = list(TrafficModel(periods, seed=3).chunks())
+    assert len(first) == 24
+    for left, right in zip(first, second):
+        assert (left.ticks == right.ticks).all()
+        assert (left.floors == right.floors).all()
+        assert (left.destinations == right.destinations).all()
+
+
+def test_chunks_follow_period_rate():
+    period = TrafficPeriod(
+        start=0, end=10 * TICKS_PER_HOUR, rate=0.2,
+        matrix=uniform_matrix(12),
+    )
+    chunks = list(TrafficModel([period], seed=0).chunks(chunk_size=1000))
+    assert len(chunks) == 36
+    ticks = np.concatenate([chunk.ticks for chunk in chunks])
+    assert (np.diff(ticks) >= 0).all()
+    assert ticks.shape[0] == pytest.approx(7200, rel=0.05)
+    floors = np.concatenate([chunk.floors for chunk in chunks])
+    destinations = np.concatenate([chunk.destinations for chunk in chunks])
+    assert floors.min() == 1 and floors.max() == 12
+    assert (floors != destinations).all()
+
+
+def test_up_peak_starts_in_lobby():
+    period = TrafficPeriod(
+        start=0, end=TICKS_PER_HOUR, rate=1,
+        matrix=up_peak_matrix(20, lobby=2),
+    )
+    chunk, = TrafficModel([period], min_floor=-2, seed=0).chunks()
+    assert (chunk.floors == 0).mean() == pytest.approx(0.9, abs=0.02)
+    assert chunk.floors.min() >= -2 and chunk.destinations.max() <= 17
+
+
+def test_chunks_are_lazy():
+    periods = office_day(floors=12, start=TICKS_PER_HOUR)
+    chunks = TrafficModel(periods, seed=0).chunks()
+    chunk = next(chunks)
+    assert chunk.ticks.min() >= TICKS_PER_HOUR
+    assert chunk.ticks.max() < 2 * TICKS_PER_HOUR
+
+
+def test_simulation_takes_calls_from_model():
+    periods = office_day(floors=12, rate=0.1)
+    stats = simulate(
+        PassengerElevator(start_floor=None),
+        until=9 * TICKS_PER_HOUR,
+        arrivals=TrafficModel(periods, seed=0),
+    )
+    assert stats.called > 700
+    assert stats.delivered > 0